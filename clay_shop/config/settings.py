@@ -13,6 +13,7 @@ https://docs.djangoproject.com/en/5.2/ref/settings/
 import os
 from pathlib import Path
 
+from celery.schedules import crontab
 from django.contrib.messages import constants as messages
 from dotenv import load_dotenv
 
@@ -43,9 +44,11 @@ INSTALLED_APPS = [
     "django.contrib.sessions",
     "django.contrib.messages",
     "django.contrib.staticfiles",
+    "django.contrib.postgres",
     # third-party apps
     "debug_toolbar",
     "django_htmx",
+    "imagekit",
     # my apps
     "products",
     "orders",
@@ -63,10 +66,12 @@ SESSION_SAVE_EVERY_REQUEST = False
 
 AUTH_USER_MODEL = "users.User"
 AUTHENTICATION_BACKENDS = {
-    "django.contrib.auth.backends.ModelBackend",
+    "users.backends.CachedModelBackend",
 }
 
 MIDDLEWARE = [
+    "core.middleware.RequestMetricsMiddleware",
+    "core.middleware.ReplicaPinMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
@@ -113,6 +118,18 @@ DATABASES = {
         "PORT": os.getenv("DB_PORT"),
     }
 }
+# Реплика для чтения каталога и аналитики. Без DB_REPLICA_HOST алиас смотрит
+# в основную БД и роутером не используется
+DATABASES["replica"] = {
+    **DATABASES["default"],
+    "HOST": os.getenv("DB_REPLICA_HOST", default=DATABASES["default"]["HOST"]),
+    "PORT": os.getenv("DB_REPLICA_PORT", default=DATABASES["default"]["PORT"]),
+    "TEST": {"MIRROR": "default"},
+}
+DATABASE_ROUTERS = ["core.db_router.ReplicaRouter"]
+REPLICA_DATABASE = "replica" if os.getenv("DB_REPLICA_HOST") else None
+# Сколько секунд после своей записи пользователь читает из основной БД
+REPLICA_STICKY_SECONDS = int(os.getenv("REPLICA_STICKY_SECONDS", default=5))
 
 
 # Password validation
@@ -154,11 +171,21 @@ STATIC_ROOT = os.path.join(BASE_DIR, "static")
 if not os.path.exists(STATIC_ROOT):
     os.makedirs(STATIC_ROOT)
 
-MEDIA_URL = "/media/"
+# Миниатюры товаров (ThumbnailService) лежат в MEDIA_ROOT. Django отдает их
+# только при DEBUG; в продакшене MEDIA_ROOT раздает веб-сервер
+# (nginx: location /media/ { alias <MEDIA_ROOT>/; }) или CDN, адрес которого
+# задается через MEDIA_URL
+MEDIA_URL = os.getenv("MEDIA_URL", default="/media/")
 MEDIA_ROOT = os.path.join(BASE_DIR, "media")
 if not os.path.exists(MEDIA_ROOT):
     os.makedirs(MEDIA_ROOT)
 
+# Выгрузки и загруженные фиды: не раздаются по MEDIA_URL, только через view
+# с проверкой прав. Каталог должен быть общим для веб-сервера и воркеров Celery
+PRIVATE_MEDIA_ROOT = os.getenv(
+    "PRIVATE_MEDIA_ROOT", default=os.path.join(BASE_DIR, "private_media")
+)
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.2/ref/settings/#default-auto-field
 
@@ -268,6 +295,10 @@ INTERNAL_IPS = [
 ]
 
 DADATA_API_KEY = os.getenv("DADATA_API_TOKEN", default="")
+DADATA_SUGGEST_URL = os.getenv(
+    "DADATA_SUGGEST_URL",
+    default="https://suggestions.dadata.ru/suggestions/api/4_1/rs/suggest/address",
+)
 
 REDIS_URL = os.getenv("REDIS_URL", default="redis://127.0.0.1:6379/0")
 
@@ -276,7 +307,7 @@ CACHES = {
         "BACKEND": "django_redis.cache.RedisCache",
         "LOCATION": REDIS_URL,
         "OPTIONS": {
-            "CLIENT_CLASS": "django_redis.client.DefaultClient",
+            "CLIENT_CLASS": "core.cache.MetricsRedisClient",
             # "PARSER_CLASS": "redis.connection.PythonParser",
             "SOCKET_CONNECT_TIMEOUT": 5,
             "SOCKET_TIMEOUT": 5,
@@ -290,6 +321,22 @@ CACHES = {
     }
 }
 
+# Бюджеты запросов к БД по имени view, превышение пишется в лог и в метрики
+QUERY_BUDGETS = {
+    "products:product-detail": 10,
+    "products:product-search": 6,
+    "dashboard": 8,
+}
+METRICS_TOKEN = os.getenv("METRICS_TOKEN", default="")
+
+# Фото товаров скачиваются только с публичных адресов; внутренние сети
+# (например, локальное S3-хранилище) перечисляются здесь через запятую
+THUMBNAIL_ALLOWED_NETWORKS = [
+    network
+    for network in os.getenv("THUMBNAIL_ALLOWED_NETWORKS", default="").split(",")
+    if network
+]
+
 SESSION_ENGINE = "django.contrib.sessions.backends.cache"
 SESSION_CACHE_ALIAS = "default"
 
@@ -305,6 +352,11 @@ DEFAULT_FROM_EMAIL = os.getenv(
 )
 
 SITE_URL = os.getenv("SITE_URL", default="http:localhost:8000")
+SITE_NAME = os.getenv("SITE_NAME", default="Clay Art")
+# Секунды между проходами диспетчера очереди писем
+EMAIL_OUTBOX_DISPATCH_INTERVAL = float(
+    os.getenv("EMAIL_OUTBOX_DISPATCH_INTERVAL", default=10)
+)
 
 CELERY_BROKER_URL = os.getenv("CELERY_BROKER_URL", default="redis://redis:6379/1")
 CELERY_RESULT_BACKEND = os.getenv(
@@ -317,3 +369,29 @@ CELERY_TIMEZONE = 'Europe/Moscow'
 CELERY_TASK_TRACK_STARTED = True
 CELERY_TASK_TIME_LIMIT = 30 * 60
 CELERY_BROKER_CONNECTION_RETRY_ON_STARTUP = True
+CELERY_BEAT_SCHEDULE = {
+    "rollup-daily-stats": {
+        "task": "products.tasks.rollup_daily_stats_task",
+        "schedule": crontab(minute="*/15"),
+    },
+    "rollup-order-stats": {
+        "task": "orders.tasks.rollup_order_stats_task",
+        "schedule": crontab(minute="*/15"),
+    },
+    "flush-carts": {
+        "task": "orders.tasks.flush_carts_task",
+        "schedule": crontab(minute="*/5"),
+    },
+    "dispatch-email-outbox": {
+        "task": "users.tasks.dispatch_email_outbox_task",
+        "schedule": EMAIL_OUTBOX_DISPATCH_INTERVAL,
+    },
+    "purge-email-outbox": {
+        "task": "users.tasks.purge_email_outbox_task",
+        "schedule": crontab(hour=4, minute=0),
+    },
+    "purge-exports": {
+        "task": "seller.tasks.purge_exports_task",
+        "schedule": crontab(hour=4, minute=30),
+    },
+}
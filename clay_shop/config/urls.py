@@ -15,16 +15,22 @@ Including another URLconf
     2. Add a URL to urlpatterns:  path('blog/', include('blog.urls'))
 """
 from debug_toolbar.toolbar import debug_toolbar_urls
+from django.conf import settings
+from django.conf.urls.static import static
 from django.contrib import admin
 from django.urls import include, path
 
 from config.settings import DEBUG
+from core.views import metrics_view
 
 urlpatterns = [
     path('admin/', admin.site.urls),
+    path('metrics/', metrics_view, name='metrics'),
     path('', include('users.urls')),
     path('seller/', include('seller.urls')),
     path('', include('products.urls'))
 ]
 if DEBUG:
     urlpatterns += debug_toolbar_urls()
+    # Миниатюры товаров; в продакшене MEDIA_URL отдает веб-сервер, см. settings
+    urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
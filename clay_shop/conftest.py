@@ -0,0 +1,34 @@
+from decimal import Decimal
+
+import pytest
+
+from products.models import Category, Product
+
+
+@pytest.fixture
+def category(db):
+    return Category.objects.create(
+        name="Посуда", description="Керамическая посуда", slug="posuda"
+    )
+
+
+@pytest.fixture
+def create_product(category):
+    def _create_product(**kwargs):
+        defaults = {
+            "name": "Кружка",
+            "description": "Кружка ручной работы",
+            "base_price": 1500,
+            "discount_price": 1200,
+            "is_unique": False,
+            "stock_quantity": 10,
+            "category_id": category,
+            "manufacturing_time_days": 7,
+            "materials": "Глина, глазурь",
+            "weight": Decimal("0.40"),
+            "size": Decimal("12.00"),
+        }
+        defaults.update(kwargs)
+        return Product.objects.create(**defaults)
+
+    return _create_product
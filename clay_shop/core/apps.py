@@ -1,6 +1,13 @@
 from django.apps import AppConfig
+from django.db.backends.signals import connection_created
 
 
 class CoreConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'core'
+
+    def ready(self):
+        import core.signals  # noqa
+        from core.metrics import install_query_recorder
+
+        connection_created.connect(install_query_recorder)
@@ -0,0 +1,23 @@
+from django_redis.client import DefaultClient
+
+from core.metrics import RequestMetrics
+
+_missing = object()
+
+
+class MetricsRedisClient(DefaultClient):
+    """Клиент django-redis, который считает попадания и промахи текущего запроса."""
+
+    def get(self, key, default=None, version=None, client=None):
+        value = super().get(key, default=_missing, version=version, client=client)
+        if value is _missing:
+            RequestMetrics.record_cache(0, 1)
+            return default
+        RequestMetrics.record_cache(1, 0)
+        return value
+
+    def get_many(self, keys, version=None, client=None):
+        keys = list(keys)
+        values = super().get_many(keys, version=version, client=client)
+        RequestMetrics.record_cache(len(values), len(keys) - len(values))
+        return values
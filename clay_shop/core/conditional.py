@@ -0,0 +1,53 @@
+import hashlib
+
+from django.conf import settings
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import quote_etag
+
+from core.response_cache import ResponseCache
+
+
+class ConditionalGetMixin:
+    """
+    ETag по дешевому состоянию данных, 304 без рендера.
+
+    Last-Modified не отдается: страницу меняют удаления, модерация отзывов и
+    версии тегов, которых нет в updated_at, и клиент с одним If-Modified-Since
+    получил бы 304 на измененную страницу.
+    """
+
+    def get_validators(self) -> tuple | None:
+        """Возвращает состояние для ETag или None без проверки."""
+        return None
+
+    def make_etag(self, state: tuple) -> str:
+        # Страница вошедшего пользователя отличается от анонимной
+        session_key = self.request.COOKIES.get(settings.SESSION_COOKIE_NAME, "")
+        raw = repr((type(self).__name__, state, session_key))
+        return quote_etag(hashlib.sha1(raw.encode()).hexdigest())
+
+    def dispatch(self, request, *args, **kwargs):
+        # Flash-сообщения показываются один раз, такой ответ не переиспользуется
+        if (
+            request.method not in ("GET", "HEAD")
+            or ResponseCache.MESSAGES_COOKIE in request.COOKIES
+        ):
+            return super().dispatch(request, *args, **kwargs)
+
+        validators = self.get_validators()
+        if validators is None:
+            return super().dispatch(request, *args, **kwargs)
+
+        etag = self.make_etag(validators)
+        response = get_conditional_response(request, etag=etag)
+        if response is None:
+            response = super().dispatch(request, *args, **kwargs)
+            if response.status_code == 200:
+                response["ETag"] = etag
+
+        # Браузер и прокси хранят копию, но всегда ее перепроверяют
+        if settings.SESSION_COOKIE_NAME in request.COOKIES:
+            patch_cache_control(response, no_cache=True, private=True)
+        else:
+            patch_cache_control(response, no_cache=True)
+        return response
@@ -0,0 +1,104 @@
+from contextvars import ContextVar
+from functools import wraps
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.db.models import QuerySet
+
+# Реплика для текущего вызова сервиса (None — читаем из основной БД)
+_read_alias: ContextVar[str | None] = ContextVar("replica_read_alias", default=None)
+_request_state: ContextVar["ReplicaPin | None"] = ContextVar(
+    "replica_pin", default=None
+)
+
+
+class ReplicaPin:
+    """Состояние запроса: пользователь недавно писал или пишет сейчас."""
+
+    __slots__ = ("pinned", "wrote")
+
+    def __init__(self, pinned: bool = False):
+        self.pinned = pinned
+        self.wrote = False
+
+
+class ReplicaRouter:
+    """Чтения из помеченных сервисов идут в реплику, все записи — в основную БД."""
+
+    @staticmethod
+    def replica_alias() -> str | None:
+        alias = getattr(settings, "REPLICA_DATABASE", None)
+        if not alias or alias not in connections.settings:
+            return None
+        return alias
+
+    @staticmethod
+    def is_pinned() -> bool:
+        state = _request_state.get()
+        return state is not None and (state.pinned or state.wrote)
+
+    @staticmethod
+    def read_alias() -> str:
+        alias = ReplicaRouter.replica_alias()
+        # Внутри транзакции чтение должно видеть ее же изменения
+        if (
+            alias is None
+            or ReplicaRouter.is_pinned()
+            or connections[DEFAULT_DB_ALIAS].in_atomic_block
+        ):
+            return DEFAULT_DB_ALIAS
+        return alias
+
+    @staticmethod
+    def activate(state: ReplicaPin):
+        return _request_state.set(state)
+
+    @staticmethod
+    def deactivate(token) -> None:
+        _request_state.reset(token)
+
+    def db_for_read(self, model, **hints):
+        alias = _read_alias.get()
+        if alias is not None and not ReplicaRouter.is_pinned():
+            return alias
+        return None
+
+    def db_for_write(self, model, **hints):
+        # Вне запроса (Celery, команды) закреплять некого
+        state = _request_state.get()
+        if state is not None:
+            state.wrote = True
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        aliases = {DEFAULT_DB_ALIAS, ReplicaRouter.replica_alias()}
+        if obj1._state.db in aliases and obj2._state.db in aliases:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        if db != DEFAULT_DB_ALIAS and db == ReplicaRouter.replica_alias():
+            return False
+        return None
+
+
+def replica_read(func):
+    """Выполняет чтение сервиса на реплике, ленивый QuerySet привязывается к ней."""
+
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        alias = ReplicaRouter.read_alias()
+        if alias == DEFAULT_DB_ALIAS:
+            return func(*args, **kwargs)
+
+        token = _read_alias.set(alias)
+        try:
+            result = func(*args, **kwargs)
+        finally:
+            _read_alias.reset(token)
+
+        if isinstance(result, QuerySet) and result._db is None:
+            result = result.using(alias)
+        return result
+
+    return wrapper
@@ -0,0 +1,142 @@
+import threading
+import time
+from contextvars import ContextVar
+
+from django.conf import settings
+
+_current_metrics: ContextVar["RequestMetrics | None"] = ContextVar(
+    "request_metrics", default=None
+)
+
+
+class RequestMetrics:
+    """Счетчики одного запроса, активного в текущем контексте."""
+
+    __slots__ = (
+        "view_name",
+        "queries",
+        "db_time",
+        "cache_hits",
+        "cache_misses",
+        "started_at",
+    )
+
+    def __init__(self):
+        self.view_name = None
+        self.queries = 0
+        self.db_time = 0.0
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.started_at = time.perf_counter()
+
+    def __call__(self, execute, sql, params, many, context):
+        started_at = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries += 1
+            self.db_time += time.perf_counter() - started_at
+
+    @property
+    def duration(self) -> float:
+        return time.perf_counter() - self.started_at
+
+    def budget_exceeded(self) -> bool:
+        budget = get_query_budget(self.view_name)
+        return budget is not None and self.queries > budget
+
+    @staticmethod
+    def current() -> "RequestMetrics | None":
+        return _current_metrics.get()
+
+    @staticmethod
+    def activate(metrics: "RequestMetrics"):
+        return _current_metrics.set(metrics)
+
+    @staticmethod
+    def deactivate(token) -> None:
+        _current_metrics.reset(token)
+
+    @staticmethod
+    def record_cache(hits: int, misses: int) -> None:
+        metrics = _current_metrics.get()
+        if metrics is not None:
+            metrics.cache_hits += hits
+            metrics.cache_misses += misses
+
+
+def record_query(execute, sql, params, many, context):
+    metrics = _current_metrics.get()
+    if metrics is None:
+        return execute(sql, params, many, context)
+    return metrics(execute, sql, params, many, context)
+
+
+def install_query_recorder(sender, connection, **kwargs) -> None:
+    # Обертка ставится на соединение один раз и берет метрики из contextvar,
+    # поэтому учитываются и запросы из sync_to_async под ASGI
+    if record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(record_query)
+
+
+def get_query_budget(view_name: str) -> int | None:
+    return getattr(settings, "QUERY_BUDGETS", {}).get(view_name)
+
+
+class MetricsRegistry:
+    """Накопленные метрики по имени view в пределах процесса."""
+
+    FIELDS = (
+        ("requests", "django_view_requests_total", "Количество запросов"),
+        ("queries", "django_view_queries_total", "Запросов к БД"),
+        ("db_time", "django_view_db_seconds_total", "Время в БД, секунды"),
+        ("cache_hits", "django_view_cache_hits_total", "Попадания в кэш"),
+        ("cache_misses", "django_view_cache_misses_total", "Промахи кэша"),
+        ("duration", "django_view_duration_seconds_total", "Время ответа, секунды"),
+        (
+            "over_budget",
+            "django_view_query_budget_exceeded_total",
+            "Превышения бюджета запросов",
+        ),
+    )
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._views: dict[str, list[float]] = {}
+
+    def record(self, metrics: RequestMetrics, over_budget: bool) -> None:
+        values = (
+            1,
+            metrics.queries,
+            metrics.db_time,
+            metrics.cache_hits,
+            metrics.cache_misses,
+            metrics.duration,
+            int(over_budget),
+        )
+        with self._lock:
+            totals = self._views.setdefault(metrics.view_name, [0] * len(values))
+            for index, value in enumerate(values):
+                totals[index] += value
+
+    def snapshot(self) -> dict[str, list[float]]:
+        with self._lock:
+            return {view: list(totals) for view, totals in self._views.items()}
+
+    def reset(self) -> None:
+        with self._lock:
+            self._views.clear()
+
+    def render(self) -> str:
+        snapshot = self.snapshot()
+        lines = []
+        for index, (_, name, help_text) in enumerate(self.FIELDS):
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} counter")
+            for view, totals in sorted(snapshot.items()):
+                label = view.replace("\\", "\\\\").replace('"', '\\"')
+                lines.append(f'{name}{{view="{label}"}} {totals[index]}')
+        return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
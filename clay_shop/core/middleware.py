@@ -0,0 +1,119 @@
+import logging
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+
+from core.db_router import ReplicaPin, ReplicaRouter
+from core.metrics import RequestMetrics, get_query_budget, registry
+
+logger = logging.getLogger(__name__)
+
+
+class RequestMetricsMiddleware:
+    sync_capable = True
+    async_capable = True
+
+    UNRESOLVED_VIEW = "<unresolved>"
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+
+        metrics = RequestMetrics()
+        request.metrics = metrics
+        token = RequestMetrics.activate(metrics)
+        try:
+            response = self.get_response(request)
+        finally:
+            RequestMetrics.deactivate(token)
+
+        self._record(request, metrics)
+        return response
+
+    async def __acall__(self, request):
+        metrics = RequestMetrics()
+        request.metrics = metrics
+        token = RequestMetrics.activate(metrics)
+        try:
+            response = await self.get_response(request)
+        finally:
+            RequestMetrics.deactivate(token)
+
+        self._record(request, metrics)
+        return response
+
+    def _record(self, request, metrics: RequestMetrics) -> None:
+        match = request.resolver_match
+        metrics.view_name = match.view_name if match else self.UNRESOLVED_VIEW
+        over_budget = metrics.budget_exceeded()
+        if over_budget:
+            logger.warning(
+                f"{metrics.view_name}: {metrics.queries} запросов к БД "
+                f"при бюджете {get_query_budget(metrics.view_name)}"
+            )
+
+        registry.record(metrics, over_budget)
+
+
+class ReplicaPinMiddleware:
+    """Read-your-writes: после своей записи пользователь читает из основной БД."""
+
+    sync_capable = True
+    async_capable = True
+
+    COOKIE_NAME = "db_pin"
+    # Обработчик небезопасного запроса читает то, что собирается изменить:
+    # проверка формы по отставшей реплике может затереть свежие данные
+    SAFE_METHODS = ("GET", "HEAD", "OPTIONS", "TRACE")
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+
+        state = self._state(request)
+        token = ReplicaRouter.activate(state)
+        try:
+            response = self.get_response(request)
+        finally:
+            ReplicaRouter.deactivate(token)
+
+        return self._process_response(state, response)
+
+    async def __acall__(self, request):
+        state = self._state(request)
+        token = ReplicaRouter.activate(state)
+        try:
+            response = await self.get_response(request)
+        finally:
+            ReplicaRouter.deactivate(token)
+
+        return self._process_response(state, response)
+
+    def _state(self, request) -> ReplicaPin:
+        return ReplicaPin(
+            pinned=self.COOKIE_NAME in request.COOKIES
+            or request.method not in self.SAFE_METHODS
+        )
+
+    def _process_response(self, state: ReplicaPin, response):
+        if state.wrote:
+            response.set_cookie(
+                self.COOKIE_NAME,
+                "1",
+                max_age=settings.REPLICA_STICKY_SECONDS,
+                httponly=True,
+                samesite="Lax",
+            )
+        return response
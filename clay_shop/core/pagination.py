@@ -0,0 +1,116 @@
+from django.core import signing
+from django.db.models import Q, QuerySet
+from django.http import Http404
+
+
+class CursorPage:
+    def __init__(
+        self,
+        object_list: list,
+        next_cursor: str | None = None,
+        previous_cursor: str | None = None,
+    ):
+        self.object_list = object_list
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def __getitem__(self, index):
+        return self.object_list[index]
+
+    def has_next(self) -> bool:
+        return self.next_cursor is not None
+
+    def has_previous(self) -> bool:
+        return self.previous_cursor is not None
+
+    def has_other_pages(self) -> bool:
+        return self.has_next() or self.has_previous()
+
+
+class CursorPaginator:
+    """Keyset-пагинация по (поле сортировки, id), без OFFSET и COUNT."""
+
+    SALT = "core.pagination.cursor"
+
+    def __init__(self, queryset: QuerySet, per_page: int, ordering: str):
+        self.per_page = int(per_page)
+        self.descending = ordering.startswith("-")
+        self.field_name = ordering.lstrip("-")
+        self.field = queryset.model._meta.get_field(self.field_name)
+
+        prefix = "-" if self.descending else ""
+        self.queryset = queryset.order_by(f"{prefix}{self.field_name}", f"{prefix}pk")
+
+    def encode_cursor(self, obj, backwards: bool = False) -> str:
+        value = self.field.value_to_string(obj)
+        return signing.dumps([value, obj.pk, backwards], salt=self.SALT)
+
+    def decode_cursor(self, cursor: str) -> tuple:
+        try:
+            value, pk, backwards = signing.loads(cursor, salt=self.SALT)
+            return self.field.to_python(value), int(pk), bool(backwards)
+        except (signing.BadSignature, TypeError, ValueError):
+            raise Http404("Неверный курсор страницы") from None
+
+    def _seek(self, queryset: QuerySet, value, pk: int, greater: bool) -> QuerySet:
+        # Нестрогое условие по полю дает границу для индекса (поле, id)
+        op = "gt" if greater else "lt"
+        return queryset.filter(
+            Q(**{f"{self.field_name}__{op}e": value})
+            & (Q(**{f"{self.field_name}__{op}": value}) | Q(**{f"pk__{op}": pk}))
+        )
+
+    def page(self, cursor: str | None = None) -> CursorPage:
+        queryset = self.queryset
+        backwards = False
+
+        if cursor:
+            value, pk, backwards = self.decode_cursor(cursor)
+            queryset = self._seek(
+                queryset, value, pk, greater=self.descending == backwards
+            )
+            if backwards:
+                queryset = queryset.reverse()
+
+        rows = list(queryset[: self.per_page + 1])
+        has_more = len(rows) > self.per_page
+        rows = rows[: self.per_page]
+
+        if backwards:
+            rows.reverse()
+            has_next, has_previous = bool(rows), has_more
+        else:
+            has_next, has_previous = has_more, bool(cursor) and bool(rows)
+
+        return CursorPage(
+            rows,
+            next_cursor=self.encode_cursor(rows[-1]) if has_next else None,
+            previous_cursor=self.encode_cursor(rows[0], backwards=True)
+            if has_previous
+            else None,
+        )
+
+
+class CursorPaginationMixin:
+    """Подключает CursorPaginator к ListView вместо постраничной пагинации."""
+
+    cursor_ordering: str | None = None
+    cursor_kwarg = "cursor"
+
+    def get_cursor_ordering(self) -> str | None:
+        return self.cursor_ordering
+
+    def paginate_queryset(self, queryset, page_size):
+        ordering = self.get_cursor_ordering()
+        if ordering is None:
+            return super().paginate_queryset(queryset, page_size)
+
+        paginator = CursorPaginator(queryset, page_size, ordering)
+        page = paginator.page(self.request.GET.get(self.cursor_kwarg))
+        return paginator, page, page.object_list, page.has_other_pages()
@@ -0,0 +1,35 @@
+import logging
+import os
+import time
+
+from django.conf import settings
+from django.core.files.storage import FileSystemStorage
+
+logger = logging.getLogger(__name__)
+
+
+def private_storage() -> FileSystemStorage:
+    """Хранилище вне MEDIA_ROOT: веб-сервер его не раздает, файлы отдают view."""
+    return FileSystemStorage(location=settings.PRIVATE_MEDIA_ROOT)
+
+
+def private_path(directory: str, name: str = "") -> str:
+    return os.path.join(settings.PRIVATE_MEDIA_ROOT, directory, name)
+
+
+def purge_directory(directory: str, hours: int) -> int:
+    """Удаляет файлы старше hours часов из каталога приватного хранилища."""
+    path = private_path(directory)
+    if not os.path.isdir(path):
+        return 0
+
+    threshold = time.time() - hours * 3600
+    removed = 0
+    with os.scandir(path) as entries:
+        for entry in entries:
+            if entry.is_file() and entry.stat().st_mtime < threshold:
+                os.remove(entry.path)
+                removed += 1
+
+    logger.info(f"Purged {removed} files from {directory}")
+    return removed
@@ -0,0 +1,144 @@
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable
+
+from django.core.cache import cache, caches
+from django.db import transaction
+
+logger = logging.getLogger(__name__)
+
+
+class ReferenceCache:
+    """Справочники: LRU в процессе перед Redis, сброс через версию и pub/sub."""
+
+    CHANNEL = "reference_cache:invalidate"
+    LOCAL_MAX_SIZE = 128
+    # Страховка на случай потерянного сообщения pub/sub
+    LOCAL_TIMEOUT = 300
+    REDIS_TIMEOUT = 60 * 60 * 24
+    LISTEN_INTERVAL = 1.0
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._local: OrderedDict[str, tuple[float, Any]] = OrderedDict()
+        self._generations: dict[str, int] = {}
+        self._listener_pid: int | None = None
+
+    @staticmethod
+    def _version_key(name: str) -> str:
+        return f"reference_cache:version:{name}"
+
+    @staticmethod
+    def _value_key(name: str, version: int) -> str:
+        return f"reference_cache:{name}:{version}"
+
+    @staticmethod
+    def _redis():
+        try:
+            from django_redis import get_redis_connection
+            from django_redis.cache import RedisCache
+        except ImportError:
+            return None
+        if not isinstance(caches["default"], RedisCache):
+            return None
+        return get_redis_connection("default")
+
+    def get(self, name: str, loader: Callable[[], Any]) -> Any:
+        self._ensure_listener()
+        now = time.monotonic()
+        with self._lock:
+            entry = self._local.get(name)
+            if entry is not None and entry[0] > now:
+                self._local.move_to_end(name)
+                return entry[1]
+            generation = self._generations.get(name, 0)
+
+        value = self._load(name, loader)
+
+        with self._lock:
+            # Сброс, пришедший во время загрузки, не должен затереться старым значением
+            if self._generations.get(name, 0) == generation:
+                self._local[name] = (now + self.LOCAL_TIMEOUT, value)
+                self._local.move_to_end(name)
+                while len(self._local) > self.LOCAL_MAX_SIZE:
+                    self._local.popitem(last=False)
+        return value
+
+    def _load(self, name: str, loader: Callable[[], Any]) -> Any:
+        version_key = self._version_key(name)
+        version = cache.get(version_key)
+        if version is None:
+            cache.add(version_key, time.time_ns(), None)
+            version = cache.get(version_key)
+
+        value_key = self._value_key(name, version)
+        value = cache.get(value_key)
+        if value is None:
+            value = loader()
+            cache.set(value_key, value, self.REDIS_TIMEOUT)
+        return value
+
+    def evict(self, name: str) -> None:
+        with self._lock:
+            self._local.pop(name, None)
+            self._generations[name] = self._generations.get(name, 0) + 1
+
+    def clear_local(self) -> None:
+        with self._lock:
+            for name in self._local:
+                self._generations[name] = self._generations.get(name, 0) + 1
+            self._local.clear()
+
+    def bump(self, name: str) -> None:
+        version_key = self._version_key(name)
+        try:
+            cache.incr(version_key)
+        except ValueError:
+            cache.set(version_key, time.time_ns(), None)
+
+        self.evict(name)
+        redis = self._redis()
+        if redis is not None:
+            redis.publish(cache.make_key(self.CHANNEL), name)
+
+    def invalidate(self, name: str) -> None:
+        transaction.on_commit(lambda: self.bump(name))
+
+    def _ensure_listener(self) -> None:
+        pid = os.getpid()
+        if self._listener_pid == pid:
+            return
+
+        with self._lock:
+            if self._listener_pid == pid:
+                return
+            # В дочернем процессе копия LRU родителя могла устареть
+            self._listener_pid = pid
+            self._local.clear()
+
+        if self._redis() is not None:
+            threading.Thread(
+                target=self._listen, name="reference-cache-listener", daemon=True
+            ).start()
+
+    def _listen(self) -> None:
+        channel = cache.make_key(self.CHANNEL)
+        while True:
+            try:
+                pubsub = self._redis().pubsub(ignore_subscribe_messages=True)
+                pubsub.subscribe(channel)
+                # Пока подписки не было, сообщения могли потеряться
+                self.clear_local()
+                while True:
+                    message = pubsub.get_message(timeout=self.LISTEN_INTERVAL)
+                    if message and message["type"] == "message":
+                        self.evict(message["data"].decode())
+            except Exception as exc:
+                logger.warning(f"Reference cache listener error: {str(exc)}")
+                time.sleep(self.LISTEN_INTERVAL)
+
+
+reference_cache = ReferenceCache()
@@ -0,0 +1,152 @@
+import hashlib
+import time
+from typing import Iterable
+from urllib.parse import parse_qsl, urlencode
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response
+from django.utils.http import parse_http_date_safe
+
+
+class ResponseCache:
+    """Готовые ответы анонимным посетителям; сброс по тегам через версии."""
+
+    CACHE_PREFIX = "response"
+    TAG_PREFIX = "response_tag"
+    # Страховка для страниц, чьи теги не покрывают изменение (например, поиск)
+    CACHE_TIMEOUT = 60 * 10
+    MESSAGES_COOKIE = "messages"
+    HIT_HEADER = "X-Response-Cache"
+
+    @staticmethod
+    def product_tag(product_id: int) -> str:
+        return f"product:{product_id}"
+
+    @staticmethod
+    def category_tag(category_id: int) -> str:
+        return f"category:{category_id}"
+
+    @staticmethod
+    def is_cacheable_request(request) -> bool:
+        # Сессия или flash-сообщения означают персональную страницу
+        return (
+            request.method in ("GET", "HEAD")
+            and settings.SESSION_COOKIE_NAME not in request.COOKIES
+            and ResponseCache.MESSAGES_COOKIE not in request.COOKIES
+        )
+
+    @staticmethod
+    def is_cacheable_response(request, response) -> bool:
+        return (
+            response.status_code == 200
+            and not response.streaming
+            and not response.cookies
+            and not request.META.get("CSRF_COOKIE_NEEDS_UPDATE")
+            and "private" not in response.get("Cache-Control", "")
+            and "no-store" not in response.get("Cache-Control", "")
+        )
+
+    @staticmethod
+    def make_key(request) -> str:
+        query = urlencode(sorted(parse_qsl(request.META.get("QUERY_STRING", ""))))
+        htmx = request.headers.get("HX-Request") == "true"
+        raw = f"{request.path}?{query}|htmx={int(htmx)}"
+        digest = hashlib.sha1(raw.encode()).hexdigest()
+        return f"{ResponseCache.CACHE_PREFIX}:{digest}"
+
+    @staticmethod
+    def _tag_key(tag: str) -> str:
+        return f"{ResponseCache.TAG_PREFIX}:{tag}"
+
+    @staticmethod
+    def get_tag_versions(tags: Iterable[str]) -> dict[str, int]:
+        keys = {ResponseCache._tag_key(tag): tag for tag in tags}
+        versions = cache.get_many(list(keys))
+
+        # Версия после вытеснения ключа не должна совпасть со старыми ответами
+        missing = {key: time.time_ns() for key in keys if key not in versions}
+        if missing:
+            cache.set_many(missing, timeout=None)
+            versions.update(missing)
+
+        return {tag: versions[key] for key, tag in keys.items()}
+
+    @staticmethod
+    def get(request) -> HttpResponse | None:
+        entry = cache.get(ResponseCache.make_key(request))
+        if entry is None:
+            return None
+
+        tag_versions, status, headers, content = entry
+        if ResponseCache.get_tag_versions(tag_versions) != tag_versions:
+            return None
+
+        response = HttpResponse(content, status=status, headers=headers)
+        response[ResponseCache.HIT_HEADER] = "hit"
+        return response
+
+    @staticmethod
+    def set(request, response, tags: Iterable[str]) -> None:
+        tag_versions = ResponseCache.get_tag_versions(set(tags))
+        headers = {
+            name: value
+            for name, value in response.items()
+            if name != ResponseCache.HIT_HEADER
+        }
+        cache.set(
+            ResponseCache.make_key(request),
+            (tag_versions, response.status_code, headers, response.content),
+            ResponseCache.CACHE_TIMEOUT,
+        )
+
+    @staticmethod
+    def bump_tags(tags: Iterable[str]) -> None:
+        for tag in tags:
+            key = ResponseCache._tag_key(tag)
+            try:
+                cache.incr(key)
+            except ValueError:
+                cache.set(key, time.time_ns(), timeout=None)
+
+    @staticmethod
+    def invalidate(*tags: str) -> None:
+        transaction.on_commit(lambda: ResponseCache.bump_tags(tags))
+
+
+class ResponseCacheMixin:
+    """Кэширует ответ view целиком для анонимных GET-запросов."""
+
+    cache_tags: tuple[str, ...] = ()
+
+    def add_cache_tags(self, *tags: str) -> None:
+        if not hasattr(self, "_cache_tags"):
+            self._cache_tags = set(self.cache_tags)
+        self._cache_tags.update(tags)
+
+    def get_cache_tags(self) -> set[str]:
+        return getattr(self, "_cache_tags", set(self.cache_tags))
+
+    def dispatch(self, request, *args, **kwargs):
+        if not ResponseCache.is_cacheable_request(request):
+            return super().dispatch(request, *args, **kwargs)
+
+        response = ResponseCache.get(request)
+        if response is not None:
+            # Повторный визит с актуальной копией получает 304 прямо из кэша
+            return get_conditional_response(
+                request,
+                etag=response.get("ETag"),
+                last_modified=parse_http_date_safe(response.get("Last-Modified")),
+                response=response,
+            )
+
+        response = super().dispatch(request, *args, **kwargs)
+        # Теги собираются при рендере шаблона, поэтому рендерим здесь
+        if hasattr(response, "render") and not response.is_rendered:
+            response.render()
+        if ResponseCache.is_cacheable_response(request, response):
+            ResponseCache.set(request, response, self.get_cache_tags())
+        return response
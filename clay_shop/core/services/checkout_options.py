@@ -0,0 +1,43 @@
+from core.models import DeliveryMethod, PaymentMethod
+from core.reference_cache import reference_cache
+
+
+class CheckoutOptionsService:
+    DELIVERY_METHODS_CACHE = "delivery_methods"
+    PAYMENT_METHODS_CACHE = "payment_methods"
+
+    @staticmethod
+    def get_delivery_methods() -> list[DeliveryMethod]:
+        return reference_cache.get(
+            CheckoutOptionsService.DELIVERY_METHODS_CACHE,
+            lambda: list(DeliveryMethod.objects.filter(is_active=True).order_by("id")),
+        )
+
+    @staticmethod
+    def get_payment_methods() -> list[PaymentMethod]:
+        return reference_cache.get(
+            CheckoutOptionsService.PAYMENT_METHODS_CACHE,
+            lambda: list(PaymentMethod.objects.filter(is_active=True)),
+        )
+
+    @staticmethod
+    def get_delivery_method(method_id: int) -> DeliveryMethod | None:
+        return next(
+            (
+                method
+                for method in CheckoutOptionsService.get_delivery_methods()
+                if method.id == method_id
+            ),
+            None,
+        )
+
+    @staticmethod
+    def get_payment_method(method_id: int) -> PaymentMethod | None:
+        return next(
+            (
+                method
+                for method in CheckoutOptionsService.get_payment_methods()
+                if method.id == method_id
+            ),
+            None,
+        )
@@ -0,0 +1,18 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from core.models import DeliveryMethod, PaymentMethod
+from core.reference_cache import reference_cache
+from core.services.checkout_options import CheckoutOptionsService
+
+
+@receiver(post_save, sender=DeliveryMethod)
+@receiver(post_delete, sender=DeliveryMethod)
+def invalidate_delivery_methods(sender, **kwargs):
+    reference_cache.invalidate(CheckoutOptionsService.DELIVERY_METHODS_CACHE)
+
+
+@receiver(post_save, sender=PaymentMethod)
+@receiver(post_delete, sender=PaymentMethod)
+def invalidate_payment_methods(sender, **kwargs):
+    reference_cache.invalidate(CheckoutOptionsService.PAYMENT_METHODS_CACHE)
@@ -0,0 +1,176 @@
+import csv
+import io
+import re
+import zipfile
+from collections.abc import Iterable, Iterator, Sequence
+from datetime import date, datetime
+from decimal import Decimal
+from xml.sax.saxutils import escape, quoteattr
+
+from django.utils import timezone
+
+# Сколько байт копим перед отдачей клиенту: мелкие чанки дороже для WSGI
+CHUNK_SIZE = 64 * 1024
+
+CSV_CONTENT_TYPE = "text/csv; charset=utf-8"
+XLSX_CONTENT_TYPE = (
+    "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+)
+
+# Ячейки с такими префиксами табличные редакторы считают формулами
+_FORMULA_PREFIXES = ("=", "+", "-", "@", "\t", "\r")
+_XML_ILLEGAL_CHARS = re.compile("[\x00-\x08\x0b\x0c\x0e-\x1f]")
+
+_SPREADSHEET_NS = "http://schemas.openxmlformats.org/spreadsheetml/2006/main"
+_RELATIONSHIPS_NS = "http://schemas.openxmlformats.org/package/2006/relationships"
+_DOCUMENT_RELS = "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
+_XML_HEADER = '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+
+_CONTENT_TYPES_XML = (
+    _XML_HEADER
+    + '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+    '<Default Extension="rels" '
+    'ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+    '<Default Extension="xml" ContentType="application/xml"/>'
+    '<Override PartName="/xl/workbook.xml" ContentType="application/'
+    'vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+    '<Override PartName="/xl/worksheets/sheet1.xml" ContentType="application/'
+    'vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+    "</Types>"
+)
+_ROOT_RELS_XML = (
+    _XML_HEADER + f'<Relationships xmlns="{_RELATIONSHIPS_NS}">'
+    f'<Relationship Id="rId1" Type="{_DOCUMENT_RELS}/officeDocument" '
+    'Target="xl/workbook.xml"/>'
+    "</Relationships>"
+)
+_WORKBOOK_RELS_XML = (
+    _XML_HEADER + f'<Relationships xmlns="{_RELATIONSHIPS_NS}">'
+    f'<Relationship Id="rId1" Type="{_DOCUMENT_RELS}/worksheet" '
+    'Target="worksheets/sheet1.xml"/>'
+    "</Relationships>"
+)
+_SHEET_HEAD = _XML_HEADER + f'<worksheet xmlns="{_SPREADSHEET_NS}"><sheetData>'
+_SHEET_TAIL = "</sheetData></worksheet>"
+
+
+def format_value(value) -> str:
+    if value is None:
+        return ""
+    if isinstance(value, bool):
+        return "да" if value else "нет"
+    if isinstance(value, datetime):
+        if timezone.is_aware(value):
+            value = timezone.localtime(value)
+        return value.strftime("%Y-%m-%d %H:%M:%S")
+    if isinstance(value, date):
+        return value.isoformat()
+    return str(value)
+
+
+class _Echo:
+    """Псевдобуфер для csv.writer: возвращает строку вместо записи."""
+
+    def write(self, value: str) -> str:
+        return value
+
+
+def _csv_cell(value) -> str:
+    text = format_value(value)
+    if isinstance(value, str) and text.startswith(_FORMULA_PREFIXES):
+        return "'" + text
+    return text
+
+
+def iter_csv(header: Sequence[str], rows: Iterable[Sequence]) -> Iterator[bytes]:
+    """CSV с BOM, чтобы Excel открыл кириллицу без мастера импорта."""
+    writer = csv.writer(_Echo())
+    # Заголовок уходит до первого запроса в БД, клиент сразу получает ответ
+    yield ("\ufeff" + writer.writerow(header)).encode()
+
+    buffer, size = [], 0
+    for row in rows:
+        line = writer.writerow([_csv_cell(value) for value in row])
+        buffer.append(line)
+        size += len(line)
+        if size >= CHUNK_SIZE:
+            yield "".join(buffer).encode()
+            buffer, size = [], 0
+
+    if buffer:
+        yield "".join(buffer).encode()
+
+
+class _ZipStream(io.RawIOBase):
+    """Несикабельный приемник для zipfile: копит байты до выдачи в ответ."""
+
+    def __init__(self):
+        super().__init__()
+        self._chunks: list[bytes] = []
+        self.size = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        self.size += len(data)
+        return len(data)
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks, self.size = [], 0
+        return data
+
+
+def _xlsx_cell(value) -> str:
+    if isinstance(value, bool):
+        return f'<c t="b"><v>{int(value)}</v></c>'
+    if isinstance(value, (int, float, Decimal)):
+        return f'<c t="n"><v>{value}</v></c>'
+    text = _XML_ILLEGAL_CHARS.sub("", format_value(value))
+    return f'<c t="inlineStr"><is><t xml:space="preserve">{escape(text)}</t></is></c>'
+
+
+def _xlsx_row(index: int, values: Sequence) -> str:
+    return f'<row r="{index}">{"".join(_xlsx_cell(v) for v in values)}</row>'
+
+
+def iter_xlsx(
+    header: Sequence[str], rows: Iterable[Sequence], sheet_name: str = "Лист1"
+) -> Iterator[bytes]:
+    """
+    Однолистовой XLSX, который пишется потоком: строки сразу сжимаются в zip
+    с дескрипторами данных, весь документ в памяти не держится.
+    """
+    stream = _ZipStream()
+    with zipfile.ZipFile(stream, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+        archive.writestr("[Content_Types].xml", _CONTENT_TYPES_XML)
+        archive.writestr("_rels/.rels", _ROOT_RELS_XML)
+        archive.writestr(
+            "xl/workbook.xml",
+            _XML_HEADER + f'<workbook xmlns="{_SPREADSHEET_NS}" '
+            f'xmlns:r="{_DOCUMENT_RELS}"><sheets>'
+            f'<sheet name={quoteattr(sheet_name[:31])} sheetId="1" r:id="rId1"/>'
+            "</sheets></workbook>",
+        )
+        archive.writestr("xl/_rels/workbook.xml.rels", _WORKBOOK_RELS_XML)
+
+        with archive.open("xl/worksheets/sheet1.xml", "w", force_zip64=True) as sheet:
+            sheet.write((_SHEET_HEAD + _xlsx_row(1, header)).encode())
+            yield stream.drain()
+
+            buffer, size = [], 0
+            for index, row in enumerate(rows, start=2):
+                line = _xlsx_row(index, row)
+                buffer.append(line)
+                size += len(line)
+                if size >= CHUNK_SIZE:
+                    sheet.write("".join(buffer).encode())
+                    buffer, size = [], 0
+                    if stream.size:
+                        yield stream.drain()
+
+            sheet.write(("".join(buffer) + _SHEET_TAIL).encode())
+
+    yield stream.drain()
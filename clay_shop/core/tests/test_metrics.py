@@ -0,0 +1,84 @@
+import pytest
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.urls import path
+
+from core.metrics import registry
+from core.views import metrics_view
+
+User = get_user_model()
+
+
+def users_view(request):
+    cache.get_many(["metrics:present", "metrics:absent"])
+    return HttpResponse(str(User.objects.count() + User.objects.count()))
+
+
+urlpatterns = [
+    path("users/", users_view, name="users"),
+    path("metrics/", metrics_view, name="metrics"),
+]
+
+
+@pytest.fixture
+def metrics_urls(settings):
+    settings.ROOT_URLCONF = __name__
+    settings.QUERY_BUDGETS = {"users": 1}
+    settings.METRICS_TOKEN = "secret"
+    registry.reset()
+    cache.set("metrics:present", 1)
+    yield
+    cache.delete("metrics:present")
+    registry.reset()
+
+
+@pytest.mark.django_db
+@pytest.mark.usefixtures("metrics_urls")
+class TestRequestMetrics:
+    def test_request_metrics(self, client):
+        response = client.get("/users/")
+
+        metrics = response.wsgi_request.metrics
+        assert metrics.queries == 2
+        assert metrics.cache_hits == 1
+        assert metrics.cache_misses == 1
+        assert metrics.budget_exceeded() is True
+
+    def test_prometheus_endpoint(self, client):
+        client.get("/users/")
+        client.get("/users/")
+
+        body = client.get(
+            "/metrics/", HTTP_AUTHORIZATION="Bearer secret"
+        ).content.decode()
+
+        assert 'django_view_requests_total{view="users"} 2' in body
+        assert 'django_view_queries_total{view="users"} 4' in body
+        assert 'django_view_query_budget_exceeded_total{view="users"} 2' in body
+
+    def test_endpoint_requires_token(self, client):
+        assert client.get("/metrics/").status_code == 403
+        assert (
+            client.get("/metrics/", HTTP_AUTHORIZATION="Bearer wrong").status_code
+            == 403
+        )
+        response = client.get("/metrics/", HTTP_AUTHORIZATION="Bearer secret")
+        assert response.status_code == 200
+
+    def test_without_token_only_staff(self, client, settings):
+        settings.METRICS_TOKEN = ""
+        user = User.objects.create_user(
+            username="staff",
+            email="staff@example.com",
+            first_name="Staff",
+            last_name="Test",
+            password="TestPassword123!",
+        )
+
+        assert client.get("/metrics/").status_code == 403
+        client.force_login(user)
+        assert client.get("/metrics/").status_code == 403
+
+        User.objects.filter(id=user.id).update(is_staff=True)
+        assert client.get("/metrics/").status_code == 200
@@ -0,0 +1,80 @@
+import pytest
+from django.contrib.auth import get_user_model
+from django.http import Http404
+
+from core.pagination import CursorPaginator
+
+User = get_user_model()
+
+
+@pytest.fixture
+def users(db):
+    return [
+        User.objects.create_user(
+            username=f"user{index}",
+            email=f"user{index}@example.com",
+            first_name=f"First{index % 3}",
+            last_name=f"Last{index}",
+            password="TestPassword123!",
+        )
+        for index in range(7)
+    ]
+
+
+@pytest.mark.django_db
+class TestCursorPaginator:
+    def test_first_page(self, users):
+        page = CursorPaginator(User.objects.all(), 3, "-created_at").page()
+
+        assert list(page) == users[::-1][:3]
+        assert page.has_next() is True
+        assert page.has_previous() is False
+
+    def test_walk_forward_and_back(self, users):
+        paginator = CursorPaginator(User.objects.all(), 3, "first_name")
+        expected = sorted(users, key=lambda user: (user.first_name, user.pk))
+
+        first = paginator.page()
+        second = paginator.page(first.next_cursor)
+        third = paginator.page(second.next_cursor)
+
+        assert list(first) + list(second) + list(third) == expected
+        assert third.has_next() is False
+        assert list(paginator.page(third.previous_cursor)) == list(second)
+        assert list(paginator.page(second.previous_cursor)) == list(first)
+        assert paginator.page(second.previous_cursor).has_previous() is False
+
+    def test_descending_with_ties(self, users):
+        paginator = CursorPaginator(User.objects.all(), 2, "-first_name")
+        expected = sorted(
+            users, key=lambda user: (user.first_name, user.pk), reverse=True
+        )
+
+        result = []
+        page = paginator.page()
+        while True:
+            result.extend(page)
+            if not page.has_next():
+                break
+            page = paginator.page(page.next_cursor)
+
+        assert result == expected
+
+    def test_invalid_cursor(self, users):
+        paginator = CursorPaginator(User.objects.all(), 3, "-created_at")
+
+        with pytest.raises(Http404):
+            paginator.page("not-a-cursor")
+
+    def test_deep_page_has_no_offset_or_count(
+        self, users, django_assert_num_queries
+    ):
+        paginator = CursorPaginator(User.objects.all(), 3, "-created_at")
+        cursor = paginator.page().next_cursor
+
+        with django_assert_num_queries(1) as captured:
+            paginator.page(cursor)
+
+        sql = captured.captured_queries[0]["sql"].upper()
+        assert "OFFSET" not in sql
+        assert "COUNT(" not in sql
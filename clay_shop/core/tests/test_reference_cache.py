@@ -0,0 +1,73 @@
+import pytest
+from django.core.cache import cache
+
+from core.models import DeliveryMethod
+from core.reference_cache import ReferenceCache, reference_cache
+from core.services.checkout_options import CheckoutOptionsService
+
+
+@pytest.fixture
+def local_reference_cache(settings):
+    settings.CACHES = {
+        "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}
+    }
+    cache.clear()
+    reference_cache.clear_local()
+    yield reference_cache
+    reference_cache.clear_local()
+    cache.clear()
+
+
+@pytest.fixture
+def courier(db):
+    return DeliveryMethod.objects.create(
+        name="Курьер", price=500, description="По городу", is_active=True
+    )
+
+
+@pytest.mark.django_db
+@pytest.mark.usefixtures("local_reference_cache")
+class TestReferenceCache:
+    def test_repeated_reads_skip_database(self, courier, django_assert_num_queries):
+        with django_assert_num_queries(1):
+            CheckoutOptionsService.get_delivery_methods()
+
+        with django_assert_num_queries(0):
+            assert CheckoutOptionsService.get_delivery_method(courier.id) == courier
+
+    def test_local_tier_skips_redis_tier(self, courier):
+        CheckoutOptionsService.get_delivery_methods()
+        cache.clear()
+
+        assert CheckoutOptionsService.get_delivery_methods() == [courier]
+
+    def test_save_invalidates_after_commit(
+        self, courier, django_capture_on_commit_callbacks
+    ):
+        CheckoutOptionsService.get_delivery_methods()
+
+        with django_capture_on_commit_callbacks(execute=True):
+            courier.is_active = False
+            courier.save()
+
+        assert CheckoutOptionsService.get_delivery_methods() == []
+
+    def test_evicted_entry_reloads_new_version(self, courier):
+        CheckoutOptionsService.get_delivery_methods()
+        DeliveryMethod.objects.create(
+            name="Почта", price=300, description="По России", is_active=True
+        )
+        # Так другой процесс видит сообщение из pub/sub
+        cache.incr(ReferenceCache._version_key("delivery_methods"))
+        reference_cache.evict("delivery_methods")
+
+        assert len(CheckoutOptionsService.get_delivery_methods()) == 2
+
+    def test_local_tier_is_bounded(self):
+        lru = ReferenceCache()
+        lru.LOCAL_MAX_SIZE = 2
+
+        for name in ("a", "b", "c"):
+            lru.get(name, lambda name=name: name)
+
+        assert list(lru._local) == ["b", "c"]
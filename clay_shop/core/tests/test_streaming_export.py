@@ -0,0 +1,63 @@
+import csv
+import io
+import zipfile
+from datetime import datetime, timezone
+from decimal import Decimal
+from xml.etree import ElementTree
+
+from core.streaming_export import CHUNK_SIZE, iter_csv, iter_xlsx
+
+SHEET_NS = {"s": "http://schemas.openxmlformats.org/spreadsheetml/2006/main"}
+
+
+def make_rows(count: int):
+    for index in range(count):
+        yield (index, f"Товар {index}", Decimal("10.50"), index % 2 == 0)
+
+
+class TestIterCsv:
+    def test_chunks_large_output(self):
+        chunks = list(iter_csv(["ID", "Название", "Цена", "Флаг"], make_rows(20000)))
+
+        assert len(chunks) > 3
+        assert all(len(chunk) < CHUNK_SIZE * 2 for chunk in chunks)
+        rows = list(csv.reader(io.StringIO(b"".join(chunks).decode()[1:])))
+        assert len(rows) == 20001
+        assert rows[1] == ["0", "Товар 0", "10.50", "да"]
+
+    def test_formats_values(self, settings):
+        settings.TIME_ZONE = "Europe/Moscow"
+        moment = datetime(2025, 1, 2, 3, 4, 5, tzinfo=timezone.utc)
+
+        content = b"".join(iter_csv(["a"], [(None, moment, "-1", -1)])).decode()
+
+        assert content.splitlines()[1] == ",2025-01-02 06:04:05,'-1,-1"
+
+
+class TestIterXlsx:
+    def test_streams_valid_workbook(self):
+        chunks = list(iter_xlsx(["ID", "Название", "Цена", "Флаг"], make_rows(20000)))
+
+        assert len(chunks) > 2
+        with zipfile.ZipFile(io.BytesIO(b"".join(chunks))) as archive:
+            assert archive.testzip() is None
+            sheet = ElementTree.fromstring(archive.read("xl/worksheets/sheet1.xml"))
+
+        rows = sheet.findall("s:sheetData/s:row", SHEET_NS)
+        assert len(rows) == 20001
+        cells = rows[1].findall("s:c", SHEET_NS)
+        assert [cell.get("t") for cell in cells] == ["n", "inlineStr", "n", "b"]
+        assert ["".join(cell.itertext()) for cell in cells] == [
+            "0",
+            "Товар 0",
+            "10.50",
+            "1",
+        ]
+
+    def test_strips_illegal_xml_chars(self):
+        content = b"".join(iter_xlsx(["a"], [("bad\x01 <value>",)]))
+
+        with zipfile.ZipFile(io.BytesIO(content)) as archive:
+            sheet = ElementTree.fromstring(archive.read("xl/worksheets/sheet1.xml"))
+
+        assert "".join(sheet.itertext()).endswith("bad <value>")
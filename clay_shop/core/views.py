@@ -1,3 +1,27 @@
-from django.shortcuts import render
+import hmac
 
-# Create your views here.
+from django.conf import settings
+from django.http import HttpResponse, HttpResponseForbidden
+
+from core.metrics import registry
+
+
+def _metrics_allowed(request) -> bool:
+    token = getattr(settings, "METRICS_TOKEN", "")
+    if not token:
+        # Без токена метрики видит только персонал: в них пути и нагрузка на БД
+        return request.user.is_authenticated and request.user.is_staff
+
+    expected = f"Bearer {token}"
+    return hmac.compare_digest(
+        request.headers.get("Authorization", "").encode(), expected.encode()
+    )
+
+
+def metrics_view(request):
+    if not _metrics_allowed(request):
+        return HttpResponseForbidden()
+
+    return HttpResponse(
+        registry.render(), content_type="text/plain; version=0.0.4; charset=utf-8"
+    )
@@ -0,0 +1,27 @@
+# Generated by Django 5.2.5 on 2026-10-18 13:43
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('orders', '0003_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='OrderDailyStat',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField(unique=True, verbose_name='День')),
+                ('orders_count', models.PositiveIntegerField(default=0, verbose_name='Количество заказов')),
+                ('revenue', models.BigIntegerField(default=0, verbose_name='Выручка')),
+            ],
+            options={
+                'verbose_name': 'Заказы за день',
+                'verbose_name_plural': 'Заказы по дням',
+                'ordering': ['-date'],
+            },
+        ),
+    ]
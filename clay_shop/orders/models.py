@@ -150,3 +150,18 @@ class Cart(models.Model):
     def __str__(self):
         return f"{self.user_id.email} - {self.product_id.name} x{self.quantity}"
 
+
+class OrderDailyStat(models.Model):
+    date = models.DateField(unique=True, verbose_name="День")
+    orders_count = models.PositiveIntegerField(
+        default=0, verbose_name="Количество заказов"
+    )
+    revenue = models.BigIntegerField(default=0, verbose_name="Выручка")
+
+    class Meta:
+        verbose_name = "Заказы за день"
+        verbose_name_plural = "Заказы по дням"
+        ordering = ["-date"]
+
+    def __str__(self):
+        return f"{self.date}: {self.orders_count} заказов, {self.revenue} ₽"
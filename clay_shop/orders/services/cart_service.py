@@ -0,0 +1,282 @@
+import logging
+import uuid
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django_redis import get_redis_connection
+
+from orders.models import Cart
+from products.models import Product
+
+logger = logging.getLogger(__name__)
+
+
+class CartService:
+    """Корзина в Redis-хэше qty:<id> и text:<id>; в Postgres попадает при сбросе."""
+
+    SESSION_KEY = "cart_id"
+    DIRTY_KEY = "cart:dirty"
+    LOADED_FIELD = "loaded"
+    USER_CART_TIMEOUT = 60 * 60 * 24 * 30
+    FLUSH_BATCH_SIZE = 500
+    PERSONALIZATION_MAX_LENGTH = Cart._meta.get_field("personalization_text").max_length
+    # Предел SmallIntegerField в Cart.quantity, больше в БД не сбросить
+    MAX_QUANTITY = 32767
+
+    @staticmethod
+    def _redis():
+        return get_redis_connection("default")
+
+    @staticmethod
+    def _key(owner: str) -> str:
+        return cache.make_key(f"cart:{owner}")
+
+    @staticmethod
+    def _dirty_key() -> str:
+        return cache.make_key(CartService.DIRTY_KEY)
+
+    @staticmethod
+    def _user_id(owner: str) -> int | None:
+        kind, _, value = owner.partition(":")
+        return int(value) if kind == "user" else None
+
+    @staticmethod
+    def user_cart(user_id: int) -> str:
+        return f"user:{user_id}"
+
+    @staticmethod
+    def session_cart(session) -> str:
+        # Ключ сессии меняется при входе, поэтому корзина живет под своим id
+        cart_id = session.get(CartService.SESSION_KEY)
+        if not cart_id:
+            cart_id = uuid.uuid4().hex
+            session[CartService.SESSION_KEY] = cart_id
+        return f"anon:{cart_id}"
+
+    @staticmethod
+    def for_request(request) -> str:
+        if request.user.is_authenticated:
+            return CartService.user_cart(request.user.id)
+        return CartService.session_cart(request.session)
+
+    @staticmethod
+    def _ensure_loaded(owner: str) -> None:
+        user_id = CartService._user_id(owner)
+        key = CartService._key(owner)
+        redis = CartService._redis()
+        if user_id is None or redis.exists(key):
+            return
+
+        # Сюда попадаем только после вытеснения ключа из Redis
+        mapping = {CartService.LOADED_FIELD: 1}
+        rows = Cart.objects.filter(user_id_id=user_id).values_list(
+            "product_id_id", "quantity", "personalization_text"
+        )
+        for product_id, quantity, personalization_text in rows:
+            mapping[f"qty:{product_id}"] = quantity
+            if personalization_text:
+                mapping[f"text:{product_id}"] = personalization_text
+
+        redis.hset(key, mapping=mapping)
+        redis.expire(key, CartService.USER_CART_TIMEOUT)
+
+    @staticmethod
+    def _touch(pipe, owner: str) -> None:
+        user_id = CartService._user_id(owner)
+        if user_id is None:
+            pipe.expire(CartService._key(owner), settings.SESSION_COOKIE_AGE)
+        else:
+            pipe.expire(CartService._key(owner), CartService.USER_CART_TIMEOUT)
+            pipe.sadd(CartService._dirty_key(), user_id)
+
+    @staticmethod
+    def change_quantity(
+        owner: str,
+        product_id: int,
+        delta: int,
+        personalization_text: str | None = None,
+    ) -> int:
+        CartService._ensure_loaded(owner)
+        key = CartService._key(owner)
+
+        pipe = CartService._redis().pipeline()
+        pipe.hincrby(key, f"qty:{product_id}", delta)
+        if personalization_text is not None:
+            pipe.hset(
+                key,
+                f"text:{product_id}",
+                personalization_text[: CartService.PERSONALIZATION_MAX_LENGTH],
+            )
+        CartService._touch(pipe, owner)
+        quantity = pipe.execute()[0]
+
+        if quantity <= 0:
+            CartService.remove_item(owner, product_id)
+            return 0
+        if quantity > CartService.MAX_QUANTITY:
+            return CartService.set_quantity(
+                owner, product_id, CartService.MAX_QUANTITY
+            )
+        return quantity
+
+    @staticmethod
+    def add_item(
+        owner: str,
+        product_id: int,
+        quantity: int = 1,
+        personalization_text: str | None = None,
+    ) -> int:
+        if quantity <= 0:
+            raise ValueError("Количество должно быть положительным")
+        return CartService.change_quantity(
+            owner, product_id, quantity, personalization_text
+        )
+
+    @staticmethod
+    def set_quantity(owner: str, product_id: int, quantity: int) -> int:
+        if quantity <= 0:
+            CartService.remove_item(owner, product_id)
+            return 0
+
+        quantity = min(quantity, CartService.MAX_QUANTITY)
+        CartService._ensure_loaded(owner)
+        pipe = CartService._redis().pipeline()
+        pipe.hset(CartService._key(owner), f"qty:{product_id}", quantity)
+        CartService._touch(pipe, owner)
+        pipe.execute()
+        return quantity
+
+    @staticmethod
+    def remove_item(owner: str, product_id: int) -> None:
+        CartService._ensure_loaded(owner)
+        pipe = CartService._redis().pipeline()
+        pipe.hdel(CartService._key(owner), f"qty:{product_id}", f"text:{product_id}")
+        CartService._touch(pipe, owner)
+        pipe.execute()
+
+    @staticmethod
+    def get_items(owner: str) -> dict[int, dict]:
+        CartService._ensure_loaded(owner)
+        raw = CartService._redis().hgetall(CartService._key(owner))
+
+        quantities, texts = {}, {}
+        for field, value in raw.items():
+            kind, _, product_id = field.decode().partition(":")
+            if kind == "qty":
+                quantities[int(product_id)] = int(value)
+            elif kind == "text":
+                texts[int(product_id)] = value.decode()
+
+        return {
+            product_id: {
+                "quantity": quantity,
+                "personalization_text": texts.get(product_id, ""),
+            }
+            for product_id, quantity in quantities.items()
+        }
+
+    @staticmethod
+    def count(owner: str) -> int:
+        return sum(item["quantity"] for item in CartService.get_items(owner).values())
+
+    @staticmethod
+    def clear(owner: str) -> None:
+        key = CartService._key(owner)
+        pipe = CartService._redis().pipeline()
+        pipe.delete(key)
+        if CartService._user_id(owner) is not None:
+            # Маркер не дает подтянуть из БД еще не сброшенные строки
+            pipe.hset(key, CartService.LOADED_FIELD, 1)
+            CartService._touch(pipe, owner)
+        pipe.execute()
+
+    @staticmethod
+    def merge(source: str, target: str) -> None:
+        items = CartService.get_items(source)
+        if not items:
+            CartService.clear(source)
+            return
+
+        CartService._ensure_loaded(target)
+        key = CartService._key(target)
+        pipe = CartService._redis().pipeline()
+        # Сначала все hincrby, чтобы их результаты шли в начале ответа pipeline
+        for product_id, item in items.items():
+            pipe.hincrby(key, f"qty:{product_id}", item["quantity"])
+        for product_id, item in items.items():
+            if item["personalization_text"]:
+                pipe.hset(key, f"text:{product_id}", item["personalization_text"])
+        pipe.delete(CartService._key(source))
+        CartService._touch(pipe, target)
+        quantities = pipe.execute()[: len(items)]
+
+        for product_id, quantity in zip(items, quantities):
+            if quantity > CartService.MAX_QUANTITY:
+                CartService.set_quantity(target, product_id, CartService.MAX_QUANTITY)
+
+    @staticmethod
+    def merge_session_cart(session, user_id: int) -> None:
+        cart_id = session.pop(CartService.SESSION_KEY, None)
+        if cart_id:
+            CartService.merge(f"anon:{cart_id}", CartService.user_cart(user_id))
+
+    @staticmethod
+    @transaction.atomic
+    def flush(user_id: int) -> int:
+        owner = CartService.user_cart(user_id)
+        if not CartService._redis().exists(CartService._key(owner)):
+            return 0
+
+        items = CartService.get_items(owner)
+        existing = set(
+            Product.objects.filter(id__in=items).values_list("id", flat=True)
+        )
+        rows = [
+            Cart(
+                user_id_id=user_id,
+                product_id_id=product_id,
+                quantity=min(item["quantity"], CartService.MAX_QUANTITY),
+                personalization_text=item["personalization_text"],
+            )
+            for product_id, item in items.items()
+            if product_id in existing
+        ]
+
+        Cart.objects.filter(user_id_id=user_id).exclude(
+            product_id_id__in=existing
+        ).delete()
+        Cart.objects.bulk_create(
+            rows,
+            update_conflicts=True,
+            unique_fields=["user_id", "product_id"],
+            update_fields=["quantity", "personalization_text", "updated_at"],
+        )
+        return len(rows)
+
+    @staticmethod
+    def flush_dirty() -> int:
+        redis = CartService._redis()
+        flushed, failed = 0, []
+
+        while True:
+            user_ids = redis.spop(
+                CartService._dirty_key(), CartService.FLUSH_BATCH_SIZE
+            )
+            if not user_ids:
+                break
+
+            for user_id in user_ids:
+                try:
+                    CartService.flush(int(user_id))
+                except Exception as e:
+                    # Сбойная корзина не должна блокировать сброс остальных
+                    logger.error(f"Error flushing cart of user {int(user_id)}: {e}")
+                    failed.append(user_id)
+                    continue
+                flushed += 1
+
+        if failed:
+            # Возвращаем после цикла, иначе spop снова выдаст их в этом же прогоне
+            redis.sadd(CartService._dirty_key(), *failed)
+        return flushed
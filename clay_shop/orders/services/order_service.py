@@ -0,0 +1,132 @@
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.db.models.functions import Coalesce, NullIf
+
+from core.services.checkout_options import CheckoutOptionsService
+from orders.models import Order, OrderItem, OrderStatusHistory
+from orders.models import OrderService as OrderItemService
+from orders.services.cart_service import CartService
+from products.models import Product, Service
+from products.services.products_crud import ProductsService
+from users.models import UserAddress
+
+
+class OrderService:
+    INITIAL_STATUS = "pending"
+
+    @staticmethod
+    @transaction.atomic
+    def place_order(
+        user_id: int,
+        items: dict[int, dict],
+        delivery_method_id: int,
+        address_id: int,
+        payment_method_id: int,
+        notes: str = "",
+    ) -> Order:
+        """items в формате CartService.get_items, у позиции могут быть "services"."""
+        if not items:
+            raise ValidationError("Корзина пуста")
+
+        delivery_method = CheckoutOptionsService.get_delivery_method(delivery_method_id)
+        if delivery_method is None:
+            raise ValidationError("Способ доставки недоступен")
+        payment_method = CheckoutOptionsService.get_payment_method(payment_method_id)
+        if payment_method is None:
+            raise ValidationError("Способ оплаты недоступен")
+
+        try:
+            address = UserAddress.objects.get(id=address_id, user_id=user_id)
+        except UserAddress.DoesNotExist:
+            raise ValidationError("Адрес доставки не найден") from None
+
+        # Резерв блокирует строки товаров, поэтому цены ниже уже не изменятся
+        ProductsService.reserve_stock(
+            {product_id: item["quantity"] for product_id, item in items.items()}
+        )
+        prices = dict(
+            Product.objects.filter(id__in=items)
+            .annotate(price=Coalesce(NullIf("discount_price", 0), "base_price"))
+            .values_list("id", "price")
+        )
+
+        service_ids = {
+            service_id
+            for item in items.values()
+            for service_id in item.get("services", ())
+        }
+        service_prices = {}
+        if service_ids:
+            service_prices = dict(
+                Service.objects.filter(id__in=service_ids, is_active=True).values_list(
+                    "id", "price"
+                )
+            )
+        if len(service_prices) != len(service_ids):
+            raise ValidationError("Одна из выбранных услуг недоступна")
+
+        order_items, item_services = [], []
+        total_amount = delivery_method.price
+        for product_id, item in items.items():
+            order_item = OrderItem(
+                product_id_id=product_id,
+                quantity=item["quantity"],
+                price=prices[product_id],
+                personalization_text=item.get("personalization_text", ""),
+            )
+            order_items.append(order_item)
+            total_amount += order_item.price * order_item.quantity
+
+            for service_id in item.get("services", ()):
+                item_services.append((order_item, service_id))
+                total_amount += service_prices[service_id] * order_item.quantity
+
+        order = Order.objects.create(
+            user_id_id=user_id,
+            status=OrderService.INITIAL_STATUS,
+            total_amount=total_amount,
+            delivery_method_id=delivery_method,
+            delivery_address=address,
+            payment_method=payment_method,
+            notes=notes,
+        )
+
+        for order_item in order_items:
+            order_item.order_id = order
+        # bulk_create в Postgres возвращает id, они нужны для услуг позиций
+        OrderItem.objects.bulk_create(order_items)
+
+        if item_services:
+            OrderItemService.objects.bulk_create(
+                OrderItemService(
+                    order_item_id=order_item,
+                    service_id_id=service_id,
+                    price=service_prices[service_id],
+                )
+                for order_item, service_id in item_services
+            )
+
+        OrderStatusHistory.objects.create(
+            order_id=order, status=OrderService.INITIAL_STATUS, comment="Заказ создан"
+        )
+        return order
+
+    @staticmethod
+    def checkout(
+        user_id: int,
+        delivery_method_id: int,
+        address_id: int,
+        payment_method_id: int,
+        notes: str = "",
+    ) -> Order:
+        owner = CartService.user_cart(user_id)
+        order = OrderService.place_order(
+            user_id,
+            CartService.get_items(owner),
+            delivery_method_id,
+            address_id,
+            payment_method_id,
+            notes,
+        )
+        transaction.on_commit(lambda: CartService.clear(owner))
+        return order
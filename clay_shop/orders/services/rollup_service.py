@@ -0,0 +1,47 @@
+from datetime import date, timedelta
+
+from django.db import transaction
+from django.db.models import Count, Q, Sum
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from orders.models import Order, OrderDailyStat
+from products.services.rollup_service import RollupService
+
+
+class OrderRollupService:
+    @staticmethod
+    @transaction.atomic
+    def rollup_orders(date_from: date, date_to: date) -> int:
+        not_cancelled = ~Q(status="cancelled")
+        rows = (
+            Order.objects.filter(
+                created_at__gte=RollupService.day_start(date_from),
+                created_at__lt=RollupService.day_start(date_to + timedelta(days=1)),
+            )
+            .annotate(day=TruncDate("created_at"))
+            .values("day")
+            .annotate(
+                orders_count=Count("id", filter=not_cancelled),
+                revenue=Sum("total_amount", filter=not_cancelled, default=0),
+            )
+            .order_by()
+        )
+        stats = [
+            OrderDailyStat(
+                date=row["day"],
+                orders_count=row["orders_count"],
+                revenue=row["revenue"],
+            )
+            for row in rows
+        ]
+
+        OrderDailyStat.objects.filter(date__range=(date_from, date_to)).delete()
+        OrderDailyStat.objects.bulk_create(stats)
+        return len(stats)
+
+    @staticmethod
+    def rollup_recent(days: int | None = None) -> int:
+        date_to = timezone.localdate()
+        date_from = date_to - timedelta(days=days or RollupService.LOOKBACK_DAYS)
+        return OrderRollupService.rollup_orders(date_from, date_to)
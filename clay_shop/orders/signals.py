@@ -0,0 +1,10 @@
+from django.contrib.auth.signals import user_logged_in
+from django.dispatch import receiver
+
+from orders.services.cart_service import CartService
+
+
+@receiver(user_logged_in)
+def merge_session_cart(sender, request, user, **kwargs):
+    if request is not None and hasattr(request, "session"):
+        CartService.merge_session_cart(request.session, user.id)
@@ -0,0 +1,30 @@
+import logging
+
+from celery import shared_task
+
+from orders.services.cart_service import CartService
+from orders.services.rollup_service import OrderRollupService
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task(bind=True, max_retries=3, default_retry_delay=60)
+def rollup_order_stats_task(self, days: int | None = None):
+    try:
+        rows = OrderRollupService.rollup_recent(days)
+        return f"Order stats rolled up: {rows} days"
+
+    except Exception as exc:
+        logger.error(f"Error in rollup_order_stats_task: {str(exc)}")
+        raise self.retry(exc=exc)
+
+
+@shared_task(bind=True, max_retries=3, default_retry_delay=60)
+def flush_carts_task(self):
+    try:
+        flushed = CartService.flush_dirty()
+        return f"Carts flushed: {flushed}"
+
+    except Exception as exc:
+        logger.error(f"Error in flush_carts_task: {str(exc)}")
+        raise self.retry(exc=exc)
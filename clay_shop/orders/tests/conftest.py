@@ -0,0 +1,60 @@
+import uuid
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django_redis import get_redis_connection
+
+from core.models import DeliveryMethod, PaymentMethod
+from core.reference_cache import reference_cache
+from core.services.checkout_options import CheckoutOptionsService
+from users.models import UserAddress
+
+User = get_user_model()
+
+
+@pytest.fixture
+def customer(db):
+    return User.objects.create_user(
+        username="customer",
+        email="customer@example.com",
+        first_name="Customer",
+        last_name="Test",
+        password="TestPassword123!",
+    )
+
+
+@pytest.fixture
+def redis_carts(settings):
+    # Свой префикс ключей на прогон: тесты не видят и не стирают живые корзины
+    settings.CACHES = {
+        "default": {
+            **settings.CACHES["default"],
+            "KEY_PREFIX": f"test-{uuid.uuid4().hex}",
+        }
+    }
+    redis = get_redis_connection("default")
+    yield redis
+
+    keys = list(redis.scan_iter(cache.make_key("*")))
+    if keys:
+        redis.delete(*keys)
+
+
+@pytest.fixture
+def checkout_options(customer):
+    options = {
+        "delivery_method_id": DeliveryMethod.objects.create(
+            name="Курьер", price=500, description="По городу", is_active=True
+        ).id,
+        "payment_method_id": PaymentMethod.objects.create(
+            name="Карта", code="card", description="Онлайн"
+        ).id,
+        "address_id": UserAddress.objects.create(
+            user_id=customer, title="Дом", address="Москва"
+        ).id,
+    }
+    # on_commit в тестовой транзакции не срабатывает, сбрасываем справочники явно
+    reference_cache.bump(CheckoutOptionsService.DELIVERY_METHODS_CACHE)
+    reference_cache.bump(CheckoutOptionsService.PAYMENT_METHODS_CACHE)
+    return options
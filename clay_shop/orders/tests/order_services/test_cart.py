@@ -0,0 +1,140 @@
+from unittest.mock import patch
+
+import pytest
+from django.contrib.auth.signals import user_logged_in
+from django.contrib.sessions.backends.cache import SessionStore
+from django.test import RequestFactory
+
+from orders.models import Cart
+from orders.services.cart_service import CartService
+
+
+@pytest.mark.django_db
+@pytest.mark.usefixtures("redis_carts")
+class TestCartService:
+    def test_clicks_do_not_touch_database(
+        self, customer, create_product, django_assert_num_queries
+    ):
+        product = create_product()
+        owner = CartService.user_cart(customer.id)
+        CartService.get_items(owner)
+
+        with django_assert_num_queries(0):
+            CartService.add_item(owner, product.id, 2, "Маме")
+            CartService.change_quantity(owner, product.id, 1)
+            CartService.change_quantity(owner, product.id, -2)
+            items = CartService.get_items(owner)
+
+        assert items == {product.id: {"quantity": 1, "personalization_text": "Маме"}}
+        assert not Cart.objects.exists()
+
+    def test_decrease_to_zero_removes_item(self, customer, create_product):
+        product = create_product()
+        owner = CartService.user_cart(customer.id)
+        CartService.add_item(owner, product.id)
+
+        assert CartService.change_quantity(owner, product.id, -1) == 0
+        assert CartService.get_items(owner) == {}
+
+    def test_flush_upserts_and_deletes_rows(self, customer, create_product):
+        kept, removed, added = (create_product(name=f"Ваза {i}") for i in range(3))
+        Cart.objects.create(user_id=customer, product_id=kept, quantity=1)
+        Cart.objects.create(user_id=customer, product_id=removed, quantity=1)
+        owner = CartService.user_cart(customer.id)
+
+        CartService.set_quantity(owner, kept.id, 4)
+        CartService.remove_item(owner, removed.id)
+        CartService.add_item(owner, added.id, 2)
+
+        assert CartService.flush_dirty() == 1
+        assert dict(
+            Cart.objects.filter(user_id=customer).values_list(
+                "product_id_id", "quantity"
+            )
+        ) == {kept.id: 4, added.id: 2}
+
+    def test_cart_is_restored_from_database(self, customer, create_product):
+        product = create_product()
+        Cart.objects.create(
+            user_id=customer, product_id=product, quantity=3, personalization_text="A"
+        )
+
+        items = CartService.get_items(CartService.user_cart(customer.id))
+
+        assert items == {product.id: {"quantity": 3, "personalization_text": "A"}}
+
+    def test_cleared_cart_is_not_restored(self, customer, create_product):
+        product = create_product()
+        Cart.objects.create(user_id=customer, product_id=product, quantity=3)
+        owner = CartService.user_cart(customer.id)
+
+        CartService.clear(owner)
+
+        assert CartService.get_items(owner) == {}
+        CartService.flush(customer.id)
+        assert not Cart.objects.filter(user_id=customer).exists()
+
+    def test_session_cart_merged_on_login(self, customer, create_product):
+        first, second = create_product(name="Тарелка"), create_product(name="Чашка")
+        request = RequestFactory().get("/")
+        request.session = SessionStore()
+        anonymous = CartService.session_cart(request.session)
+        CartService.add_item(anonymous, first.id, 2)
+        CartService.add_item(anonymous, second.id, 1, "Папе")
+        CartService.add_item(CartService.user_cart(customer.id), first.id, 1)
+
+        user_logged_in.send(sender=type(customer), request=request, user=customer)
+
+        assert CartService.SESSION_KEY not in request.session
+        assert CartService.get_items(anonymous) == {}
+        assert CartService.get_items(CartService.user_cart(customer.id)) == {
+            first.id: {"quantity": 3, "personalization_text": ""},
+            second.id: {"quantity": 1, "personalization_text": "Папе"},
+        }
+
+    def test_quantity_capped_by_column(self, customer, create_product):
+        product = create_product()
+        owner = CartService.user_cart(customer.id)
+        CartService.set_quantity(owner, product.id, CartService.MAX_QUANTITY - 1)
+
+        assert CartService.add_item(owner, product.id, 5) == CartService.MAX_QUANTITY
+        assert CartService.set_quantity(owner, product.id, 10**6) == (
+            CartService.MAX_QUANTITY
+        )
+
+        CartService.flush_dirty()
+        assert Cart.objects.get(user_id=customer).quantity == CartService.MAX_QUANTITY
+
+    def test_failing_cart_does_not_block_flush(
+        self, customer, create_product, django_user_model, redis_carts
+    ):
+        other = django_user_model.objects.create_user(
+            username="other",
+            email="other@example.com",
+            first_name="Other",
+            last_name="Test",
+            password="TestPassword123!",
+        )
+        product = create_product()
+        for user in (customer, other):
+            CartService.add_item(CartService.user_cart(user.id), product.id)
+        flush = CartService.flush
+
+        def broken_flush(user_id):
+            if user_id == customer.id:
+                raise RuntimeError("boom")
+            return flush(user_id)
+
+        with patch.object(CartService, "flush", side_effect=broken_flush):
+            assert CartService.flush_dirty() == 1
+
+        assert list(Cart.objects.values_list("user_id", flat=True)) == [other.id]
+        assert redis_carts.smembers(CartService._dirty_key()) == {
+            str(customer.id).encode()
+        }
+
+    def test_keys_are_isolated_from_shared_redis(self, redis_carts, settings):
+        assert settings.CACHES["default"]["KEY_PREFIX"].startswith("test-")
+        assert CartService._key("user:1").startswith(
+            settings.CACHES["default"]["KEY_PREFIX"]
+        )
@@ -0,0 +1,94 @@
+import pytest
+from django.core.exceptions import ValidationError
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from orders.models import Order, OrderItem, OrderStatusHistory
+from orders.models import OrderService as OrderItemService
+from orders.services.cart_service import CartService
+from orders.services.order_service import OrderService
+from products.models import Product, Service
+
+
+@pytest.mark.django_db
+class TestPlaceOrder:
+    def test_snapshots_prices_and_totals(
+        self, customer, create_product, checkout_options
+    ):
+        mug = create_product(base_price=1500, discount_price=1200)
+        vase = create_product(name="Ваза", base_price=3000, discount_price=0)
+        engraving = Service.objects.create(
+            name="Гравировка", description="Надпись", price=300
+        )
+
+        order = OrderService.place_order(
+            customer.id,
+            {
+                mug.id: {
+                    "quantity": 2,
+                    "personalization_text": "Маме",
+                    "services": [engraving.id],
+                },
+                vase.id: {"quantity": 1},
+            },
+            **checkout_options,
+        )
+
+        assert order.total_amount == 500 + 2 * 1200 + 2 * 300 + 3000
+        assert dict(order.items.values_list("product_id", "price")) == {
+            mug.id: 1200,
+            vase.id: 3000,
+        }
+        assert OrderItemService.objects.get().order_item_id.product_id_id == mug.id
+        assert OrderStatusHistory.objects.get(order_id=order).status == "pending"
+        mug.refresh_from_db()
+        assert mug.stock_quantity == 8
+
+    def test_query_count_does_not_grow_with_cart(
+        self, customer, create_product, checkout_options
+    ):
+        def count_queries(size):
+            products = [create_product(name=f"Ваза {i}") for i in range(size)]
+            items = {product.id: {"quantity": 1} for product in products}
+            with CaptureQueriesContext(connection) as captured:
+                OrderService.place_order(customer.id, items, **checkout_options)
+            return len(captured)
+
+        # Первый заказ прогревает кэш справочников
+        count_queries(1)
+        assert count_queries(1) == count_queries(20)
+
+    def test_nothing_written_when_stock_is_short(
+        self, customer, create_product, checkout_options
+    ):
+        available = create_product(stock_quantity=5)
+        short = create_product(name="Ваза", stock_quantity=1)
+
+        with pytest.raises(ValidationError):
+            OrderService.place_order(
+                customer.id,
+                {available.id: {"quantity": 2}, short.id: {"quantity": 2}},
+                **checkout_options,
+            )
+
+        assert not Order.objects.exists()
+        assert not OrderItem.objects.exists()
+        assert Product.objects.get(id=available.id).stock_quantity == 5
+
+    @pytest.mark.usefixtures("redis_carts")
+    def test_checkout_clears_cart(
+        self,
+        customer,
+        create_product,
+        checkout_options,
+        django_capture_on_commit_callbacks,
+    ):
+        product = create_product()
+        owner = CartService.user_cart(customer.id)
+        CartService.add_item(owner, product.id, 3)
+
+        with django_capture_on_commit_callbacks(execute=True):
+            order = OrderService.checkout(customer.id, **checkout_options)
+
+        assert order.items.get().quantity == 3
+        assert CartService.get_items(owner) == {}
@@ -0,0 +1,51 @@
+from datetime import timedelta
+
+import pytest
+from django.utils import timezone
+
+from orders.models import Order, OrderDailyStat
+from orders.services.rollup_service import OrderRollupService
+
+
+@pytest.fixture
+def create_order(customer, checkout_options):
+    def _create_order(total_amount: int, status: str = "pending", days: int = 0):
+        order = Order.objects.create(
+            user_id=customer,
+            status=status,
+            total_amount=total_amount,
+            delivery_method_id_id=checkout_options["delivery_method_id"],
+            payment_method_id=checkout_options["payment_method_id"],
+            delivery_address_id=checkout_options["address_id"],
+        )
+        Order.objects.filter(id=order.id).update(
+            created_at=timezone.now() - timedelta(days=days)
+        )
+        return order
+
+    return _create_order
+
+
+@pytest.mark.django_db
+class TestOrderRollups:
+    def test_rollup_skips_cancelled_orders(self, create_order):
+        create_order(1000, days=1)
+        create_order(2500, status="delivered", days=1)
+        create_order(9000, status="cancelled", days=1)
+        create_order(700)
+
+        assert OrderRollupService.rollup_recent() == 2
+
+        yesterday = timezone.localdate() - timedelta(days=1)
+        assert list(
+            OrderDailyStat.objects.values_list("date", "orders_count", "revenue")
+        ) == [(timezone.localdate(), 1, 700), (yesterday, 2, 3500)]
+
+    def test_rollup_is_idempotent(self, create_order):
+        create_order(1000, days=1)
+        OrderRollupService.rollup_recent()
+        create_order(500, days=1)
+
+        OrderRollupService.rollup_recent()
+
+        assert OrderDailyStat.objects.get().revenue == 1500
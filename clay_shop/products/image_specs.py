@@ -0,0 +1,23 @@
+from imagekit.models import ImageSpecField
+from imagekit.processors import ResizeToFit
+
+# Ширина миниатюр: карточка каталога, страница товара, увеличение
+THUMBNAIL_SIZES = {"card": 400, "detail": 800, "zoom": 1600}
+THUMBNAIL_FORMATS = {"webp": "WEBP", "jpeg": "JPEG"}
+
+
+class PregeneratedStrategy:
+    """Миниатюры создает Celery-задача, при рендере наличие файла не проверяется."""
+
+    def should_verify_existence(self, file):
+        return False
+
+
+def thumbnail_field(width: int, image_format: str) -> ImageSpecField:
+    return ImageSpecField(
+        source="source",
+        processors=[ResizeToFit(width, width, upscale=False)],
+        format=image_format,
+        options={"quality": 80},
+        cachefile_strategy="products.image_specs.PregeneratedStrategy",
+    )
@@ -0,0 +1,38 @@
+from django.core.management.base import BaseCommand
+
+from products.models import ProductIMG
+from products.services.thumbnail_service import ThumbnailService
+from products.tasks import generate_thumbnails_task
+
+
+class Command(BaseCommand):
+    help = "Ставит в очередь генерацию миниатюр для изображений товаров"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--force",
+            action="store_true",
+            help="Перегенерировать миниатюры для всех изображений",
+        )
+        parser.add_argument(
+            "--sync",
+            action="store_true",
+            help="Обработать изображения сразу, без Celery",
+        )
+
+    def handle(self, *args, **options):
+        force = options["force"]
+        if force:
+            image_ids = list(ProductIMG.objects.values_list("id", flat=True))
+        else:
+            image_ids = ThumbnailService.pending_image_ids()
+
+        for image_id in image_ids:
+            if options["sync"]:
+                ThumbnailService.process(image_id, force=force)
+            else:
+                generate_thumbnails_task.delay(image_id, force=force)
+
+        self.stdout.write(
+            self.style.SUCCESS(f"Миниатюры обработаны для {len(image_ids)} изображений")
+        )
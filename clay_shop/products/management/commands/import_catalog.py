@@ -0,0 +1,48 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from products.services.catalog_import import CatalogImportService
+
+
+class Command(BaseCommand):
+    help = "Импортирует каталог товаров из CSV или JSON фида поставщика"
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="Путь к файлу фида")
+        parser.add_argument(
+            "--format",
+            choices=["csv", "json"],
+            help="Формат фида, по умолчанию определяется по расширению",
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=CatalogImportService.CHUNK_SIZE,
+            help="Сколько строк записывать одной транзакцией",
+        )
+
+    def handle(self, *args, **options):
+        path = options["path"]
+        fmt = options["format"] or CatalogImportService.detect_format(path)
+
+        started = time.perf_counter()
+        try:
+            with open(path, "rb") as file:
+                stats = CatalogImportService.import_file(
+                    file, fmt, options["chunk_size"]
+                )
+        except (OSError, ValueError) as e:
+            raise CommandError(f"Не удалось импортировать фид: {e}") from e
+        elapsed = time.perf_counter() - started
+
+        for error in stats["errors"]:
+            self.stderr.write(self.style.WARNING(error))
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Импорт за {elapsed:.1f} с: создано {stats['created']}, "
+                f"обновлено {stats['updated']}, без изменений {stats['unchanged']}, "
+                f"пропущено {stats['skipped']}"
+            )
+        )
@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+
+from products.services.search_service import ProductSearchService
+
+
+class Command(BaseCommand):
+    help = "Пересчитывает полнотекстовый индекс товаров"
+
+    def handle(self, *args, **options):
+        updated = ProductSearchService.rebuild_index()
+        self.stdout.write(
+            self.style.SUCCESS(f"Поисковый индекс пересчитан для {updated} товаров")
+        )
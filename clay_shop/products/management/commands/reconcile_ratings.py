@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand
+
+from products.services.rating_service import RatingService
+
+
+class Command(BaseCommand):
+    help = "Пересчитывает денормализованные рейтинги товаров по таблице отзывов"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--product",
+            type=int,
+            action="append",
+            dest="product_ids",
+            help="ID товара (можно указать несколько раз)",
+        )
+
+    def handle(self, *args, **options):
+        updated = RatingService.reconcile(options["product_ids"])
+        self.stdout.write(
+            self.style.SUCCESS(f"Рейтинги пересчитаны для {updated} товаров")
+        )
@@ -0,0 +1,24 @@
+from django.core.management.base import BaseCommand
+
+from orders.services.rollup_service import OrderRollupService
+from products.services.rollup_service import RollupService
+
+
+class Command(BaseCommand):
+    help = "Пересчитывает дневные агрегаты аналитики за последние N дней"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--days",
+            type=int,
+            default=365,
+            help="Количество дней для пересчета (по умолчанию 365)",
+        )
+
+    def handle(self, *args, **options):
+        days = options["days"]
+        result = RollupService.rollup_recent(days)
+        result["orders"] = OrderRollupService.rollup_recent(days)
+        self.stdout.write(
+            self.style.SUCCESS(f"Агрегаты за {days} дней пересчитаны: {result}")
+        )
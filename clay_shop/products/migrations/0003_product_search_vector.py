@@ -0,0 +1,59 @@
+# Generated by Django 5.2.5 on 2026-10-18 13:34
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations
+
+SEARCH_VECTOR_TRIGGER_SQL = """
+CREATE OR REPLACE FUNCTION products_product_search_vector_update() RETURNS trigger AS $$
+BEGIN
+    NEW.search_vector :=
+        setweight(to_tsvector('pg_catalog.russian', coalesce(NEW.name, '')), 'A') ||
+        setweight(to_tsvector('pg_catalog.simple', coalesce(NEW.name, '')), 'A') ||
+        setweight(to_tsvector('pg_catalog.russian', coalesce(NEW.description, '')), 'B') ||
+        setweight(to_tsvector('pg_catalog.simple', coalesce(NEW.description, '')), 'B') ||
+        setweight(to_tsvector('pg_catalog.russian', coalesce(NEW.materials, '')), 'C');
+    RETURN NEW;
+END
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER products_product_search_vector_trigger
+    BEFORE INSERT OR UPDATE OF name, description, materials, search_vector
+    ON products_product
+    FOR EACH ROW EXECUTE FUNCTION products_product_search_vector_update();
+
+UPDATE products_product SET search_vector = NULL;
+"""
+
+SEARCH_VECTOR_TRIGGER_REVERSE_SQL = """
+DROP TRIGGER IF EXISTS products_product_search_vector_trigger ON products_product;
+DROP FUNCTION IF EXISTS products_product_search_vector_update();
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('products', '0002_initial'),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        migrations.AddField(
+            model_name='product',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.RunSQL(
+            SEARCH_VECTOR_TRIGGER_SQL, reverse_sql=SEARCH_VECTOR_TRIGGER_REVERSE_SQL
+        ),
+        migrations.AddIndex(
+            model_name='product',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='product_search_vector_gin'),
+        ),
+        migrations.AddIndex(
+            model_name='product',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['name'], name='product_name_trgm', opclasses=['gin_trgm_ops']),
+        ),
+    ]
@@ -0,0 +1,87 @@
+# Generated by Django 5.2.5 on 2026-10-18 13:35
+
+from collections import defaultdict
+
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def backfill_ratings(apps, schema_editor):
+    Product = apps.get_model("products", "Product")
+    Review = apps.get_model("products", "Review")
+
+    histograms = defaultdict(dict)
+    rows = Review.objects.values("product_id", "rating").annotate(count=Count("id"))
+    for row in rows.order_by():
+        histograms[row["product_id"]][row["rating"]] = row["count"]
+
+    products = list(Product.objects.filter(id__in=histograms))
+    for product in products:
+        histogram = histograms[product.id]
+        product.rating_count = sum(histogram.values())
+        product.rating_sum = sum(rating * count for rating, count in histogram.items())
+        product.avg_rating = product.rating_sum / product.rating_count
+        for rating in range(1, 6):
+            setattr(product, f"rating_{rating}_count", histogram.get(rating, 0))
+
+    Product.objects.bulk_update(
+        products,
+        [
+            "rating_sum",
+            "rating_count",
+            "avg_rating",
+            *(f"rating_{rating}_count" for rating in range(1, 6)),
+        ],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('products', '0003_product_search_vector'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='product',
+            name='avg_rating',
+            field=models.FloatField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='product',
+            name='rating_1_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='product',
+            name='rating_2_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='product',
+            name='rating_3_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='product',
+            name='rating_4_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='product',
+            name='rating_5_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='product',
+            name='rating_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='product',
+            name='rating_sum',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(backfill_ratings, migrations.RunPython.noop),
+    ]
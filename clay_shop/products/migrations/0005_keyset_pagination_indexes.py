@@ -0,0 +1,42 @@
+# Generated by Django 5.2.5 on 2026-10-18 13:38
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('products', '0004_product_rating_aggregates'),
+        ('users', '0004_alter_user_options_rename_update_at_user_updated_at_and_more'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='product',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['name', 'id'], name='product_active_name_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='product',
+            index=models.Index(fields=['created_at', 'id'], name='product_created_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='product',
+            index=models.Index(fields=['name', 'id'], name='product_name_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='product',
+            index=models.Index(fields=['base_price', 'id'], name='product_price_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='product',
+            index=models.Index(fields=['stock_quantity', 'id'], name='product_stock_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='review',
+            index=models.Index(fields=['created_at', 'id'], name='review_created_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='review',
+            index=models.Index(fields=['is_verified', 'created_at', 'id'], name='review_verified_created_id_idx'),
+        ),
+    ]
@@ -0,0 +1,43 @@
+# Generated by Django 5.2.5 on 2026-10-18 13:43
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('products', '0005_keyset_pagination_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ProductDailyStat',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField(verbose_name='День')),
+                ('products_count', models.PositiveIntegerField(default=0, verbose_name='Новых товаров')),
+                ('category_id', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='product_daily_stats', to='products.category')),
+            ],
+            options={
+                'verbose_name': 'Новые товары за день',
+                'verbose_name_plural': 'Новые товары по дням',
+                'unique_together': {('date', 'category_id')},
+            },
+        ),
+        migrations.CreateModel(
+            name='ReviewDailyStat',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField(verbose_name='День')),
+                ('rating', models.SmallIntegerField(choices=[(1, '1 звезда'), (2, '2 звезды'), (3, '3 звезды'), (4, '4 звезды'), (5, '5 звезд')])),
+                ('reviews_count', models.PositiveIntegerField(default=0, verbose_name='Количество отзывов')),
+                ('product_id', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='review_daily_stats', to='products.product')),
+            ],
+            options={
+                'verbose_name': 'Отзывы за день',
+                'verbose_name_plural': 'Отзывы по дням',
+                'unique_together': {('date', 'product_id', 'rating')},
+            },
+        ),
+    ]
@@ -0,0 +1,38 @@
+# Generated by Django 5.2.5 on 2026-10-18 14:06
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('products', '0006_daily_stats'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='productimg',
+            name='height',
+            field=models.PositiveIntegerField(editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='productimg',
+            name='source',
+            field=models.ImageField(blank=True, editable=False, height_field='height', upload_to='products/originals/', width_field='width'),
+        ),
+        migrations.AddField(
+            model_name='productimg',
+            name='source_url',
+            field=models.URLField(blank=True, editable=False),
+        ),
+        migrations.AddField(
+            model_name='productimg',
+            name='thumbnail_sizes',
+            field=models.JSONField(blank=True, default=dict, editable=False),
+        ),
+        migrations.AddField(
+            model_name='productimg',
+            name='width',
+            field=models.PositiveIntegerField(editable=False, null=True),
+        ),
+    ]
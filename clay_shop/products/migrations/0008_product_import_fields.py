@@ -0,0 +1,23 @@
+# Generated by Django 5.2.5 on 2026-10-18 14:36
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('products', '0007_product_image_thumbnails'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='product',
+            name='import_hash',
+            field=models.CharField(blank=True, editable=False, max_length=40),
+        ),
+        migrations.AddField(
+            model_name='product',
+            name='sku',
+            field=models.CharField(blank=True, max_length=64, null=True, unique=True, verbose_name='Артикул'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.5 on 2026-10-18 15:07
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('products', '0008_product_import_fields'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='review',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+    ]
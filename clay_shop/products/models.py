@@ -1,6 +1,11 @@
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
 from django.db import models
+from django.utils.functional import cached_property
 from users.models import UserProfile
 
+from products.image_specs import THUMBNAIL_FORMATS, THUMBNAIL_SIZES, thumbnail_field
+
 
 # Create your models here.
 class Category(models.Model):
@@ -34,15 +39,63 @@ class Product(models.Model):
     materials = models.CharField(max_length=255, verbose_name="Материалы изделия")
     weight = models.DecimalField(max_digits=7, decimal_places=2, verbose_name="Вес")
     size = models.DecimalField(max_digits=7, decimal_places=2, verbose_name="Размер")
+    # Артикул поставщика и хеш строки фида, по ним импорт находит изменения
+    sku = models.CharField(
+        max_length=64, unique=True, null=True, blank=True, verbose_name="Артикул"
+    )
+    import_hash = models.CharField(max_length=40, blank=True, editable=False)
+    # Заполняется триггером БД (см. миграцию 0003_product_search_vector)
+    search_vector = SearchVectorField(null=True, editable=False)
+    # Денормализованные агрегаты отзывов, обновляются в ReviewService
+    rating_sum = models.PositiveIntegerField(default=0, editable=False)
+    rating_count = models.PositiveIntegerField(default=0, editable=False)
+    avg_rating = models.FloatField(default=0, editable=False)
+    rating_1_count = models.PositiveIntegerField(default=0, editable=False)
+    rating_2_count = models.PositiveIntegerField(default=0, editable=False)
+    rating_3_count = models.PositiveIntegerField(default=0, editable=False)
+    rating_4_count = models.PositiveIntegerField(default=0, editable=False)
+    rating_5_count = models.PositiveIntegerField(default=0, editable=False)
 
     class Meta:
         ordering = ["name"]
         verbose_name = "Продукт"
         verbose_name_plural = "Продукты"
+        indexes = [
+            GinIndex(fields=["search_vector"], name="product_search_vector_gin"),
+            GinIndex(
+                fields=["name"], name="product_name_trgm", opclasses=["gin_trgm_ops"]
+            ),
+            # Keyset-пагинация: (поле сортировки, id) для каталога и панели продавца
+            models.Index(
+                fields=["name", "id"],
+                condition=models.Q(is_active=True),
+                name="product_active_name_id_idx",
+            ),
+            models.Index(fields=["created_at", "id"], name="product_created_id_idx"),
+            models.Index(fields=["name", "id"], name="product_name_id_idx"),
+            models.Index(fields=["base_price", "id"], name="product_price_id_idx"),
+            models.Index(fields=["stock_quantity", "id"], name="product_stock_id_idx"),
+        ]
 
     def __str__(self):
         return self.name
 
+    @property
+    def rating_histogram(self) -> dict[int, int]:
+        return {
+            rating: getattr(self, f"rating_{rating}_count") for rating in range(1, 6)
+        }
+
+    @cached_property
+    def main_image(self) -> "ProductIMG | None":
+        # main_images подставляет Prefetch в списках товаров, без него лишний запрос.
+        # Шаблоны обращаются к фото дважды ({% if %} и .image_url), запрос один
+        if hasattr(self, "main_images"):
+            return self.main_images[0] if self.main_images else None
+        if "images" in getattr(self, "_prefetched_objects_cache", {}):
+            return next((image for image in self.images.all() if image.is_main), None)
+        return self.images.filter(is_main=True).first()
+
 
 class ProductIMG(models.Model):
     product_id = models.ForeignKey(
@@ -51,6 +104,25 @@ class ProductIMG(models.Model):
     image_url = models.URLField()
     is_main = models.BooleanField(default=True, verbose_name="Главное ли фото")
     order = models.SmallIntegerField(default=0, verbose_name="Порядок показа")
+    # Локальная копия image_url и миниатюры из нее, заполняет ThumbnailService
+    source = models.ImageField(
+        upload_to="products/originals/",
+        blank=True,
+        width_field="width",
+        height_field="height",
+        editable=False,
+    )
+    source_url = models.URLField(blank=True, editable=False)
+    width = models.PositiveIntegerField(null=True, editable=False)
+    height = models.PositiveIntegerField(null=True, editable=False)
+    thumbnail_sizes = models.JSONField(default=dict, blank=True, editable=False)
+
+    card_webp = thumbnail_field(THUMBNAIL_SIZES["card"], THUMBNAIL_FORMATS["webp"])
+    card_jpeg = thumbnail_field(THUMBNAIL_SIZES["card"], THUMBNAIL_FORMATS["jpeg"])
+    detail_webp = thumbnail_field(THUMBNAIL_SIZES["detail"], THUMBNAIL_FORMATS["webp"])
+    detail_jpeg = thumbnail_field(THUMBNAIL_SIZES["detail"], THUMBNAIL_FORMATS["jpeg"])
+    zoom_webp = thumbnail_field(THUMBNAIL_SIZES["zoom"], THUMBNAIL_FORMATS["webp"])
+    zoom_jpeg = thumbnail_field(THUMBNAIL_SIZES["zoom"], THUMBNAIL_FORMATS["jpeg"])
 
     class Meta:
         verbose_name = "Изображение товара"
@@ -61,6 +133,36 @@ class ProductIMG(models.Model):
     def __str__(self):
         return f"Изображения для {self.product_id.name}"
 
+    @property
+    def has_thumbnails(self) -> bool:
+        return bool(self.thumbnail_sizes)
+
+    def thumbnail(self, size: str, image_format: str = "jpeg"):
+        return getattr(self, f"{size}_{image_format}")
+
+    def srcset(self, image_format: str) -> str:
+        # Маленький оригинал не увеличивается, одинаковые ширины в srcset не нужны
+        candidates = {}
+        for size in THUMBNAIL_SIZES:
+            if size in self.thumbnail_sizes:
+                candidates.setdefault(self.thumbnail_sizes[size][0], size)
+        return ", ".join(
+            f"{self.thumbnail(size, image_format).url} {width}w"
+            for width, size in candidates.items()
+        )
+
+    @property
+    def webp_srcset(self) -> str:
+        return self.srcset("webp")
+
+    @property
+    def jpeg_srcset(self) -> str:
+        return self.srcset("jpeg")
+
+    @property
+    def card_size(self) -> list[int]:
+        return self.thumbnail_sizes.get("card", [])
+
 
 class Service(models.Model):
     name = models.CharField(max_length=255)
@@ -90,11 +192,58 @@ class Review(models.Model):
     rating = models.SmallIntegerField(choices=RATING_CHOICES)
     comment = models.TextField()
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
     is_verified = models.BooleanField()
 
     class Meta:
         verbose_name = "Продукт"
         verbose_name_plural = "Продукты"
+        indexes = [
+            models.Index(fields=["created_at", "id"], name="review_created_id_idx"),
+            models.Index(
+                fields=["is_verified", "created_at", "id"],
+                name="review_verified_created_id_idx",
+            ),
+        ]
 
     def __str__(self):
         return self.product_id
+
+
+class ReviewDailyStat(models.Model):
+    date = models.DateField(verbose_name="День")
+    product_id = models.ForeignKey(
+        Product, on_delete=models.CASCADE, related_name="review_daily_stats"
+    )
+    rating = models.SmallIntegerField(choices=Review.RATING_CHOICES)
+    reviews_count = models.PositiveIntegerField(
+        default=0, verbose_name="Количество отзывов"
+    )
+
+    class Meta:
+        verbose_name = "Отзывы за день"
+        verbose_name_plural = "Отзывы по дням"
+        unique_together = ("date", "product_id", "rating")
+
+    def __str__(self):
+        return (
+            f"{self.date}: {self.product_id_id} ({self.rating}) x{self.reviews_count}"
+        )
+
+
+class ProductDailyStat(models.Model):
+    date = models.DateField(verbose_name="День")
+    category_id = models.ForeignKey(
+        Category, on_delete=models.CASCADE, related_name="product_daily_stats"
+    )
+    products_count = models.PositiveIntegerField(
+        default=0, verbose_name="Новых товаров"
+    )
+
+    class Meta:
+        verbose_name = "Новые товары за день"
+        verbose_name_plural = "Новые товары по дням"
+        unique_together = ("date", "category_id")
+
+    def __str__(self):
+        return f"{self.date}: {self.category_id_id} x{self.products_count}"
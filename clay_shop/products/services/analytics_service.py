@@ -1,62 +1,119 @@
 from datetime import timedelta
 from typing import Any
 
-from django.db.models import QuerySet, Avg, Count
+from django.db.models import Count, F, Q, QuerySet, Sum
+from django.db.models.functions import Coalesce
 from django.utils import timezone
 
-from products.models import Product, Review
+from core.db_router import replica_read
+from products.models import Product, ProductDailyStat, Review, ReviewDailyStat
+from products.services.dashboard_cache import DashboardCache
 from products.services.products_crud import ProductsService
 from products.services.review_crud import ReviewService
+from products.services.rollup_service import RollupService
 
 
 class AnalyticsService:
+    LOW_STOCK_THRESHOLD = 5
+
     @staticmethod
-    def get_dashboard_stats() -> dict[str, Any]:
+    def _compute_dashboard_stats() -> dict[str, Any]:
+        threshold = AnalyticsService.LOW_STOCK_THRESHOLD
+        product_stats = Product.objects.aggregate(
+            total_products=Count("id"),
+            active_products=Count("id", filter=Q(is_active=True)),
+            out_of_stock=Count("id", filter=Q(stock_quantity=0)),
+            low_stock=Count(
+                "id", filter=Q(stock_quantity__gt=0, stock_quantity__lte=threshold)
+            ),
+            rating_sum=Coalesce(Sum("rating_sum"), 0),
+            rating_count=Coalesce(Sum("rating_count"), 0),
+        )
+        review_stats = Review.objects.aggregate(
+            total_reviews=Count("id"),
+            pending_reviews=Count("id", filter=Q(is_verified=False)),
+        )
+
+        rating_sum = product_stats.pop("rating_sum")
+        rating_count = product_stats.pop("rating_count")
         return {
-            "total_products": Product.objects.count(),
-            "active_products": Product.objects.filter(is_active=True).count(),
-            "out_of_stock": ProductsService.get_out_of_stock_count(),
-            "low_stock": ProductsService.get_low_stock_products().count(),
-            "total_reviews": ReviewService.get_total_reviews_count(),
-            "pending_reviews": ReviewService.get_pending_reviews_count(),
-            "avg_rating": ReviewService.get_average_rating(),
+            **product_stats,
+            **review_stats,
+            "avg_rating": rating_sum / rating_count if rating_count else 0,
+        }
+
+    @staticmethod
+    @replica_read
+    def get_dashboard_stats() -> dict[str, Any]:
+        return AnalyticsService.get_dashboard()["stats"]
+
+    @staticmethod
+    @replica_read
+    def get_dashboard() -> dict[str, Any]:
+        dashboard = DashboardCache.get()
+        if dashboard is not None:
+            return dashboard
+
+        dashboard = {
+            "stats": AnalyticsService._compute_dashboard_stats(),
+            "recent_reviews": list(ReviewService.get_recent_reviews(limit=5)),
+            "low_stock_products": list(
+                ProductsService.get_low_stock_products(
+                    threshold=AnalyticsService.LOW_STOCK_THRESHOLD
+                )[:10]
+            ),
+            "popular_products": list(ProductsService.get_popular_products(limit=5)),
         }
+        DashboardCache.set(dashboard)
+        return dashboard
 
     @staticmethod
+    @replica_read
     def get_top_rated_products(min_reviews: int = 1, limit: int = 10) -> QuerySet:
         return (
-            Product.objects.annotate(
-                avg_rating=Avg("review__rating"), review_count=Count("review")
-            )
-            .filter(review_count__gte=min_reviews)
+            Product.objects.annotate(review_count=F("rating_count"))
+            .filter(rating_count__gte=min_reviews)
             .order_by("-avg_rating")[:limit]
         )
 
     @staticmethod
+    @replica_read
     def get_products_needing_attention(
         min_reviews: int = 3, rating_threshold: float = 3.5, limit: int = 10
     ) -> QuerySet:
         return (
-            Product.objects.annotate(
-                avg_rating=Avg("review__rating"), review_count=Count("review")
-            )
-            .filter(review_count__gte=min_reviews, avg_rating__lt=rating_threshold)
+            Product.objects.annotate(review_count=F("rating_count"))
+            .filter(rating_count__gte=min_reviews, avg_rating__lt=rating_threshold)
             .order_by("-avg_rating")[:limit]
         )
 
     @staticmethod
+    @replica_read
     def get_period_stats(days: int = 30) -> dict[str, Any]:
-        date_from = timezone.now() - timedelta(days=days)
+        # Завершенные дни берутся из дневных агрегатов, сегодняшний считается вживую
+        today = timezone.localdate()
+        date_from = today - timedelta(days=days)
+        today_start = RollupService.day_start(today)
+
+        new_reviews = ReviewDailyStat.objects.filter(
+            date__gte=date_from, date__lt=today
+        ).aggregate(total=Coalesce(Sum("reviews_count"), 0))["total"]
+        new_products = ProductDailyStat.objects.filter(
+            date__gte=date_from, date__lt=today
+        ).aggregate(total=Coalesce(Sum("products_count"), 0))["total"]
 
         return {
-            "new_reviews": Review.objects.filter(created_at__gte=date_from).count(),
-            "new_products": Product.objects.filter(created_at__gte=date_from).count(),
+            "new_reviews": new_reviews
+            + Review.objects.filter(created_at__gte=today_start).count(),
+            "new_products": new_products
+            + Product.objects.filter(created_at__gte=today_start).count(),
         }
 
     @staticmethod
+    @replica_read
     def get_category_distribution() -> QuerySet:
         return (
             Product.objects.values("category_id__name")
             .annotate(count=Count("id"))
             .order_by("-count")
-        )
\ No newline at end of file
+        )
@@ -0,0 +1,130 @@
+import time
+from typing import Iterable
+
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Prefetch, prefetch_related_objects
+from django.template.loader import render_to_string
+
+from products.models import Product, ProductIMG
+
+
+class ProductCardCache:
+    TEMPLATE = "partials/product_card.html"
+    CACHE_PREFIX = "product_card"
+    VERSION_PREFIX = "product_card_version"
+    CACHE_TIMEOUT = 60 * 60 * 24
+    # Поля, которые нужны шаблону карточки
+    CARD_FIELDS = (
+        "id",
+        "name",
+        "description",
+        "base_price",
+        "discount_price",
+        "stock_quantity",
+        "is_active",
+    )
+
+    @staticmethod
+    def main_image_prefetch() -> Prefetch:
+        return Prefetch(
+            "images",
+            queryset=ProductIMG.objects.filter(is_main=True).only(
+                "id",
+                "product_id",
+                "image_url",
+                "order",
+                "source",
+                "width",
+                "height",
+                "thumbnail_sizes",
+            ),
+            to_attr="main_images",
+        )
+
+    @staticmethod
+    def _version_key(product_id: int) -> str:
+        return f"{ProductCardCache.VERSION_PREFIX}:{product_id}"
+
+    @staticmethod
+    def _card_key(product_id: int, version: int) -> str:
+        return f"{ProductCardCache.CACHE_PREFIX}:{product_id}:{version}"
+
+    @staticmethod
+    def _initial_version() -> int:
+        # Версия после вытеснения ключа не должна совпасть со старыми карточками
+        return time.time_ns()
+
+    @staticmethod
+    def get_versions(product_ids: Iterable[int]) -> dict[int, int]:
+        keys = {ProductCardCache._version_key(pid): pid for pid in product_ids}
+        versions = cache.get_many(list(keys))
+
+        missing = {
+            key: ProductCardCache._initial_version()
+            for key in keys
+            if key not in versions
+        }
+        if missing:
+            cache.set_many(missing, timeout=None)
+            versions.update(missing)
+
+        return {pid: versions[key] for key, pid in keys.items()}
+
+    @staticmethod
+    def bump_version(product_id: int) -> None:
+        key = ProductCardCache._version_key(product_id)
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.set(key, ProductCardCache._initial_version(), timeout=None)
+
+    @staticmethod
+    def invalidate(product_id: int) -> None:
+        # Сбрасываем после коммита, иначе параллельный запрос закэширует старые данные
+        transaction.on_commit(lambda: ProductCardCache.bump_version(product_id))
+
+    @staticmethod
+    def invalidate_many(product_ids: Iterable[int]) -> None:
+        product_ids = list(product_ids)
+
+        def bump_versions():
+            for product_id in product_ids:
+                ProductCardCache.bump_version(product_id)
+
+        transaction.on_commit(bump_versions)
+
+    @staticmethod
+    def render_card(product: Product) -> str:
+        return render_to_string(ProductCardCache.TEMPLATE, {"product": product})
+
+    @staticmethod
+    def render_cards(products: Iterable[Product]) -> list[str]:
+        products = list(products)
+        versions = ProductCardCache.get_versions(product.id for product in products)
+        keys = [
+            ProductCardCache._card_key(product.id, versions[product.id])
+            for product in products
+        ]
+
+        cards = cache.get_many(keys)
+        missing = [
+            (key, product) for key, product in zip(keys, products) if key not in cards
+        ]
+
+        if missing:
+            without_images = [
+                product
+                for _, product in missing
+                if not hasattr(product, "main_images")
+            ]
+            prefetch_related_objects(
+                without_images, ProductCardCache.main_image_prefetch()
+            )
+            rendered = {
+                key: ProductCardCache.render_card(product) for key, product in missing
+            }
+            cache.set_many(rendered, ProductCardCache.CACHE_TIMEOUT)
+            cards.update(rendered)
+
+        return [cards[key] for key in keys]
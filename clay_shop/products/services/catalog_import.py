@@ -0,0 +1,323 @@
+import csv
+import hashlib
+import io
+import json
+import logging
+import re
+from collections import defaultdict
+from collections.abc import Iterable, Iterator
+from decimal import Decimal, InvalidOperation
+from typing import Any
+from urllib.parse import urlsplit
+
+from django.db import transaction
+from django.db.models import F, Q
+
+from core.response_cache import ResponseCache
+from products.models import Category, Product, ProductIMG
+from products.services.card_cache import ProductCardCache
+from products.services.dashboard_cache import DashboardCache
+from products.tasks import generate_thumbnails_batch_task
+
+logger = logging.getLogger(__name__)
+
+_JSON_SEPARATORS = re.compile(r"[\s,\[\]]*")
+
+
+class CatalogImportService:
+    # Строк фида на одну транзакцию и один INSERT ... ON CONFLICT
+    CHUNK_SIZE = 1000
+    READ_SIZE = 64 * 1024
+    MAX_ERRORS = 100
+    UPLOAD_DIR = "imports"
+    JSON_EXTENSIONS = ("json", "jsonl", "ndjson")
+    # Ссылки на фото в CSV перечисляются в одной колонке images
+    IMAGE_SEPARATOR = "|"
+    TRUE_VALUES = ("1", "true", "yes", "да")
+    FALSE_VALUES = ("0", "false", "no", "нет")
+
+    # Поля товара, которые фид перезаписывает при повторном импорте
+    UPDATE_FIELDS = [
+        "name",
+        "description",
+        "base_price",
+        "discount_price",
+        "is_unique",
+        "stock_quantity",
+        "category_id",
+        "is_active",
+        "manufacturing_time_days",
+        "materials",
+        "weight",
+        "size",
+        "import_hash",
+        "updated_at",
+    ]
+
+    @staticmethod
+    def detect_format(filename: str) -> str:
+        extension = filename.rsplit(".", 1)[-1].lower()
+        return "json" if extension in CatalogImportService.JSON_EXTENSIONS else "csv"
+
+    @staticmethod
+    def iter_json(stream) -> Iterator[Any]:
+        """Объекты JSON-массива или JSON Lines, фид целиком в память не читается."""
+        decoder = json.JSONDecoder()
+        buffer, position = "", 0
+        while True:
+            position = _JSON_SEPARATORS.match(buffer, position).end()
+            if position < len(buffer):
+                try:
+                    value, position = decoder.raw_decode(buffer, position)
+                except json.JSONDecodeError:
+                    # Объект обрезан границей чанка, дочитываем
+                    pass
+                else:
+                    yield value
+                    continue
+
+            chunk = stream.read(CatalogImportService.READ_SIZE)
+            if not chunk:
+                if position < len(buffer):
+                    raise ValueError("Некорректный JSON в конце фида")
+                return
+            buffer, position = buffer[position:] + chunk, 0
+
+    @staticmethod
+    def iter_feed(file, fmt: str) -> Iterator[Any]:
+        text = io.TextIOWrapper(file, encoding="utf-8-sig", newline="")
+        if fmt == "json":
+            return CatalogImportService.iter_json(text)
+        return csv.DictReader(text)
+
+    @staticmethod
+    def _text(row: dict, field: str, max_length: int, required: bool = False) -> str:
+        value = str(row.get(field) or "").strip()
+        if required and not value:
+            raise ValueError(f"не заполнено поле {field}")
+        if len(value) > max_length:
+            raise ValueError(f"поле {field} длиннее {max_length} символов")
+        return value
+
+    @staticmethod
+    def _int(row: dict, field: str, default: int | None = None) -> int:
+        value = row.get(field)
+        if value in (None, ""):
+            if default is None:
+                raise ValueError(f"не заполнено поле {field}")
+            return default
+        try:
+            number = int(str(value).strip())
+        except ValueError:
+            raise ValueError(f"поле {field} должно быть целым числом") from None
+        if number < 0:
+            raise ValueError(f"поле {field} не может быть отрицательным")
+        return number
+
+    @staticmethod
+    def _bool(row: dict, field: str, default: bool) -> bool:
+        value = row.get(field)
+        if isinstance(value, bool):
+            return value
+        value = str(value if value is not None else "").strip().lower()
+        if not value:
+            return default
+        if value in CatalogImportService.TRUE_VALUES:
+            return True
+        if value in CatalogImportService.FALSE_VALUES:
+            return False
+        raise ValueError(f"поле {field} должно быть да/нет")
+
+    @staticmethod
+    def _decimal(row: dict, field: str) -> Decimal:
+        value = row.get(field)
+        try:
+            number = Decimal(str(value if value not in (None, "") else 0))
+            number = number.quantize(Decimal("0.01"))
+        except InvalidOperation:
+            raise ValueError(f"поле {field} должно быть числом") from None
+        if not Decimal(0) <= number < Decimal(100000):
+            raise ValueError(f"поле {field} вне допустимого диапазона")
+        return number
+
+    @staticmethod
+    def _images(row: dict) -> list[str]:
+        value = row.get("images") or []
+        if isinstance(value, str):
+            value = value.split(CatalogImportService.IMAGE_SEPARATOR)
+
+        urls = [str(url).strip() for url in value if str(url).strip()]
+        for url in urls:
+            # URLValidator на сотнях тысяч ссылок заметно дороже разбора urlsplit
+            parts = urlsplit(url)
+            if parts.scheme not in ("http", "https") or not parts.netloc:
+                raise ValueError(f"некорректная ссылка на фото {url}")
+        return urls
+
+    @staticmethod
+    def normalize(row: dict, categories: dict[str, int]) -> tuple[str, dict, list]:
+        """Приводит строку фида к полям товара, ошибки — ValueError."""
+        if not isinstance(row, dict):
+            raise ValueError("строка фида должна быть объектом")
+
+        sku = CatalogImportService._text(row, "sku", 64, required=True)
+        slug = CatalogImportService._text(row, "category", 50, required=True)
+        if slug not in categories:
+            raise ValueError(f"неизвестная категория {slug}")
+
+        base_price = CatalogImportService._int(row, "base_price")
+        fields = {
+            "name": CatalogImportService._text(row, "name", 127, required=True),
+            "description": CatalogImportService._text(row, "description", 127),
+            "base_price": base_price,
+            "discount_price": CatalogImportService._int(
+                row, "discount_price", default=base_price
+            ),
+            "is_unique": CatalogImportService._bool(row, "is_unique", default=True),
+            "stock_quantity": CatalogImportService._int(
+                row, "stock_quantity", default=0
+            ),
+            "category_id_id": categories[slug],
+            "is_active": CatalogImportService._bool(row, "is_active", default=True),
+            "manufacturing_time_days": CatalogImportService._int(
+                row, "manufacturing_time_days", default=0
+            ),
+            "materials": CatalogImportService._text(row, "materials", 255),
+            "weight": CatalogImportService._decimal(row, "weight"),
+            "size": CatalogImportService._decimal(row, "size"),
+        }
+        return sku, fields, CatalogImportService._images(row)
+
+    @staticmethod
+    def content_hash(fields: dict, images: list[str]) -> str:
+        payload = json.dumps([fields, images], sort_keys=True, default=str)
+        return hashlib.sha1(payload.encode()).hexdigest()
+
+    @staticmethod
+    def import_rows(
+        rows: Iterable[Any], chunk_size: int | None = None
+    ) -> dict[str, Any]:
+        chunk_size = chunk_size or CatalogImportService.CHUNK_SIZE
+        categories = dict(Category.objects.values_list("slug", "id"))
+        stats = {"created": 0, "updated": 0, "unchanged": 0, "skipped": 0, "errors": []}
+
+        chunk = {}
+        for line, row in enumerate(rows, start=1):
+            try:
+                sku, fields, images = CatalogImportService.normalize(row, categories)
+            except ValueError as e:
+                stats["skipped"] += 1
+                if len(stats["errors"]) < CatalogImportService.MAX_ERRORS:
+                    stats["errors"].append(f"Строка {line}: {e}")
+                continue
+
+            # Повтор артикула в фиде: побеждает последняя строка
+            chunk[sku] = (fields, images)
+            if len(chunk) >= chunk_size:
+                CatalogImportService._apply_chunk(chunk, stats)
+                chunk = {}
+
+        if chunk:
+            CatalogImportService._apply_chunk(chunk, stats)
+
+        logger.info(
+            f"Catalog import: {stats['created']} created, {stats['updated']} updated, "
+            f"{stats['unchanged']} unchanged, {stats['skipped']} skipped"
+        )
+        return stats
+
+    @staticmethod
+    def import_file(file, fmt: str, chunk_size: int | None = None) -> dict[str, Any]:
+        return CatalogImportService.import_rows(
+            CatalogImportService.iter_feed(file, fmt), chunk_size
+        )
+
+    @staticmethod
+    def _apply_chunk(chunk: dict[str, tuple[dict, list]], stats: dict) -> None:
+        existing = {
+            sku: (import_hash, category_id)
+            for sku, import_hash, category_id in Product.objects.filter(sku__in=chunk)
+            .order_by()
+            .values_list("sku", "import_hash", "category_id")
+        }
+
+        products, images = [], {}
+        for sku, (fields, urls) in chunk.items():
+            import_hash = CatalogImportService.content_hash(fields, urls)
+            current = existing.get(sku)
+            if current and current[0] == import_hash:
+                stats["unchanged"] += 1
+                continue
+
+            stats["updated" if current else "created"] += 1
+            products.append(Product(sku=sku, import_hash=import_hash, **fields))
+            images[sku] = urls
+
+        # Неизмененный фид не пишет в БД ничего и не открывает транзакций
+        if not products:
+            return
+
+        with transaction.atomic():
+            Product.objects.bulk_create(
+                products,
+                update_conflicts=True,
+                unique_fields=["sku"],
+                update_fields=CatalogImportService.UPDATE_FIELDS,
+            )
+            CatalogImportService._replace_images(products, images, existing)
+
+            updated_ids = [p.id for p in products if p.sku in existing]
+            category_ids = {product.category_id_id for product in products}
+            category_ids.update(category_id for _, category_id in existing.values())
+            CatalogImportService._invalidate(updated_ids, category_ids)
+
+    @staticmethod
+    def _replace_images(
+        products: list[Product], images: dict[str, list], existing: dict
+    ) -> None:
+        rows = [
+            ProductIMG(
+                product_id_id=product.id, image_url=url, order=order, is_main=order == 0
+            )
+            for product in products
+            for order, url in enumerate(images[product.sku])
+        ]
+        if rows:
+            ProductIMG.objects.bulk_create(
+                rows,
+                update_conflicts=True,
+                unique_fields=["product_id", "order"],
+                update_fields=["image_url", "is_main"],
+            )
+
+        # Фото, которых больше нет в фиде, удаляются по порядковому номеру
+        by_count = defaultdict(list)
+        for product in products:
+            if product.sku in existing:
+                by_count[len(images[product.sku])].append(product.id)
+        if by_count:
+            surplus = Q()
+            for count, product_ids in by_count.items():
+                surplus |= Q(product_id__in=product_ids, order__gte=count)
+            ProductIMG.objects.filter(surplus).delete()
+
+        # Сигнал post_save при bulk-операциях не срабатывает, ставим миниатюры сами
+        image_ids = list(
+            ProductIMG.objects.filter(product_id__in=[p.id for p in products])
+            .exclude(image_url=F("source_url"))
+            .values_list("id", flat=True)
+        )
+        if image_ids:
+            transaction.on_commit(
+                lambda: generate_thumbnails_batch_task.delay(image_ids)
+            )
+
+    @staticmethod
+    def _invalidate(updated_ids: list[int], category_ids: set[int]) -> None:
+        ProductCardCache.invalidate_many(updated_ids)
+        ResponseCache.invalidate(
+            "catalog",
+            *map(ResponseCache.category_tag, category_ids),
+            *map(ResponseCache.product_tag, updated_ids),
+        )
+        DashboardCache.invalidate()
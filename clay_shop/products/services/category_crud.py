@@ -1,12 +1,15 @@
-from django.db.models import QuerySet
-
+from core.reference_cache import reference_cache
 from products.models import Category
 
 
 class CategoryGet:
+    CATEGORIES_CACHE = "categories"
+
     @staticmethod
-    def get_all_categories() -> QuerySet:
-        return Category.objects.all()
+    def get_all_categories() -> list[Category]:
+        return reference_cache.get(
+            CategoryGet.CATEGORIES_CACHE, lambda: list(Category.objects.all())
+        )
 
     @staticmethod
     def get_category_by_slug(slug: str) -> Category | None:
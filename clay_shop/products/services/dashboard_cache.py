@@ -0,0 +1,21 @@
+from typing import Any
+
+from django.core.cache import cache
+from django.db import transaction
+
+
+class DashboardCache:
+    CACHE_KEY = "seller_dashboard"
+    CACHE_TIMEOUT = 60
+
+    @staticmethod
+    def get() -> dict[str, Any] | None:
+        return cache.get(DashboardCache.CACHE_KEY)
+
+    @staticmethod
+    def set(dashboard: dict[str, Any]) -> None:
+        cache.set(DashboardCache.CACHE_KEY, dashboard, DashboardCache.CACHE_TIMEOUT)
+
+    @staticmethod
+    def invalidate() -> None:
+        transaction.on_commit(lambda: cache.delete(DashboardCache.CACHE_KEY))
@@ -1,21 +1,64 @@
 from typing import Any, Dict, List
 
+from django.core.exceptions import ValidationError
 from django.db import transaction
-from django.db.models import Avg, Count, Q, QuerySet
+from django.db.models import (
+    Case,
+    F,
+    QuerySet,
+    Value,
+    When,
+    prefetch_related_objects,
+)
+from django.db.models.functions import Greatest
+from django.utils import timezone
 
+from core.db_router import replica_read
+from core.response_cache import ResponseCache
 from products.models import Product, ProductIMG
+from products.services.card_cache import ProductCardCache
+from products.services.dashboard_cache import DashboardCache
+from products.services.search_service import ProductSearchService
 
 
 class ProductsService:
+    SELLER_SORT_FIELDS = ("created_at", "name", "base_price", "stock_quantity")
+    DEFAULT_SELLER_SORT = "-created_at"
+    BULK_STOCK_ACTIONS = ("add", "set", "subtract")
+
+    @staticmethod
+    def normalize_seller_sort(sort_by: str | None) -> str:
+        if sort_by and sort_by.lstrip("-") in ProductsService.SELLER_SORT_FIELDS:
+            return sort_by
+        return ProductsService.DEFAULT_SELLER_SORT
+
     @staticmethod
+    @replica_read
     def get_active_products() -> QuerySet:
         return Product.objects.filter(is_active=True).select_related("category_id")
 
     @staticmethod
+    @replica_read
+    def get_listing_products() -> QuerySet:
+        # Проекция для карточек: узкий набор колонок и только главное фото
+        return (
+            Product.objects.filter(is_active=True)
+            .only(*ProductCardCache.CARD_FIELDS)
+            .prefetch_related(ProductCardCache.main_image_prefetch())
+        )
+
+    @staticmethod
+    def attach_main_images(products: list[Product]) -> list[Product]:
+        prefetch_related_objects(products, ProductCardCache.main_image_prefetch())
+        return products
+
+    @staticmethod
+    @replica_read
     def get_all_products() -> QuerySet:
         return Product.objects.select_related("category_id").prefetch_related("images")
 
     @staticmethod
+    @replica_read
     def get_product_by_id(product_id: int) -> Product | None:
         try:
             return (
@@ -28,6 +71,7 @@ class ProductsService:
 
     @staticmethod
     def get_product_by_id_for_seller(product_id: int) -> Product | None:
+        # Форма редактирования сохраняет этот объект и его фото, читаем из основной БД
         try:
             return (
                 Product.objects.select_related("category_id")
@@ -38,18 +82,15 @@ class ProductsService:
             return None
 
     @staticmethod
+    @replica_read
     def get_products_by_category(category_id: int) -> QuerySet:
-        return (
-            Product.objects.filter(category_id=category_id, is_active=True)
-            .select_related("category_id")
-            .prefetch_related("images")
-        )
+        return ProductsService.get_listing_products().filter(category_id=category_id)
 
     @staticmethod
     def search_products(query: str) -> QuerySet:
-        return Product.objects.filter(
-            Q(name__icontains=query) | Q(desription__icointains=query), is_active=True
-        ).select_related("category_id")
+        return ProductSearchService.filter_queryset(
+            ProductsService.get_listing_products(), query
+        )
 
     @staticmethod
     def filter_products_for_seller(
@@ -67,10 +108,8 @@ class ProductsService:
             queryset = queryset.filter(stock_quantity=0)
 
         if search:
-            queryset = queryset.filter(
-                Q(name__icontains=search) | Q(description_icontains=search)
-            )
-        queryset = queryset.order_by(sort_by)
+            queryset = ProductSearchService.filter_queryset(queryset, search)
+        queryset = queryset.order_by(ProductsService.normalize_seller_sort(sort_by))
 
         return queryset
 
@@ -94,6 +133,7 @@ class ProductsService:
             for key, value in product_data.items():
                 setattr(product, key, value)
             product.save()
+            ProductCardCache.invalidate(product.id)
             return product
         except Product.DoesNotExist:
             return None
@@ -105,28 +145,107 @@ class ProductsService:
             product = Product.objects.get(id=product_id)
             product.is_active = not product.is_active
             product.save()
+            ProductCardCache.invalidate(product.id)
             return product.is_active
         except Product.DoesNotExist:
             return None
 
     @staticmethod
     @transaction.atomic
-    def update_stock(product_id: int, action: str, quantity: int) -> int | None:
-        try:
-            product = Product.objects.select_for_update().get(id=product_id)
+    def set_products_active(product_ids: list[int], is_active: bool) -> int:
+        """Активирует или снимает с продажи товары одним UPDATE по списку id."""
+        rows = list(
+            Product.objects.select_for_update()
+            .filter(id__in=product_ids)
+            .exclude(is_active=is_active)
+            .order_by("id")
+            .values_list("id", "category_id")
+        )
+        if not rows:
+            return 0
 
-            if action == "add":
-                product.stock_quantity += quantity
-            elif action == "set":
-                product.stock_quantity = quantity
-            elif action == "substract":
-                product.stock_quantity = max(0, product.stock_quantity - quantity)
+        changed_ids = [product_id for product_id, _ in rows]
+        Product.objects.filter(id__in=changed_ids).update(
+            is_active=is_active, updated_at=timezone.now()
+        )
 
-            product.save()
-            return product.stock_quantity
-        except Product.DoesNotExist:
+        # update() обходит сигналы модели, страницы каталога сбрасываем сами
+        ProductCardCache.invalidate_many(changed_ids)
+        ResponseCache.invalidate(
+            "catalog",
+            *{ResponseCache.category_tag(category_id) for _, category_id in rows},
+            *map(ResponseCache.product_tag, changed_ids),
+        )
+        DashboardCache.invalidate()
+        return len(changed_ids)
+
+    @staticmethod
+    def _invalidate_stock(product_ids) -> None:
+        # Остаток меняется через update(), сигналы модели не срабатывают
+        ProductCardCache.invalidate_many(product_ids)
+        ResponseCache.invalidate(*map(ResponseCache.product_tag, product_ids))
+        DashboardCache.invalidate()
+
+    @staticmethod
+    def _stock_expression(action: str, quantity: int):
+        if action == "add":
+            return F("stock_quantity") + quantity
+        if action == "set":
+            return Value(quantity)
+        if action in ("subtract", "substract"):
+            return Greatest(F("stock_quantity") - quantity, 0)
+        return F("stock_quantity")
+
+    @staticmethod
+    @transaction.atomic
+    def update_stock(product_id: int, action: str, quantity: int) -> int | None:
+        # Одиночный UPDATE держит блокировку строки только до конца транзакции
+        updated = Product.objects.filter(id=product_id).update(
+            stock_quantity=ProductsService._stock_expression(action, quantity),
+            updated_at=timezone.now(),
+        )
+        if not updated:
             return None
 
+        ProductsService._invalidate_stock([product_id])
+        return (
+            Product.objects.filter(id=product_id)
+            .values_list("stock_quantity", flat=True)
+            .get()
+        )
+
+    @staticmethod
+    @transaction.atomic
+    def bulk_update_stock(action: str, items: dict[int, int]) -> dict[int, int]:
+        """Меняет остатки нескольких товаров одним UPDATE с CASE по id."""
+        if action not in ProductsService.BULK_STOCK_ACTIONS:
+            raise ValidationError("Действие должно быть add, set или subtract")
+        if not items:
+            return {}
+        if any(quantity < 0 for quantity in items.values()):
+            raise ValidationError("Количество товара не может быть отрицательным")
+
+        updated = Product.objects.filter(id__in=items).update(
+            stock_quantity=Case(
+                *(
+                    When(
+                        id=product_id,
+                        then=ProductsService._stock_expression(action, quantity),
+                    )
+                    for product_id, quantity in items.items()
+                ),
+                default=F("stock_quantity"),
+            ),
+            updated_at=timezone.now(),
+        )
+        if not updated:
+            return {}
+
+        ProductsService._invalidate_stock(items)
+        return dict(
+            Product.objects.filter(id__in=items).values_list("id", "stock_quantity")
+        )
+
     @staticmethod
     def check_availability(product_id: int, quantity: int = 1) -> bool:
         try:
@@ -138,43 +257,81 @@ class ProductsService:
             return None
 
     @staticmethod
-    @transaction.atomic
     def decrease_stock(product_id: int, quantity: int = 1) -> bool:
-        try:
-            product = Product.objects.select_for_update().get(id=product_id)
-            if product.stock_quantity >= quantity:
-                product.stock_quantity -= quantity
-                product.save()
-                return True
-            return False
-        except Product.DoesNotExist:
-            return False
+        updated = Product.objects.filter(
+            id=product_id, stock_quantity__gte=quantity
+        ).update(
+            stock_quantity=F("stock_quantity") - quantity, updated_at=timezone.now()
+        )
+        if updated:
+            ProductsService._invalidate_stock([product_id])
+        return bool(updated)
 
     @staticmethod
+    @transaction.atomic
+    def reserve_stock(items: dict[int, int]) -> None:
+        if not items:
+            return
+        if any(quantity <= 0 for quantity in items.values()):
+            raise ValidationError("Количество товара должно быть больше нуля")
+
+        # Блокируем строки в порядке id, чтобы параллельные резервы не ловили deadlock
+        stock = dict(
+            Product.objects.select_for_update()
+            .filter(id__in=items, is_active=True)
+            .order_by("id")
+            .values_list("id", "stock_quantity")
+        )
+
+        for product_id in sorted(items):
+            if stock.get(product_id, 0) < items[product_id]:
+                raise ValidationError(
+                    "Недостаточно товара на складе",
+                    code="insufficient_stock",
+                    params={"product_id": product_id},
+                )
+
+        Product.objects.filter(id__in=items).update(
+            stock_quantity=Case(
+                *(
+                    When(id=product_id, then=F("stock_quantity") - quantity)
+                    for product_id, quantity in items.items()
+                ),
+                default=F("stock_quantity"),
+            ),
+            updated_at=timezone.now(),
+        )
+        ProductsService._invalidate_stock(items)
+
+    @staticmethod
+    @replica_read
     def get_product_with_reviews(product_id: int) -> dict[str, Any] | None:
         try:
-            product = Product.objects.annotate(
-                avg_rating=Avg("review__rating"), review_count=Count("review")
-            ).get(id=product_id, is_active=True)
+            product = Product.objects.get(id=product_id, is_active=True)
 
             return {
                 "product": product,
-                "avg_rating": product.avg_rating or 0,
-                "review_count": product.review_count,
+                "avg_rating": product.avg_rating,
+                "review_count": product.rating_count,
             }
         except Product.DoesNotExist:
             return None
 
     @staticmethod
+    @replica_read
     def get_low_stock_products(threshold: int = 5) -> QuerySet:
         return Product.objects.filter(
             stock_quantity__lte=threshold, stock_quantity__gt=0
         ).order_by("stock_quantity")
 
     @staticmethod
+    @replica_read
     def get_out_of_stock_count() -> int:
         return Product.objects.filter(stock_quantity=0).count()
 
     @staticmethod
+    @replica_read
     def get_popular_products(limit: int = 5) -> QuerySet:
-        return Product.objects.annotate(review_count=Count('review')).order_by('-review_count')[:limit]
+        return Product.objects.annotate(review_count=F("rating_count")).order_by(
+            "-rating_count"
+        )[:limit]
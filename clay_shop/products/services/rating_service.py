@@ -0,0 +1,87 @@
+from django.db.models import Count, F, FloatField, OuterRef, Subquery, Sum
+from django.db.models.functions import Cast, Coalesce, NullIf
+
+from products.models import Product, Review
+
+
+class RatingService:
+    RATINGS = range(1, 6)
+
+    @staticmethod
+    def _average(rating_sum, rating_count) -> Coalesce:
+        return Coalesce(
+            Cast(rating_sum, FloatField()) / NullIf(rating_count, 0),
+            0.0,
+            output_field=FloatField(),
+        )
+
+    @staticmethod
+    def apply_review(product_id: int, rating: int, delta: int = 1) -> int:
+        # Один UPDATE: F() ссылаются на значения строки до изменения
+        new_sum = F("rating_sum") + rating * delta
+        new_count = F("rating_count") + delta
+        histogram_field = f"rating_{rating}_count"
+
+        return Product.objects.filter(id=product_id).update(
+            rating_sum=new_sum,
+            rating_count=new_count,
+            avg_rating=RatingService._average(new_sum, new_count),
+            **{histogram_field: F(histogram_field) + delta},
+        )
+
+    @staticmethod
+    def _review_subquery(aggregate, **filters) -> Coalesce:
+        reviews = (
+            Review.objects.filter(product_id=OuterRef("pk"), **filters)
+            .order_by()
+            .values("product_id")
+            .annotate(value=aggregate)
+            .values("value")
+        )
+        return Coalesce(Subquery(reviews), 0)
+
+    @staticmethod
+    def reconcile(product_ids: list[int] | None = None) -> int:
+        queryset = Product.objects.all()
+        if product_ids:
+            queryset = queryset.filter(id__in=product_ids)
+
+        rating_sum = RatingService._review_subquery(Sum("rating"))
+        rating_count = RatingService._review_subquery(Count("id"))
+        histogram = {
+            f"rating_{rating}_count": RatingService._review_subquery(
+                Count("id"), rating=rating
+            )
+            for rating in RatingService.RATINGS
+        }
+
+        return queryset.update(
+            rating_sum=rating_sum,
+            rating_count=rating_count,
+            avg_rating=RatingService._average(rating_sum, rating_count),
+            **histogram,
+        )
+
+    @staticmethod
+    def get_rating_distribution() -> dict[int, int]:
+        totals = Product.objects.aggregate(
+            **{
+                f"rating_{rating}": Coalesce(Sum(f"rating_{rating}_count"), 0)
+                for rating in RatingService.RATINGS
+            }
+        )
+        return {
+            rating: totals[f"rating_{rating}"]
+            for rating in RatingService.RATINGS
+            if totals[f"rating_{rating}"]
+        }
+
+    @staticmethod
+    def get_average_rating() -> float:
+        totals = Product.objects.aggregate(
+            rating_sum=Coalesce(Sum("rating_sum"), 0),
+            rating_count=Coalesce(Sum("rating_count"), 0),
+        )
+        if not totals["rating_count"]:
+            return 0
+        return totals["rating_sum"] / totals["rating_count"]
@@ -2,13 +2,19 @@ from typing import Dict
 
 from django.core.exceptions import ValidationError
 from django.db import transaction
-from django.db.models import QuerySet, Avg, Count
+from django.db.models import QuerySet
+from django.utils import timezone
 
+from core.db_router import replica_read
+from core.response_cache import ResponseCache
 from products.models import Review
+from products.services.dashboard_cache import DashboardCache
+from products.services.rating_service import RatingService
 
 
 class ReviewService:
     @staticmethod
+    @replica_read
     def get_product_reviews(product_id: int, verified_only: bool = False) -> QuerySet:
         filters = {"product_id": product_id}
         if verified_only:
@@ -17,10 +23,11 @@ class ReviewService:
         return (
             Review.objects.filter(**filters)
             .select_related("user_id")
-            .order_by("-create_at")
+            .order_by("-created_at")
         )
 
     @staticmethod
+    @replica_read
     def get_all_reviews(
         verified_only: bool | None = None, rating_filter: int | None = None
     ) -> QuerySet:
@@ -39,33 +46,31 @@ class ReviewService:
         return queryset
 
     @staticmethod
+    @replica_read
     def get_pending_reviews_count() -> int:
         return Review.objects.filter(is_verified=False).count()
 
     @staticmethod
+    @replica_read
     def get_total_reviews_count() -> int:
         return Review.objects.count()
 
     @staticmethod
+    @replica_read
     def get_average_rating() -> float:
-        result = Review.objects.aggregate(Avg("rating"))
-        return result["rating__avg"] or 0
+        return RatingService.get_average_rating()
 
     @staticmethod
+    @replica_read
     def get_recent_reviews(limit: int = 5) -> QuerySet:
         return Review.objects.select_related("product_id", "user_id").order_by(
-            "-create_at"
+            "-created_at"
         )[:limit]
 
     @staticmethod
+    @replica_read
     def get_rating_distribution() -> Dict[int, int]:
-        rating_stats = (
-            Review.objects.values("rating")
-            .annotate(count=Count("rating"))
-            .order_by("rating")
-        )
-
-        return {item["rating"]: item["count"] for item in rating_stats}
+        return RatingService.get_rating_distribution()
 
     @staticmethod
     @transaction.atomic
@@ -79,28 +84,41 @@ class ReviewService:
             raise ValidationError("Вы уже оставили отзыв на этот продукт")
 
         review = Review.objects.create(
-            product_id=product_id,
-            user_id=user_id,
+            product_id_id=product_id,
+            user_id_id=user_id,
             rating=rating,
             comment=comment,
             is_verified=False,
         )
+        RatingService.apply_review(product_id, rating)
         return review
 
     @staticmethod
     def verify_review(review_id: int) -> bool:
-        try:
-            review = Review.objects.get(id=review_id)
-            review.is_verified = True
-            review.save()
+        if ReviewService.verify_reviews([review_id]):
             return True
-        except Review.DoesNotExist:
-            return False
+        return Review.objects.filter(id=review_id).exists()
+
+    @staticmethod
+    @transaction.atomic
+    def verify_reviews(review_ids: list[int]) -> int:
+        """Верифицирует пачку отзывов одним UPDATE, кэши сбрасываются один раз."""
+        pending = Review.objects.filter(id__in=review_ids, is_verified=False)
+        product_ids = set(pending.values_list("product_id", flat=True))
+        if not product_ids:
+            return 0
+
+        # Агрегаты рейтинга учитывают все отзывы, верификация их не меняет
+        verified = pending.update(is_verified=True, updated_at=timezone.now())
+        DashboardCache.invalidate()
+        ResponseCache.invalidate(*map(ResponseCache.product_tag, product_ids))
+        return verified
 
     @staticmethod
+    @replica_read
     def get_user_reviews(user_id: int) -> QuerySet:
         return (
             Review.objects.filter(user_id=user_id)
             .select_related("product_id")
-            .order_by("-create_at")
+            .order_by("-created_at")
         )
@@ -0,0 +1,81 @@
+from datetime import date, datetime, time, timedelta
+
+from django.db import transaction
+from django.db.models import Count
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from products.models import Product, ProductDailyStat, Review, ReviewDailyStat
+
+
+class RollupService:
+    # Сколько последних дней пересчитывается при каждом запуске задачи
+    LOOKBACK_DAYS = 3
+
+    @staticmethod
+    def day_start(day: date) -> datetime:
+        return timezone.make_aware(datetime.combine(day, time.min))
+
+    @staticmethod
+    def _created_between(queryset, date_from: date, date_to: date):
+        return queryset.filter(
+            created_at__gte=RollupService.day_start(date_from),
+            created_at__lt=RollupService.day_start(date_to + timedelta(days=1)),
+        )
+
+    @staticmethod
+    @transaction.atomic
+    def rollup_reviews(date_from: date, date_to: date) -> int:
+        rows = (
+            RollupService._created_between(Review.objects.all(), date_from, date_to)
+            .annotate(day=TruncDate("created_at"))
+            .values("day", "product_id", "rating")
+            .annotate(reviews_count=Count("id"))
+            .order_by()
+        )
+        stats = [
+            ReviewDailyStat(
+                date=row["day"],
+                product_id_id=row["product_id"],
+                rating=row["rating"],
+                reviews_count=row["reviews_count"],
+            )
+            for row in rows
+        ]
+
+        ReviewDailyStat.objects.filter(date__range=(date_from, date_to)).delete()
+        ReviewDailyStat.objects.bulk_create(stats, batch_size=1000)
+        return len(stats)
+
+    @staticmethod
+    @transaction.atomic
+    def rollup_products(date_from: date, date_to: date) -> int:
+        rows = (
+            RollupService._created_between(Product.objects.all(), date_from, date_to)
+            .annotate(day=TruncDate("created_at"))
+            .values("day", "category_id")
+            .annotate(products_count=Count("id"))
+            .order_by()
+        )
+        stats = [
+            ProductDailyStat(
+                date=row["day"],
+                category_id_id=row["category_id"],
+                products_count=row["products_count"],
+            )
+            for row in rows
+        ]
+
+        ProductDailyStat.objects.filter(date__range=(date_from, date_to)).delete()
+        ProductDailyStat.objects.bulk_create(stats, batch_size=1000)
+        return len(stats)
+
+    @staticmethod
+    def rollup_recent(days: int | None = None) -> dict[str, int]:
+        date_to = timezone.localdate()
+        date_from = date_to - timedelta(days=days or RollupService.LOOKBACK_DAYS)
+
+        return {
+            "reviews": RollupService.rollup_reviews(date_from, date_to),
+            "products": RollupService.rollup_products(date_from, date_to),
+        }
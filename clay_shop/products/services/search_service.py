@@ -0,0 +1,61 @@
+import re
+
+from django.contrib.postgres.search import (
+    SearchQuery,
+    SearchRank,
+    TrigramSimilarity,
+)
+from django.db.models import F, Q, QuerySet
+
+from products.models import Product
+
+
+class ProductSearchService:
+    SEARCH_CONFIGS = ("russian", "simple")
+    TRIGRAM_WEIGHT = 0.5
+    WORD_RE = re.compile(r"\w+", re.UNICODE)
+
+    @staticmethod
+    def build_query(query: str) -> SearchQuery | None:
+        words = ProductSearchService.WORD_RE.findall(query.lower())
+        if not words:
+            return None
+
+        # Префиксный поиск, чтобы выдача была осмысленной по мере набора
+        raw_query = " & ".join(f"{word}:*" for word in words)
+
+        search_query = None
+        for config in ProductSearchService.SEARCH_CONFIGS:
+            config_query = SearchQuery(raw_query, config=config, search_type="raw")
+            search_query = (
+                config_query if search_query is None else search_query | config_query
+            )
+        return search_query
+
+    @staticmethod
+    def filter_queryset(queryset: QuerySet, query: str) -> QuerySet:
+        query = query.strip()
+        search_query = ProductSearchService.build_query(query)
+        if search_query is None:
+            return queryset.none()
+
+        return (
+            queryset.filter(
+                Q(search_vector=search_query) | Q(name__trigram_similar=query)
+            )
+            .annotate(
+                rank=SearchRank(F("search_vector"), search_query)
+                + ProductSearchService.TRIGRAM_WEIGHT * TrigramSimilarity("name", query)
+            )
+            .order_by("-rank", "id")
+        )
+
+    @staticmethod
+    def search(query: str) -> QuerySet:
+        queryset = Product.objects.filter(is_active=True).select_related("category_id")
+        return ProductSearchService.filter_queryset(queryset, query)
+
+    @staticmethod
+    def rebuild_index() -> int:
+        # Сброс поля заставляет триггер пересчитать вектор для каждой строки
+        return Product.objects.update(search_vector=None)
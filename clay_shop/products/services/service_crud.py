@@ -3,13 +3,19 @@ from typing import Any
 from django.db import transaction
 from django.db.models import QuerySet
 
+from core.reference_cache import reference_cache
 from products.models import Service
 
 
 class ServiceCrud:
+    ACTIVE_SERVICES_CACHE = "active_services"
+
     @staticmethod
-    def get_active_services() -> QuerySet:
-        return Service.objects.filter(is_active=True)
+    def get_active_services() -> list[Service]:
+        return reference_cache.get(
+            ServiceCrud.ACTIVE_SERVICES_CACHE,
+            lambda: list(Service.objects.filter(is_active=True).order_by("name")),
+        )
 
     @staticmethod
     def get_all_services() -> QuerySet:
@@ -0,0 +1,156 @@
+import ipaddress
+import logging
+import socket
+from io import BytesIO
+
+import httpx
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.db.models import F, Q
+from PIL import Image
+
+from products.image_specs import THUMBNAIL_FORMATS, THUMBNAIL_SIZES
+from products.models import ProductIMG
+from products.services.card_cache import ProductCardCache
+
+logger = logging.getLogger(__name__)
+
+
+class ThumbnailService:
+    FETCH_TIMEOUT = 15.0
+    MAX_REDIRECTS = 5
+    MAX_SOURCE_BYTES = 20 * 1024 * 1024
+    SOURCE_EXTENSIONS = {"JPEG": "jpg", "PNG": "png", "WEBP": "webp", "GIF": "gif"}
+
+    @staticmethod
+    def needs_processing(image: ProductIMG) -> bool:
+        return not (
+            image.source
+            and image.source_url == image.image_url
+            and image.has_thumbnails
+        )
+
+    @staticmethod
+    def is_allowed_address(
+        address: ipaddress.IPv4Address | ipaddress.IPv6Address,
+    ) -> bool:
+        if address.version == 6 and address.ipv4_mapped:
+            address = address.ipv4_mapped
+        if address.is_global:
+            return True
+        return any(
+            address in ipaddress.ip_network(network)
+            for network in settings.THUMBNAIL_ALLOWED_NETWORKS
+        )
+
+    @staticmethod
+    def resolve(url: httpx.URL) -> httpx.URL:
+        """Проверяет адрес источника и возвращает ссылку с IP вместо имени хоста."""
+        if url.scheme not in ("http", "https") or not url.host:
+            raise ValueError(f"Недопустимая ссылка на изображение: {url}")
+
+        port = url.port or (443 if url.scheme == "https" else 80)
+        try:
+            infos = socket.getaddrinfo(url.host, port, type=socket.SOCK_STREAM)
+        except socket.gaierror as e:
+            raise ValueError(f"Не удалось разрешить адрес {url.host}: {e}") from e
+
+        addresses = [ipaddress.ip_address(info[4][0]) for info in infos]
+        # Любой внутренний адрес среди ответов DNS — отказ: иначе можно
+        # достучаться до сервисов сети и метаданных облака
+        if not all(map(ThumbnailService.is_allowed_address, addresses)):
+            raise ValueError(f"Запрещенный адрес источника изображения: {url}")
+        # Соединяемся с уже проверенным IP, повторный DNS-запрос не нужен
+        return url.copy_with(host=str(addresses[0]))
+
+    @staticmethod
+    def fetch_source(url: str) -> bytes:
+        target = httpx.URL(url)
+        with httpx.Client(timeout=ThumbnailService.FETCH_TIMEOUT) as client:
+            for _ in range(ThumbnailService.MAX_REDIRECTS + 1):
+                request = client.build_request(
+                    "GET",
+                    ThumbnailService.resolve(target),
+                    headers={"Host": target.netloc.decode("ascii")},
+                    extensions={"sni_hostname": target.host},
+                )
+                response = client.send(request, stream=True)
+                try:
+                    if response.is_redirect:
+                        # Каждый редирект проверяется заново, как исходная ссылка
+                        target = target.join(response.headers["Location"])
+                        continue
+                    response.raise_for_status()
+                    content = bytearray()
+                    for chunk in response.iter_bytes():
+                        content.extend(chunk)
+                        if len(content) > ThumbnailService.MAX_SOURCE_BYTES:
+                            raise ValueError(
+                                f"Изображение больше допустимого размера: {url}"
+                            )
+                    return bytes(content)
+                finally:
+                    response.close()
+
+        raise ValueError(f"Слишком много редиректов: {url}")
+
+    @staticmethod
+    def _source_name(image: ProductIMG, content: bytes) -> str:
+        with Image.open(BytesIO(content)) as source:
+            source.verify()
+            extension = ThumbnailService.SOURCE_EXTENSIONS.get(source.format)
+        if extension is None:
+            raise ValueError(f"Неподдерживаемый формат изображения: {image.image_url}")
+        return f"{image.product_id_id}_{image.id}.{extension}"
+
+    @staticmethod
+    def generate(image: ProductIMG) -> dict[str, list[int]]:
+        sizes = {}
+        for size in THUMBNAIL_SIZES:
+            for image_format in THUMBNAIL_FORMATS:
+                thumbnail = image.thumbnail(size, image_format)
+                thumbnail.generate(force=True)
+            # Форматы режутся одинаково, размеры берем у JPEG
+            sizes[size] = [thumbnail.width, thumbnail.height]
+        return sizes
+
+    @staticmethod
+    def process(image_id: int, force: bool = False) -> bool:
+        try:
+            image = ProductIMG.objects.get(id=image_id)
+        except ProductIMG.DoesNotExist:
+            return False
+
+        if not force and not ThumbnailService.needs_processing(image):
+            return False
+
+        # Оригинал скачивается один раз, пока image_url не поменяется
+        if force or not image.source or image.source_url != image.image_url:
+            content = ThumbnailService.fetch_source(image.image_url)
+            name = ThumbnailService._source_name(image, content)
+            if image.source:
+                image.source.delete(save=False)
+            image.source.save(name, ContentFile(content), save=False)
+            image.source_url = image.image_url
+
+        image.thumbnail_sizes = ThumbnailService.generate(image)
+        image.save(
+            update_fields=["source", "source_url", "width", "height", "thumbnail_sizes"]
+        )
+        ProductCardCache.invalidate(image.product_id_id)
+        logger.info(f"Thumbnails generated for image {image.id}")
+        return True
+
+    @staticmethod
+    def pending_image_ids() -> list[int]:
+        # То же условие, что needs_processing, но посчитанное в SQL
+        return list(
+            ProductIMG.objects.filter(
+                Q(source="")
+                | Q(source__isnull=True)
+                | ~Q(source_url=F("image_url"))
+                | Q(thumbnail_sizes={})
+            )
+            .order_by("id")
+            .values_list("id", flat=True)
+        )
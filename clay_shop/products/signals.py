@@ -0,0 +1,67 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from core.reference_cache import reference_cache
+from core.response_cache import ResponseCache
+from products.models import Category, Product, ProductIMG, Review, Service
+from products.services.category_crud import CategoryGet
+from products.services.dashboard_cache import DashboardCache
+from products.services.service_crud import ServiceCrud
+from products.tasks import generate_thumbnails_task
+
+
+@receiver(post_save, sender=Product)
+@receiver(post_delete, sender=Product)
+@receiver(post_save, sender=Review)
+@receiver(post_delete, sender=Review)
+def invalidate_dashboard(sender, **kwargs):
+    DashboardCache.invalidate()
+
+
+@receiver(post_save, sender=Service)
+@receiver(post_delete, sender=Service)
+def invalidate_services(sender, **kwargs):
+    reference_cache.invalidate(ServiceCrud.ACTIVE_SERVICES_CACHE)
+
+
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+def invalidate_categories(sender, **kwargs):
+    reference_cache.invalidate(CategoryGet.CATEGORIES_CACHE)
+
+
+@receiver(post_save, sender=ProductIMG)
+def schedule_thumbnails(sender, instance, **kwargs):
+    if instance.image_url and instance.image_url != instance.source_url:
+        transaction.on_commit(lambda: generate_thumbnails_task.delay(instance.id))
+
+
+@receiver(post_save, sender=Product)
+@receiver(post_delete, sender=Product)
+def purge_product_pages(sender, instance, **kwargs):
+    ResponseCache.invalidate(
+        ResponseCache.product_tag(instance.id),
+        ResponseCache.category_tag(instance.category_id_id),
+        "catalog",
+    )
+
+
+@receiver(post_save, sender=ProductIMG)
+@receiver(post_delete, sender=ProductIMG)
+@receiver(post_save, sender=Review)
+@receiver(post_delete, sender=Review)
+def purge_product_detail(sender, instance, **kwargs):
+    ResponseCache.invalidate(ResponseCache.product_tag(instance.product_id_id))
+
+
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+def purge_category_pages(sender, instance, **kwargs):
+    ResponseCache.invalidate(ResponseCache.category_tag(instance.id), "categories")
+
+
+@receiver(post_save, sender=Service)
+@receiver(post_delete, sender=Service)
+def purge_service_pages(sender, **kwargs):
+    ResponseCache.invalidate("services")
@@ -0,0 +1,46 @@
+import logging
+
+from celery import shared_task
+
+from products.services.rollup_service import RollupService
+from products.services.thumbnail_service import ThumbnailService
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task(bind=True, max_retries=3, default_retry_delay=60)
+def rollup_daily_stats_task(self, days: int | None = None):
+    try:
+        result = RollupService.rollup_recent(days)
+        return f"Daily stats rolled up: {result}"
+
+    except Exception as exc:
+        logger.error(f"Error in rollup_daily_stats_task: {str(exc)}")
+        raise self.retry(exc=exc)
+
+
+@shared_task(bind=True, max_retries=3, default_retry_delay=60)
+def generate_thumbnails_task(self, image_id: int, force: bool = False):
+    try:
+        processed = ThumbnailService.process(image_id, force=force)
+        status = "generated" if processed else "skipped"
+        return f"Thumbnails for image {image_id}: {status}"
+
+    except Exception as exc:
+        logger.error(f"Error in generate_thumbnails_task: {str(exc)}")
+        raise self.retry(exc=exc)
+
+
+@shared_task
+def generate_thumbnails_batch_task(image_ids: list[int]):
+    processed = failed = 0
+    for image_id in image_ids:
+        # Ошибка одного фото не должна останавливать пачку, оно останется в
+        # ThumbnailService.pending_image_ids для повторной обработки
+        try:
+            processed += ThumbnailService.process(image_id)
+        except Exception as exc:
+            failed += 1
+            logger.error(f"Error in generate_thumbnails_batch_task: {str(exc)}")
+
+    return f"Thumbnails generated for {processed} images, failed: {failed}"
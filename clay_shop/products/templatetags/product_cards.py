@@ -0,0 +1,11 @@
+from django import template
+from django.utils.safestring import mark_safe
+
+from products.services.card_cache import ProductCardCache
+
+register = template.Library()
+
+
+@register.simple_tag
+def render_product_cards(products):
+    return mark_safe("".join(ProductCardCache.render_cards(products)))
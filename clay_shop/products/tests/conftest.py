@@ -0,0 +1,114 @@
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from io import BytesIO
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+
+from PIL import Image
+
+User = get_user_model()
+
+
+@pytest.fixture
+def sample_product(create_product):
+    return create_product()
+
+
+@pytest.fixture
+def create_profile(db):
+    def _create_profile(index: int = 0):
+        user = User.objects.create_user(
+            username=f"buyer{index}",
+            email=f"buyer{index}@example.com",
+            first_name=f"Buyer{index}",
+            last_name="Test",
+            password="TestPassword123!",
+        )
+        return user.profile
+
+    return _create_profile
+
+
+@pytest.fixture
+def locmem_cache(settings):
+    settings.CACHES = {
+        "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}
+    }
+    cache.clear()
+    yield cache
+    cache.clear()
+
+
+class ImageHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        self.server.requests.append(self.path)
+        if self.path in self.server.redirects:
+            self.send_response(302)
+            self.send_header("Location", self.server.redirects[self.path])
+            self.end_headers()
+            return
+
+        width, height = self.server.size
+        buffer = BytesIO()
+        Image.new("RGB", (width, height), "orange").save(buffer, "PNG")
+        content = buffer.getvalue()
+
+        self.send_response(200)
+        self.send_header("Content-Type", "image/png")
+        self.send_header("Content-Length", str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def image_server(settings, tmp_path):
+    settings.MEDIA_ROOT = str(tmp_path)
+    # Тестовый сервер слушает loopback, который ThumbnailService по умолчанию
+    # запрещает
+    settings.THUMBNAIL_ALLOWED_NETWORKS = ["127.0.0.1/32"]
+    server = ThreadingHTTPServer(("127.0.0.1", 0), ImageHandler)
+    server.requests = []
+    server.redirects = {}
+    server.size = (2000, 1000)
+    host, port = server.server_address
+    server.base_url = f"http://{host}:{port}"
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def catalog_templates(settings):
+    # Шаблоны сайта тянут всю навигацию, для кэша важен только факт рендера
+    settings.TEMPLATES = [
+        {
+            "BACKEND": "django.template.backends.django.DjangoTemplates",
+            "OPTIONS": {
+                "loaders": [
+                    (
+                        "django.template.loaders.locmem.Loader",
+                        {
+                            "product_detail.html": (
+                                "{{ product.name }} {{ is_available }}"
+                            ),
+                            "category_detail.html": (
+                                "{% for product in products %}{{ product.name }} "
+                                "{% endfor %}"
+                            ),
+                            "services.html": (
+                                "{% for service in services %}{{ service.name }} "
+                                "{% endfor %}"
+                            ),
+                        },
+                    )
+                ]
+            },
+        }
+    ]
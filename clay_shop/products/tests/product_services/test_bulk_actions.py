@@ -0,0 +1,89 @@
+import pytest
+from django.core.exceptions import ValidationError
+
+from core.response_cache import ResponseCache
+from products.models import Product, Review
+from products.services.card_cache import ProductCardCache
+from products.services.products_crud import ProductsService
+from products.services.review_crud import ReviewService
+
+
+@pytest.mark.django_db
+class TestBulkProductActions:
+    def test_set_products_active(self, create_product, django_assert_num_queries):
+        products = [create_product(name=f"Кружка {i}") for i in range(3)]
+        products[0].is_active = False
+        products[0].save()
+        ids = [product.id for product in products]
+
+        # SELECT ... FOR UPDATE и один UPDATE на всю пачку, плюс SAVEPOINT/RELEASE
+        with django_assert_num_queries(4):
+            assert ProductsService.set_products_active(ids, False) == 2
+
+        assert not Product.objects.filter(id__in=ids, is_active=True).exists()
+        assert ProductsService.set_products_active(ids, False) == 0
+        assert ProductsService.set_products_active(ids + [99999999], True) == 3
+
+    def test_set_active_purges_caches_once(
+        self, create_product, locmem_cache, django_capture_on_commit_callbacks
+    ):
+        products = [create_product(name=f"Кружка {i}") for i in range(3)]
+        ids = [product.id for product in products]
+        card_versions = ProductCardCache.get_versions(ids)
+        tags = ["catalog", ResponseCache.product_tag(ids[0])]
+        tag_versions = ResponseCache.get_tag_versions(tags)
+
+        with django_capture_on_commit_callbacks(execute=True) as callbacks:
+            ProductsService.set_products_active(ids, False)
+
+        # Карточки, теги страниц и дашборд: по одному колбэку на весь список
+        assert len(callbacks) == 3
+        assert ProductCardCache.get_versions(ids) != card_versions
+        new_versions = ResponseCache.get_tag_versions(tags)
+        assert all(new_versions[tag] != tag_versions[tag] for tag in tags)
+
+    def test_bulk_update_stock(self, create_product, django_assert_num_queries):
+        first = create_product(stock_quantity=10)
+        second = create_product(stock_quantity=3)
+
+        with django_assert_num_queries(4):
+            stock = ProductsService.bulk_update_stock(
+                "subtract", {first.id: 4, second.id: 5}
+            )
+
+        assert stock == {first.id: 6, second.id: 0}
+        assert ProductsService.bulk_update_stock("set", {first.id: 7}) == {first.id: 7}
+        assert ProductsService.bulk_update_stock("add", {99999999: 1}) == {}
+
+    def test_bulk_update_stock_rejects_negative(self, sample_product):
+        with pytest.raises(ValidationError):
+            ProductsService.bulk_update_stock("set", {sample_product.id: -1})
+
+    def test_bulk_update_stock_rejects_unknown_action(self, sample_product):
+        with pytest.raises(ValidationError):
+            ProductsService.bulk_update_stock(None, {sample_product.id: 1})
+
+        product = Product.objects.get(id=sample_product.id)
+        assert product.updated_at == sample_product.updated_at
+
+
+@pytest.mark.django_db
+class TestBulkReviewVerify:
+    def test_verify_reviews(
+        self, create_product, create_profile, django_assert_num_queries
+    ):
+        products = [create_product(name=f"Кружка {i}") for i in range(2)]
+        reviews = [
+            ReviewService.create_review(product.id, create_profile(i).pk, 5, "Ок")
+            for i, product in enumerate(products * 3)
+        ]
+        ids = [review.id for review in reviews]
+        ReviewService.verify_review(ids[0])
+
+        with django_assert_num_queries(4):
+            assert ReviewService.verify_reviews(ids) == 5
+
+        assert not Review.objects.filter(is_verified=False).exists()
+        assert ReviewService.verify_reviews(ids) == 0
+        products[0].refresh_from_db()
+        assert products[0].rating_count == 3
@@ -0,0 +1,71 @@
+import pytest
+
+from products.models import ProductIMG
+from products.services.card_cache import ProductCardCache
+from products.services.products_crud import ProductsService
+
+
+@pytest.mark.django_db
+@pytest.mark.usefixtures("locmem_cache")
+class TestProductCardCache:
+    def test_render_cards_keeps_order(self, create_product):
+        products = [create_product(name=f"Кружка {index}") for index in range(3)]
+
+        cards = ProductCardCache.render_cards(products)
+
+        assert len(cards) == 3
+        for product, card in zip(products, cards):
+            assert product.name in card
+
+    def test_cached_cards_skip_database(
+        self, create_product, django_assert_num_queries
+    ):
+        products = [create_product(name=f"Ваза {index}") for index in range(3)]
+        ProductIMG.objects.create(product_id=products[0], image_url="https://img/1.jpg")
+
+        with django_assert_num_queries(1):
+            first = ProductCardCache.render_cards(products)
+
+        with django_assert_num_queries(0):
+            second = ProductCardCache.render_cards(products)
+
+        assert first == second
+        assert "https://img/1.jpg" in first[0]
+
+    def test_update_product_bumps_version(
+        self, sample_product, django_capture_on_commit_callbacks
+    ):
+        ProductCardCache.render_cards([sample_product])
+
+        with django_capture_on_commit_callbacks(execute=True):
+            product = ProductsService.update_product(
+                sample_product.id, {"name": "Пиала"}
+            )
+
+        assert "Пиала" in ProductCardCache.render_cards([product])[0]
+
+    def test_update_stock_bumps_version(
+        self, sample_product, django_capture_on_commit_callbacks
+    ):
+        ProductCardCache.render_cards([sample_product])
+
+        with django_capture_on_commit_callbacks(execute=True):
+            ProductsService.update_stock(sample_product.id, "set", 0)
+
+        sample_product.refresh_from_db()
+        assert "Нет в наличии" in ProductCardCache.render_cards([sample_product])[0]
+
+    def test_version_not_bumped_before_commit(
+        self, sample_product, django_capture_on_commit_callbacks
+    ):
+        version = ProductCardCache.get_versions([sample_product.id])
+
+        with django_capture_on_commit_callbacks(execute=False) as callbacks:
+            ProductsService.toggle_product_active(sample_product.id)
+
+        assert ProductCardCache.get_versions([sample_product.id]) == version
+
+        for callback in callbacks:
+            callback()
+
+        assert ProductCardCache.get_versions([sample_product.id]) != version
@@ -0,0 +1,155 @@
+import io
+import json
+from unittest.mock import patch
+
+import pytest
+from django.core.management import call_command
+
+from products.models import Category, Product, ProductIMG
+from products.services.catalog_import import CatalogImportService
+
+HEADER = "sku,name,base_price,discount_price,stock_quantity,category,images\n"
+IMAGES = "https://cdn.test/a.jpg|https://cdn.test/b.jpg"
+
+
+def feed(*lines: str) -> io.BytesIO:
+    return io.BytesIO((HEADER + "".join(f"{line}\n" for line in lines)).encode())
+
+
+def import_csv(*lines: str, **kwargs) -> dict:
+    return CatalogImportService.import_file(feed(*lines), "csv", **kwargs)
+
+
+@pytest.mark.django_db
+class TestCatalogImport:
+    def test_creates_products_and_images(self, category):
+        stats = import_csv(
+            f"A-1,Кружка,1500,1200,5,posuda,{IMAGES}",
+            "A-2,Тарелка,900,,0,posuda,",
+        )
+
+        assert stats == {
+            "created": 2,
+            "updated": 0,
+            "unchanged": 0,
+            "skipped": 0,
+            "errors": [],
+        }
+        mug = Product.objects.get(sku="A-1")
+        assert (mug.name, mug.base_price, mug.stock_quantity) == ("Кружка", 1500, 5)
+        assert mug.category_id == category
+        assert list(mug.images.values_list("image_url", "is_main")) == [
+            ("https://cdn.test/a.jpg", True),
+            ("https://cdn.test/b.jpg", False),
+        ]
+        assert Product.objects.get(sku="A-2").discount_price == 900
+
+    def test_unchanged_feed_writes_nothing(self, category, django_assert_num_queries):
+        lines = [
+            f"A-{i},Кружка {i},1500,1200,5,posuda,https://cdn.test/{i}.jpg"
+            for i in range(5)
+        ]
+        import_csv(*lines, chunk_size=2)
+
+        # Справочник категорий и по одному SELECT на чанк
+        with django_assert_num_queries(4):
+            stats = import_csv(*lines, chunk_size=2)
+
+        assert (stats["created"], stats["updated"], stats["unchanged"]) == (0, 0, 5)
+
+    def test_updates_changed_rows(self, category):
+        import_csv(
+            f"A-1,Кружка,1500,1200,5,posuda,{IMAGES}",
+            "A-2,Тарелка,900,900,1,posuda,",
+        )
+        mug = Product.objects.get(sku="A-1")
+        Product.objects.filter(id=mug.id).update(rating_count=3)
+        other = Category.objects.create(name="Вазы", description="", slug="vazy")
+
+        stats = import_csv(
+            "A-1,Кружка XL,1700,1500,2,vazy,https://cdn.test/c.jpg",
+            "A-2,Тарелка,900,900,1,posuda,",
+        )
+
+        assert (stats["created"], stats["updated"], stats["unchanged"]) == (0, 1, 1)
+        updated = Product.objects.get(id=mug.id)
+        assert (updated.name, updated.base_price, updated.category_id) == (
+            "Кружка XL",
+            1700,
+            other,
+        )
+        assert updated.created_at == mug.created_at
+        assert updated.rating_count == 3
+        assert list(updated.images.values_list("image_url", flat=True)) == [
+            "https://cdn.test/c.jpg"
+        ]
+
+    def test_skips_invalid_rows(self, category):
+        stats = import_csv(
+            ",Без артикула,100,,1,posuda,",
+            "A-1,Кружка,дорого,,1,posuda,",
+            "A-2,Кружка,100,,1,unknown,",
+            "A-3,Кружка,100,,1,posuda,ftp://cdn.test/a.jpg",
+            "A-4,Кружка,100,,1,posuda,",
+        )
+
+        assert (stats["created"], stats["skipped"]) == (1, 4)
+        assert stats["errors"][0] == "Строка 1: не заполнено поле sku"
+        assert "unknown" in stats["errors"][2]
+        assert list(Product.objects.values_list("sku", flat=True)) == ["A-4"]
+
+    def test_last_duplicate_wins(self, category):
+        import_csv("A-1,Первая,100,,1,posuda,", "A-1,Вторая,200,,1,posuda,")
+
+        assert Product.objects.get(sku="A-1").name == "Вторая"
+
+    def test_json_array_and_lines(self, category, monkeypatch):
+        monkeypatch.setattr(CatalogImportService, "READ_SIZE", 16)
+        rows = [
+            {
+                "sku": f"J-{i}",
+                "name": "Ваза",
+                "base_price": 100,
+                "category": "posuda",
+                "is_unique": False,
+                "images": ["https://cdn.test/v.jpg"],
+            }
+            for i in range(3)
+        ]
+
+        array = io.BytesIO(json.dumps(rows, ensure_ascii=False).encode())
+        lines = io.BytesIO(
+            "\n".join(json.dumps({**row, "name": "Чаша"}) for row in rows).encode()
+        )
+
+        assert CatalogImportService.import_file(array, "json")["created"] == 3
+        assert CatalogImportService.import_file(lines, "json")["updated"] == 3
+        assert set(Product.objects.values_list("name", "is_unique")) == {
+            ("Чаша", False)
+        }
+        assert ProductIMG.objects.count() == 3
+
+    def test_truncated_json(self, category):
+        with pytest.raises(ValueError):
+            CatalogImportService.import_file(io.BytesIO(b'[{"sku": "J-1"'), "json")
+
+    def test_schedules_thumbnails(self, category, django_capture_on_commit_callbacks):
+        with patch(
+            "products.services.catalog_import.generate_thumbnails_batch_task"
+        ) as task:
+            with django_capture_on_commit_callbacks(execute=True):
+                import_csv("A-1,Кружка,100,,1,posuda,https://cdn.test/a.jpg")
+
+        image = ProductIMG.objects.get()
+        task.delay.assert_called_once_with([image.id])
+
+    def test_command(self, category, tmp_path):
+        path = tmp_path / "feed.csv"
+        path.write_bytes(feed("A-1,Кружка,100,,1,posuda,").getvalue())
+        out = io.StringIO()
+
+        call_command("import_catalog", str(path), stdout=out)
+        call_command("import_catalog", str(path), stdout=out)
+
+        assert "создано 1" in out.getvalue()
+        assert "без изменений 1" in out.getvalue()
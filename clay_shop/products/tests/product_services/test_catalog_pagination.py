@@ -0,0 +1,73 @@
+import re
+from html import unescape
+from urllib.parse import parse_qs, urlsplit
+
+import pytest
+from django.test import RequestFactory
+
+from products.views.product_views import ProductListView
+
+product_list = ProductListView.as_view(template_name="catalog.html")
+
+
+@pytest.fixture
+def pagination_templates(settings):
+    # Страница каталога целиком тянет навигацию сайта, рендерим только пагинацию
+    settings.TEMPLATES = [
+        {
+            "BACKEND": "django.template.backends.django.DjangoTemplates",
+            "OPTIONS": {
+                "loaders": [
+                    (
+                        "django.template.loaders.locmem.Loader",
+                        {
+                            "catalog.html": (
+                                "{% include 'partials/catalog_pagination.html' %}"
+                            ),
+                        },
+                    ),
+                    "django.template.loaders.app_directories.Loader",
+                ]
+            },
+        }
+    ]
+
+
+def page_links(params: dict) -> dict[str, dict]:
+    request = RequestFactory().get("/catalog/", params)
+    request.COOKIES["sessionid"] = "visitor"
+    response = product_list(request)
+    response.render()
+
+    links = re.findall(r'href="([^"]*)"[^>]*>([^<]+)</a>', response.content.decode())
+    return {
+        label: parse_qs(urlsplit(unescape(href)).query) for href, label in links
+    }
+
+
+@pytest.mark.django_db
+@pytest.mark.usefixtures("locmem_cache", "pagination_templates")
+class TestCatalogPagination:
+    def test_cursor_links_keep_filters(self, create_product):
+        for index in range(15):
+            create_product(name=f"Кружка {index:02}")
+
+        first = page_links({"category": "posuda", "page": "3"})
+        assert set(first) == {"Вперед"}
+        assert first["Вперед"]["category"] == ["posuda"]
+        assert "page" not in first["Вперед"]
+
+        cursor = first["Вперед"]["cursor"][0]
+        second = page_links({"category": "posuda", "cursor": cursor})
+        assert set(second) == {"Назад"}
+        assert second["Назад"]["category"] == ["posuda"]
+        assert second["Назад"]["cursor"] != [cursor]
+
+    def test_search_uses_page_numbers(self, create_product):
+        for index in range(15):
+            create_product(name=f"Кружка {index:02}")
+
+        links = page_links({"q": "Кружка"})
+
+        assert links["Вперед"] == {"q": ["Кружка"], "page": ["2"]}
+        assert links["2"] == {"q": ["Кружка"], "page": ["2"]}
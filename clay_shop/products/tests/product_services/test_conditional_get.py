@@ -0,0 +1,125 @@
+import time
+
+import pytest
+from django.test import RequestFactory
+from django.utils.http import http_date
+
+from products.models import Product, Review
+from products.services.products_crud import ProductsService
+from products.services.review_crud import ReviewService
+from products.views.category_views import CategoryDetailView
+from products.views.product_views import ProductDetailView
+
+product_detail = ProductDetailView.as_view(template_name="product_detail.html")
+category_detail = CategoryDetailView.as_view(template_name="category_detail.html")
+
+
+def get(view, etag=None, cookies=None, **kwargs):
+    headers = {"HTTP_IF_NONE_MATCH": etag} if etag else {}
+    request = RequestFactory().get("/page/", **headers)
+    # Сессия отключает кэш ответов, проверяем именно условный GET
+    request.COOKIES.update({"sessionid": "visitor"} if cookies is None else cookies)
+    return view(request, **kwargs)
+
+
+@pytest.mark.django_db
+@pytest.mark.usefixtures("locmem_cache", "catalog_templates")
+class TestConditionalGet:
+    def test_not_modified_with_single_query(
+        self, sample_product, django_assert_num_queries
+    ):
+        response = get(product_detail, pk=sample_product.id)
+        assert response.status_code == 200
+        assert "Last-Modified" not in response
+        assert "no-cache" in response["Cache-Control"]
+        assert "private" in response["Cache-Control"]
+
+        with django_assert_num_queries(1):
+            repeat = get(product_detail, response["ETag"], pk=sample_product.id)
+
+        assert repeat.status_code == 304
+
+    def test_stock_change_changes_etag(self, sample_product):
+        etag = get(product_detail, pk=sample_product.id)["ETag"]
+
+        ProductsService.update_stock(sample_product.id, "subtract", 1)
+
+        assert get(product_detail, etag, pk=sample_product.id).status_code == 200
+
+    def test_review_verification_changes_etag(
+        self, sample_product, create_profile
+    ):
+        review = Review.objects.create(
+            product_id=sample_product,
+            user_id=create_profile(),
+            rating=5,
+            comment="Отлично",
+            is_verified=False,
+        )
+        etag = get(product_detail, pk=sample_product.id)["ETag"]
+
+        ReviewService.verify_review(review.id)
+
+        assert get(product_detail, etag, pk=sample_product.id).status_code == 200
+
+    def test_verified_review_edit_changes_etag(self, sample_product, create_profile):
+        review = ReviewService.create_review(
+            sample_product.id, create_profile().pk, 5, "Отлично"
+        )
+        ReviewService.verify_review(review.id)
+        etag = get(product_detail, pk=sample_product.id)["ETag"]
+
+        review.refresh_from_db()
+        review.comment = "Треснула через неделю"
+        review.save()
+
+        assert get(product_detail, etag, pk=sample_product.id).status_code == 200
+
+    def test_rating_sum_changes_etag(self, sample_product):
+        etag = get(product_detail, pk=sample_product.id)["ETag"]
+
+        # Правка оценки меняет сумму при неизменном числе отзывов
+        Product.objects.filter(id=sample_product.id).update(rating_sum=3)
+
+        assert get(product_detail, etag, pk=sample_product.id).status_code == 200
+
+    def test_if_modified_since_alone_is_not_trusted(self, sample_product):
+        get(product_detail, pk=sample_product.id)
+
+        request = RequestFactory().get(
+            "/page/", HTTP_IF_MODIFIED_SINCE=http_date(time.time() + 3600)
+        )
+        request.COOKIES["sessionid"] = "visitor"
+
+        assert product_detail(request, pk=sample_product.id).status_code == 200
+
+    def test_etag_differs_per_session(self, sample_product):
+        etag = get(product_detail, pk=sample_product.id)["ETag"]
+
+        response = get(
+            product_detail, etag, cookies={"sessionid": "other"}, pk=sample_product.id
+        )
+
+        assert response.status_code == 200
+
+    def test_category_page(self, sample_product, create_product):
+        slug = sample_product.category_id.slug
+        etag = get(category_detail, slug=slug)["ETag"]
+        assert get(category_detail, etag, slug=slug).status_code == 304
+
+        create_product(name="Ваза")
+
+        assert get(category_detail, etag, slug=slug).status_code == 200
+
+    def test_cached_anonymous_response_answers_not_modified(
+        self, sample_product, django_assert_num_queries
+    ):
+        anonymous = {}
+        etag = get(product_detail, cookies=anonymous, pk=sample_product.id)["ETag"]
+
+        with django_assert_num_queries(0):
+            response = get(
+                product_detail, etag, cookies=anonymous, pk=sample_product.id
+            )
+
+        assert response.status_code == 304
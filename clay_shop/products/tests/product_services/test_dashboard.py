@@ -0,0 +1,67 @@
+import pytest
+
+from products.services.analytics_service import AnalyticsService
+from products.services.review_crud import ReviewService
+
+
+@pytest.mark.django_db
+@pytest.mark.usefixtures("locmem_cache")
+class TestDashboardStats:
+    def test_stats_values(self, create_product, create_profile):
+        product = create_product(stock_quantity=3)
+        create_product(name="Ваза", stock_quantity=0, is_active=False)
+        create_product(name="Блюдо", stock_quantity=20)
+        ReviewService.create_review(product.id, create_profile(0).pk, 5, "Отлично")
+        review = ReviewService.create_review(
+            product.id, create_profile(1).pk, 2, "Плохо"
+        )
+        ReviewService.verify_review(review.id)
+
+        stats = AnalyticsService.get_dashboard_stats()
+
+        assert stats == {
+            "total_products": 3,
+            "active_products": 2,
+            "out_of_stock": 1,
+            "low_stock": 1,
+            "total_reviews": 2,
+            "pending_reviews": 1,
+            "avg_rating": pytest.approx(3.5),
+        }
+
+    def test_stats_use_one_query_per_table(
+        self, sample_product, django_assert_num_queries
+    ):
+        with django_assert_num_queries(2):
+            AnalyticsService._compute_dashboard_stats()
+
+    def test_dashboard_is_cached(self, sample_product, django_assert_num_queries):
+        AnalyticsService.get_dashboard()
+
+        with django_assert_num_queries(0):
+            dashboard = AnalyticsService.get_dashboard()
+
+        assert dashboard["stats"]["total_products"] == 1
+
+    def test_product_write_invalidates_dashboard(
+        self, sample_product, create_product, django_capture_on_commit_callbacks
+    ):
+        AnalyticsService.get_dashboard()
+
+        with django_capture_on_commit_callbacks(execute=True):
+            create_product(name="Ваза")
+
+        assert AnalyticsService.get_dashboard_stats()["total_products"] == 2
+
+    def test_review_verify_invalidates_dashboard(
+        self, sample_product, create_profile, django_capture_on_commit_callbacks
+    ):
+        review = ReviewService.create_review(
+            sample_product.id, create_profile().pk, 4, "Хорошо"
+        )
+        assert AnalyticsService.get_dashboard_stats()["pending_reviews"] == 1
+
+        with django_capture_on_commit_callbacks(execute=True):
+            ReviewService.verify_review(review.id)
+
+        assert AnalyticsService.get_dashboard_stats()["pending_reviews"] == 0
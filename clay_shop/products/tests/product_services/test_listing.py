@@ -0,0 +1,69 @@
+import pytest
+
+from products.models import Product, ProductIMG
+from products.services.card_cache import ProductCardCache
+from products.services.products_crud import ProductsService
+
+
+@pytest.fixture
+def listed_products(create_product):
+    products = []
+    for index in range(12):
+        product = create_product(name=f"Ваза {index:02d}")
+        ProductIMG.objects.create(
+            product_id=product,
+            image_url=f"https://cdn.example.com/{index}/side.jpg",
+            is_main=False,
+            order=0,
+        )
+        ProductIMG.objects.create(
+            product_id=product,
+            image_url=f"https://cdn.example.com/{index}/main.jpg",
+            is_main=True,
+            order=1,
+        )
+        products.append(product)
+    return products
+
+
+@pytest.mark.django_db
+class TestListingProducts:
+    def test_main_images_in_constant_queries(
+        self, listed_products, django_assert_num_queries
+    ):
+        with django_assert_num_queries(2):
+            products = list(ProductsService.get_listing_products()[:12])
+            urls = [product.main_image.image_url for product in products]
+
+        assert urls == [
+            f"https://cdn.example.com/{index}/main.jpg" for index in range(12)
+        ]
+
+    def test_listing_defers_heavy_columns(self, listed_products):
+        product = ProductsService.get_listing_products().first()
+
+        assert {"search_vector", "materials"} <= product.get_deferred_fields()
+
+    def test_product_without_main_image(self, sample_product):
+        product = ProductsService.get_listing_products().get()
+
+        assert product.main_image is None
+
+    def test_main_image_queried_once(self, listed_products, django_assert_num_queries):
+        # Корзина и заказы берут товар без Prefetch фото
+        product = Product.objects.get(id=listed_products[0].id)
+
+        with django_assert_num_queries(1):
+            assert product.main_image
+            assert product.main_image.image_url.endswith("/0/main.jpg")
+
+    @pytest.mark.usefixtures("locmem_cache")
+    def test_cards_render_without_extra_queries(
+        self, listed_products, django_assert_num_queries
+    ):
+        with django_assert_num_queries(2):
+            cards = ProductCardCache.render_cards(
+                ProductsService.get_listing_products()[:12]
+            )
+
+        assert "https://cdn.example.com/0/main.jpg" in cards[0]
@@ -0,0 +1,82 @@
+import pytest
+
+from products.models import Product, Review
+from products.services.analytics_service import AnalyticsService
+from products.services.products_crud import ProductsService
+from products.services.rating_service import RatingService
+from products.services.review_crud import ReviewService
+
+
+@pytest.mark.django_db
+class TestProductRatingAggregates:
+    def test_create_review_updates_aggregates(self, sample_product, create_profile):
+        ReviewService.create_review(sample_product.id, create_profile(0).pk, 5, "Ок")
+        ReviewService.create_review(sample_product.id, create_profile(1).pk, 2, "Так")
+
+        sample_product.refresh_from_db()
+        assert sample_product.rating_sum == 7
+        assert sample_product.rating_count == 2
+        assert sample_product.avg_rating == pytest.approx(3.5)
+        assert sample_product.rating_histogram == {1: 0, 2: 1, 3: 0, 4: 0, 5: 1}
+
+    def test_verify_review_keeps_aggregates(self, sample_product, create_profile):
+        review = ReviewService.create_review(
+            sample_product.id, create_profile().pk, 4, "Хорошо"
+        )
+
+        assert ReviewService.verify_review(review.id) is True
+        assert ReviewService.verify_review(review.id) is True
+        assert ReviewService.verify_review(99999999) is False
+
+        sample_product.refresh_from_db()
+        assert sample_product.rating_count == 1
+        assert Review.objects.get(id=review.id).is_verified is True
+
+    def test_product_with_reviews(self, sample_product, create_profile):
+        ReviewService.create_review(sample_product.id, create_profile().pk, 3, "Ну")
+
+        data = ProductsService.get_product_with_reviews(sample_product.id)
+
+        assert data["avg_rating"] == pytest.approx(3.0)
+        assert data["review_count"] == 1
+
+    def test_reconcile_fixes_drift(self, create_product, create_profile):
+        product = create_product()
+        empty_product = create_product(name="Ваза")
+        for index, rating in enumerate([5, 4, 4]):
+            Review.objects.create(
+                product_id=product,
+                user_id=create_profile(index),
+                rating=rating,
+                comment="Без сервиса",
+                is_verified=True,
+            )
+        Product.objects.filter(id=empty_product.id).update(rating_count=3)
+
+        assert RatingService.reconcile() == 2
+
+        product.refresh_from_db()
+        empty_product.refresh_from_db()
+        assert product.rating_sum == 13
+        assert product.rating_count == 3
+        assert product.avg_rating == pytest.approx(13 / 3)
+        assert product.rating_histogram == {1: 0, 2: 0, 3: 0, 4: 2, 5: 1}
+        assert empty_product.rating_count == 0
+        assert empty_product.avg_rating == 0
+
+    def test_analytics_reads_stored_aggregates(self, create_product, create_profile):
+        good = create_product(name="Ваза")
+        bad = create_product(name="Кружка")
+        profiles = [create_profile(index) for index in range(3)]
+        for profile in profiles:
+            ReviewService.create_review(good.id, profile.pk, 5, "Отлично")
+            ReviewService.create_review(bad.id, profile.pk, 2, "Плохо")
+
+        top = list(AnalyticsService.get_top_rated_products(min_reviews=3))
+        attention = list(AnalyticsService.get_products_needing_attention())
+
+        assert top == [good, bad]
+        assert top[0].review_count == 3
+        assert attention == [bad]
+        assert ReviewService.get_rating_distribution() == {2: 3, 5: 3}
+        assert ReviewService.get_average_rating() == pytest.approx(3.5)
@@ -0,0 +1,111 @@
+import pytest
+from django.db import connections, transaction
+from django.http import HttpResponse
+from django.test import RequestFactory
+
+from core.middleware import ReplicaPinMiddleware
+from products.models import Category
+from products.services.analytics_service import AnalyticsService
+from products.services.products_crud import ProductsService
+
+replica_db = pytest.mark.django_db(transaction=True, databases=["default", "replica"])
+
+
+@pytest.fixture
+def replica(settings):
+    settings.REPLICA_DATABASE = "replica"
+    settings.REPLICA_STICKY_SECONDS = 5
+    return connections["replica"]
+
+
+def count_out_of_stock(request):
+    ProductsService.get_out_of_stock_count()
+    return HttpResponse()
+
+
+@replica_db
+class TestReplicaRouting:
+    def test_service_reads_use_replica(
+        self, replica, sample_product, django_assert_num_queries
+    ):
+        with django_assert_num_queries(1, connection=replica):
+            assert ProductsService.get_out_of_stock_count() == 0
+
+        queryset = ProductsService.get_products_by_category(sample_product.category_id)
+        assert queryset.db == "replica"
+        assert [product.id for product in queryset] == [sample_product.id]
+
+    def test_writes_use_default(self, replica, sample_product):
+        product = ProductsService.get_product_by_id(sample_product.id)
+        assert product._state.db == "replica"
+
+        product.stock_quantity = 0
+        product.save()
+
+        assert sample_product._state.db == "default"
+        assert ProductsService.get_out_of_stock_count() == 1
+
+    def test_analytics_reads_use_replica(
+        self, replica, sample_product, django_assert_num_queries
+    ):
+        with django_assert_num_queries(0):
+            with django_assert_num_queries(4, connection=replica):
+                AnalyticsService.get_period_stats(days=1)
+
+    def test_transaction_reads_use_default(self, replica, sample_product):
+        with transaction.atomic():
+            assert ProductsService.get_all_products().db == "default"
+
+    def test_replica_disabled(self, replica, settings):
+        settings.REPLICA_DATABASE = None
+
+        assert ProductsService.get_all_products().db == "default"
+
+    def test_unrelated_requests_use_replica(
+        self, replica, db, django_assert_num_queries
+    ):
+        middleware = ReplicaPinMiddleware(count_out_of_stock)
+
+        with django_assert_num_queries(1, connection=replica):
+            response = middleware(RequestFactory().get("/"))
+
+        assert ReplicaPinMiddleware.COOKIE_NAME not in response.cookies
+
+    def test_write_pins_user_to_default(self, replica, django_assert_num_queries):
+        def write_then_read(request):
+            Category.objects.create(name="Вазы", description="Вазы", slug="vazy")
+            assert ProductsService.get_all_products().db == "default"
+            return HttpResponse()
+
+        response = ReplicaPinMiddleware(write_then_read)(RequestFactory().post("/"))
+        cookie = response.cookies[ReplicaPinMiddleware.COOKIE_NAME]
+        assert cookie["max-age"] == 5
+
+        request = RequestFactory().get("/")
+        request.COOKIES[ReplicaPinMiddleware.COOKIE_NAME] = cookie.value
+        with django_assert_num_queries(0, connection=replica):
+            ReplicaPinMiddleware(count_out_of_stock)(request)
+
+    def test_writes_outside_request_do_not_pin(self, replica, sample_product):
+        Category.objects.create(name="Вазы", description="Вазы", slug="vazy")
+
+        assert ProductsService.get_all_products().db == "replica"
+
+    @pytest.mark.parametrize("method", ["post", "put", "patch", "delete"])
+    def test_unsafe_requests_read_default(
+        self, replica, db, method, django_assert_num_queries
+    ):
+        middleware = ReplicaPinMiddleware(count_out_of_stock)
+        request = getattr(RequestFactory(), method)("/")
+
+        with django_assert_num_queries(0, connection=replica):
+            response = middleware(request)
+
+        # Без записи закреплять следующие запросы незачем
+        assert ReplicaPinMiddleware.COOKIE_NAME not in response.cookies
+
+    def test_seller_edit_reads_default(self, replica, sample_product):
+        product = ProductsService.get_product_by_id_for_seller(sample_product.id)
+
+        assert product._state.db == "default"
+        assert product.images.all().db == "default"
@@ -0,0 +1,100 @@
+import pytest
+from django.test import RequestFactory
+
+from core.response_cache import ResponseCache
+from products.models import Service
+from products.services.products_crud import ProductsService
+from products.views.category_views import CategoryDetailView
+from products.views.product_views import ProductDetailView, ServiceListView
+
+product_detail = ProductDetailView.as_view(template_name="product_detail.html")
+category_detail = CategoryDetailView.as_view(template_name="category_detail.html")
+service_list = ServiceListView.as_view(template_name="services.html")
+
+
+def get(view, path, cookies=None, **kwargs):
+    request = RequestFactory().get(path)
+    request.COOKIES.update(cookies or {})
+    return view(request, **kwargs)
+
+
+def is_hit(response) -> bool:
+    return response.get(ResponseCache.HIT_HEADER) == "hit"
+
+
+@pytest.mark.django_db
+@pytest.mark.usefixtures("locmem_cache", "catalog_templates")
+class TestResponseCache:
+    def test_anonymous_get_is_served_from_cache(
+        self, sample_product, django_assert_num_queries
+    ):
+        first = get(product_detail, "/product/", pk=sample_product.id)
+
+        with django_assert_num_queries(0):
+            second = get(product_detail, "/product/", pk=sample_product.id)
+
+        assert not is_hit(first)
+        assert is_hit(second)
+        assert second.content == first.content
+
+    def test_query_string_is_normalized(self):
+        first = RequestFactory().get("/catalog/?b=1&a=2")
+        second = RequestFactory().get("/catalog/?a=2&b=1")
+        htmx = RequestFactory().get("/catalog/?a=2&b=1", HTTP_HX_REQUEST="true")
+
+        assert ResponseCache.make_key(first) == ResponseCache.make_key(second)
+        assert ResponseCache.make_key(first) != ResponseCache.make_key(htmx)
+
+    def test_session_bypasses_cache(self, sample_product, settings):
+        cookies = {settings.SESSION_COOKIE_NAME: "session"}
+        get(product_detail, "/product/", pk=sample_product.id)
+
+        response = get(product_detail, "/product/", cookies, pk=sample_product.id)
+
+        assert not is_hit(response)
+
+    def test_stock_change_purges_only_product_pages(
+        self, sample_product, create_product, django_capture_on_commit_callbacks
+    ):
+        other = create_product(name="Тарелка")
+        slug = sample_product.category_id.slug
+        get(product_detail, "/product/", pk=sample_product.id)
+        get(product_detail, "/other/", pk=other.id)
+        get(service_list, "/services/")
+
+        with django_capture_on_commit_callbacks(execute=True):
+            ProductsService.update_stock(sample_product.id, "set", 3)
+
+        assert not is_hit(get(product_detail, "/product/", pk=sample_product.id))
+        assert is_hit(get(product_detail, "/other/", pk=other.id))
+        assert is_hit(get(service_list, "/services/"))
+
+        get(category_detail, "/category/", slug=slug)
+        with django_capture_on_commit_callbacks(execute=True):
+            ProductsService.update_stock(sample_product.id, "set", 2)
+        assert not is_hit(get(category_detail, "/category/", slug=slug))
+
+    def test_new_product_purges_category_page(
+        self, sample_product, create_product, django_capture_on_commit_callbacks
+    ):
+        slug = sample_product.category_id.slug
+        get(category_detail, "/category/", slug=slug)
+
+        with django_capture_on_commit_callbacks(execute=True):
+            create_product(name="Ваза")
+
+        response = get(category_detail, "/category/", slug=slug)
+        assert not is_hit(response)
+        assert "Ваза" in response.content.decode()
+
+    def test_service_change_purges_service_pages(
+        self, sample_product, django_capture_on_commit_callbacks
+    ):
+        get(service_list, "/services/")
+        get(product_detail, "/product/", pk=sample_product.id)
+
+        with django_capture_on_commit_callbacks(execute=True):
+            Service.objects.create(name="Гравировка", description="Надпись", price=300)
+
+        assert not is_hit(get(service_list, "/services/"))
+        assert not is_hit(get(product_detail, "/product/", pk=sample_product.id))
@@ -0,0 +1,59 @@
+from datetime import timedelta
+
+import pytest
+from django.utils import timezone
+
+from products.models import Product, ProductDailyStat, Review, ReviewDailyStat
+from products.services.analytics_service import AnalyticsService
+from products.services.review_crud import ReviewService
+from products.services.rollup_service import RollupService
+
+
+def shift_created_at(model, obj, days: int):
+    model.objects.filter(id=obj.id).update(
+        created_at=timezone.now() - timedelta(days=days)
+    )
+
+
+@pytest.mark.django_db
+class TestDailyRollups:
+    def test_rollup_recent_groups_by_day(self, create_product, create_profile):
+        old = create_product(name="Ваза")
+        shift_created_at(Product, old, 2)
+        product = create_product()
+        for index, rating in enumerate([5, 5, 3]):
+            review = ReviewService.create_review(
+                product.id, create_profile(index).pk, rating, "Отзыв"
+            )
+            shift_created_at(Review, review, 1)
+
+        result = RollupService.rollup_recent()
+
+        assert result == {"reviews": 2, "products": 2}
+        yesterday = timezone.localdate() - timedelta(days=1)
+        assert ReviewDailyStat.objects.get(
+            date=yesterday, product_id=product, rating=5
+        ).reviews_count == 2
+        assert ProductDailyStat.objects.get(
+            date=timezone.localdate() - timedelta(days=2)
+        ).products_count == 1
+
+    def test_rollup_is_idempotent(self, sample_product):
+        RollupService.rollup_recent()
+        RollupService.rollup_recent()
+
+        assert ProductDailyStat.objects.get().products_count == 1
+
+    def test_period_stats_combine_rollups_and_today(
+        self, create_product, django_assert_num_queries
+    ):
+        for days in (1, 5, 40):
+            shift_created_at(Product, create_product(name=f"Ваза {days}"), days)
+        create_product(name="Сегодня")
+        RollupService.rollup_recent(days=60)
+
+        with django_assert_num_queries(4):
+            stats = AnalyticsService.get_period_stats(days=30)
+
+        assert stats == {"new_reviews": 0, "new_products": 3}
+        assert AnalyticsService.get_period_stats(days=90)["new_products"] == 4
@@ -0,0 +1,74 @@
+import pytest
+
+from products.models import Product
+from products.services.products_crud import ProductsService
+from products.services.search_service import ProductSearchService
+
+
+@pytest.mark.django_db
+class TestProductSearch:
+    def test_search_vector_filled_on_create(self, sample_product):
+        sample_product.refresh_from_db()
+        assert sample_product.search_vector is not None
+
+    def test_search_russian_morphology(self, create_product):
+        product = create_product(name="Кружка с росписью")
+        create_product(name="Ваза", description="Напольная ваза")
+
+        result = list(ProductsService.search_products("кружки"))
+
+        assert result == [product]
+
+    def test_search_by_prefix(self, create_product):
+        product = create_product(name="Тарелка обеденная")
+
+        result = list(ProductsService.search_products("тарел"))
+
+        assert result == [product]
+
+    def test_search_with_typo(self, create_product):
+        product = create_product(name="Кувшин", description="Для воды")
+
+        result = list(ProductsService.search_products("Кувшын"))
+
+        assert result == [product]
+
+    def test_search_ranks_name_above_description(self, create_product):
+        in_description = create_product(name="Блюдо", description="Под вазу")
+        in_name = create_product(name="Ваза", description="Для цветов")
+
+        result = list(ProductsService.search_products("ваза"))
+
+        assert result == [in_name, in_description]
+
+    def test_search_excludes_inactive(self, create_product):
+        create_product(name="Ваза", is_active=False)
+
+        assert not ProductsService.search_products("ваза").exists()
+
+    def test_search_empty_query(self, sample_product):
+        assert not ProductsService.search_products("  !!  ").exists()
+
+    def test_search_vector_updated_on_rename(self, sample_product):
+        sample_product.name = "Пиала"
+        sample_product.save()
+
+        assert list(ProductsService.search_products("пиала")) == [sample_product]
+
+    def test_rebuild_index(self, create_product):
+        create_product(name="Ваза")
+        create_product(name="Кружка")
+        Product.objects.update(search_vector=None)
+
+        updated = ProductSearchService.rebuild_index()
+
+        assert updated == 2
+        assert not Product.objects.filter(search_vector__isnull=True).exists()
+
+    def test_seller_filter_uses_search(self, create_product):
+        product = create_product(name="Ваза", is_active=False)
+        create_product(name="Кружка")
+
+        result = list(ProductsService.filter_products_for_seller(search="вазы"))
+
+        assert result == [product]
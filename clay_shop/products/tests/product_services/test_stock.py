@@ -0,0 +1,86 @@
+import pytest
+from django.core.exceptions import ValidationError
+
+from products.models import Product
+from products.services.products_crud import ProductsService
+
+
+@pytest.mark.django_db
+class TestStockOperations:
+    @pytest.mark.parametrize(
+        "action, quantity, expected",
+        [("add", 5, 15), ("set", 3, 3), ("subtract", 4, 6), ("subtract", 50, 0)],
+    )
+    def test_update_stock(self, sample_product, action, quantity, expected):
+        result = ProductsService.update_stock(sample_product.id, action, quantity)
+
+        assert result == expected
+        sample_product.refresh_from_db()
+        assert sample_product.stock_quantity == expected
+
+    def test_update_stock_touches_updated_at(self, sample_product):
+        updated_at = sample_product.updated_at
+
+        ProductsService.update_stock(sample_product.id, "add", 1)
+
+        sample_product.refresh_from_db()
+        assert sample_product.updated_at > updated_at
+
+    def test_update_stock_not_exists(self):
+        assert ProductsService.update_stock(99999999, "add", 1) is None
+
+    def test_decrease_stock_is_conditional(self, create_product):
+        product = create_product(stock_quantity=2)
+
+        assert ProductsService.decrease_stock(product.id, 2) is True
+        assert ProductsService.decrease_stock(product.id, 1) is False
+
+        product.refresh_from_db()
+        assert product.stock_quantity == 0
+
+    def test_decrease_stock_single_query(
+        self, sample_product, django_assert_num_queries
+    ):
+        with django_assert_num_queries(1):
+            ProductsService.decrease_stock(sample_product.id, 1)
+
+    def test_reserve_stock(self, create_product, django_assert_num_queries):
+        products = [
+            create_product(name=f"Ваза {index}", stock_quantity=5)
+            for index in range(4)
+        ]
+
+        with django_assert_num_queries(4) as captured:
+            ProductsService.reserve_stock({product.id: 2 for product in products})
+
+        statements = [
+            query["sql"]
+            for query in captured.captured_queries
+            if "SAVEPOINT" not in query["sql"]
+        ]
+        assert len(statements) == 2
+
+        assert set(Product.objects.values_list("stock_quantity", flat=True)) == {3}
+
+    def test_reserve_stock_all_or_nothing(self, create_product):
+        plenty = create_product(name="Ваза", stock_quantity=10)
+        unique = create_product(name="Кружка", stock_quantity=1, is_unique=True)
+
+        with pytest.raises(ValidationError) as exc_info:
+            ProductsService.reserve_stock({plenty.id: 3, unique.id: 2})
+
+        assert exc_info.value.params == {"product_id": unique.id}
+        plenty.refresh_from_db()
+        unique.refresh_from_db()
+        assert plenty.stock_quantity == 10
+        assert unique.stock_quantity == 1
+
+    def test_reserve_stock_inactive_product(self, create_product):
+        product = create_product(is_active=False)
+
+        with pytest.raises(ValidationError):
+            ProductsService.reserve_stock({product.id: 1})
+
+    def test_reserve_stock_rejects_non_positive(self, sample_product):
+        with pytest.raises(ValidationError):
+            ProductsService.reserve_stock({sample_product.id: 0})
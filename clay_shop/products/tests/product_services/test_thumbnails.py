@@ -0,0 +1,114 @@
+import os
+
+import httpx
+import pytest
+
+from products.models import ProductIMG
+from products.services.thumbnail_service import ThumbnailService
+
+
+@pytest.fixture
+def product_image(sample_product, image_server):
+    return ProductIMG.objects.create(
+        product_id=sample_product, image_url=f"{image_server.base_url}/vase.png"
+    )
+
+
+@pytest.mark.django_db
+@pytest.mark.usefixtures("locmem_cache")
+class TestThumbnails:
+    def test_generates_all_sizes(self, product_image):
+        assert ThumbnailService.process(product_image.id) is True
+
+        product_image.refresh_from_db()
+        assert (product_image.width, product_image.height) == (2000, 1000)
+        assert product_image.thumbnail_sizes == {
+            "card": [400, 200],
+            "detail": [800, 400],
+            "zoom": [1600, 800],
+        }
+        for size in ("card", "detail", "zoom"):
+            for image_format in ("webp", "jpeg"):
+                path = product_image.thumbnail(size, image_format).path
+                assert os.path.exists(path)
+        assert product_image.webp_srcset.count("w, ") == 2
+        assert product_image.jpeg_srcset.endswith(" 1600w")
+
+    def test_source_is_fetched_once(self, product_image, image_server):
+        ThumbnailService.process(product_image.id)
+
+        assert ThumbnailService.process(product_image.id) is False
+        assert len(image_server.requests) == 1
+
+    def test_changed_url_is_refetched(self, product_image, image_server):
+        ThumbnailService.process(product_image.id)
+        product_image.image_url = f"{image_server.base_url}/vase-2.png"
+        product_image.save()
+
+        assert ThumbnailService.pending_image_ids() == [product_image.id]
+        assert ThumbnailService.process(product_image.id) is True
+        assert image_server.requests == ["/vase.png", "/vase-2.png"]
+
+    def test_small_source_is_not_upscaled(self, product_image, image_server):
+        image_server.size = (300, 150)
+
+        ThumbnailService.process(product_image.id)
+
+        product_image.refresh_from_db()
+        assert product_image.thumbnail_sizes["zoom"] == [300, 150]
+        assert product_image.jpeg_srcset.endswith(" 300w")
+        assert ", " not in product_image.jpeg_srcset
+
+    def test_redirect_is_followed_and_checked(self, product_image, image_server):
+        image_server.redirects["/vase.png"] = "/moved.png"
+
+        assert ThumbnailService.process(product_image.id) is True
+        assert image_server.requests == ["/vase.png", "/moved.png"]
+
+        image_server.redirects["/moved.png"] = "http://169.254.169.254/latest/"
+        with pytest.raises(ValueError, match="Запрещенный адрес"):
+            ThumbnailService.fetch_source(f"{image_server.base_url}/moved.png")
+
+    def test_pending_image_ids_filtered_in_sql(
+        self, product_image, django_assert_num_queries
+    ):
+        ThumbnailService.process(product_image.id)
+        pending = ProductIMG.objects.create(
+            product_id=product_image.product_id,
+            image_url="https://cdn.test/a.png",
+            order=1,
+        )
+
+        with django_assert_num_queries(1):
+            assert ThumbnailService.pending_image_ids() == [pending.id]
+
+
+class TestSourceAddressCheck:
+    @pytest.mark.parametrize(
+        "url",
+        [
+            "http://127.0.0.1/a.png",
+            "http://localhost:8000/a.png",
+            "http://10.0.0.5/a.png",
+            "http://169.254.169.254/latest/meta-data/",
+            "http://[::1]/a.png",
+            "http://[::ffff:192.168.0.1]/a.png",
+            "ftp://cdn.test/a.png",
+            "file:///etc/passwd",
+        ],
+    )
+    def test_internal_addresses_rejected(self, url, settings):
+        settings.THUMBNAIL_ALLOWED_NETWORKS = []
+
+        with pytest.raises(ValueError):
+            ThumbnailService.fetch_source(url)
+
+    def test_public_address_pinned(self, monkeypatch):
+        monkeypatch.setattr(
+            "socket.getaddrinfo",
+            lambda host, port, **kwargs: [(2, 1, 6, "", ("93.184.216.34", port))],
+        )
+
+        url = ThumbnailService.resolve(httpx.URL("https://cdn.test:8443/a.png"))
+
+        assert str(url) == "https://93.184.216.34:8443/a.png"
@@ -1,27 +1,44 @@
+from django.db.models import Count, Max
 from django.shortcuts import get_object_or_404
 from django.views.generic import DetailView, ListView
 
-from products.models import Category
+from core.conditional import ConditionalGetMixin
+from core.response_cache import ResponseCache, ResponseCacheMixin
+from products.models import Category, Product
 from products.services.category_crud import CategoryGet
 from products.services.products_crud import ProductsService
 
 
 # Create your views here.
-class CategoryListView(ListView):
+class CategoryListView(ResponseCacheMixin, ConditionalGetMixin, ListView):
     model = Category
     template_name = ...
     context_object_name = "categories"
+    cache_tags = ("categories",)
+
+    def get_validators(self):
+        # У категорий нет updated_at, их правки отражает версия тега
+        return ResponseCache.get_tag_versions(["categories"])
 
     def get_queryset(self):
         return CategoryGet.get_all_categories()
 
 
-class CategoryDetailView(DetailView):
+class CategoryDetailView(ResponseCacheMixin, ConditionalGetMixin, DetailView):
     model = Category
     template_name = ...
     context_object_name = "category"
     slug_field = "slug"
     slug_url_kwarg = "slug"
+    cache_tags = ("categories",)
+
+    def get_validators(self):
+        # Остатки меняются через update() вместе с updated_at, count ловит удаления
+        state = Product.objects.filter(
+            category_id__slug=self.kwargs.get("slug"), is_active=True
+        ).aggregate(last_modified=Max("updated_at"), count=Count("id"))
+        versions = ResponseCache.get_tag_versions(["categories"])
+        return state, versions
 
     def get_object(self, queryset=None):
         slug = self.kwargs.get("slug")
@@ -29,7 +46,13 @@ class CategoryDetailView(DetailView):
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        context["products"] = ProductsService.get_products_by_category(self.object.id)
+        context["products"] = list(
+            ProductsService.get_products_by_category(self.object.id)
+        )
+        self.add_cache_tags(
+            ResponseCache.category_tag(self.object.id),
+            *(ResponseCache.product_tag(product.id) for product in context["products"]),
+        )
         return context
 
 
@@ -1,6 +1,10 @@
+from django.db.models import Count, Max, Q, Sum
 from django.shortcuts import get_object_or_404
 from django.views.generic import DetailView, ListView
 
+from core.conditional import ConditionalGetMixin
+from core.pagination import CursorPaginationMixin
+from core.response_cache import ResponseCache, ResponseCacheMixin
 from products.models import Product, Service
 from products.services.category_crud import CategoryGet
 from products.services.products_crud import ProductsService
@@ -8,19 +12,38 @@ from products.services.review_crud import ReviewService
 from products.services.service_crud import ServiceCrud
 
 
-class ProductListView(ListView):
+class ProductListView(
+    ResponseCacheMixin, ConditionalGetMixin, CursorPaginationMixin, ListView
+):
     model = Product
     template_name = ...
     context_object_name = "products"
     paginate_by = 12
+    cursor_ordering = "name"
+    cache_tags = ("catalog", "categories")
+
+    def get_validators(self):
+        # Любая страница каталога — срез активных товаров, ее меняет их правка
+        state = Product.objects.filter(is_active=True).aggregate(
+            last_modified=Max("updated_at"), count=Count("id")
+        )
+        versions = ResponseCache.get_tag_versions(["categories"])
+        return state, versions
+
+    def get_cursor_ordering(self):
+        # Результаты поиска упорядочены по релевантности
+        if self.request.GET.get("q"):
+            return None
+        return self.cursor_ordering
 
     def get_queryset(self):
-        queryset = ProductsService.get_active_products()
+        queryset = ProductsService.get_listing_products()
         category_slug = self.request.GET.get("category")
         if category_slug:
             category = CategoryGet.get_category_by_slug(category_slug)
             if category:
                 queryset = queryset.filter(category_id=category)
+                self.add_cache_tags(ResponseCache.category_tag(category.id))
 
         search_query = self.request.GET.get("q")
         if search_query:
@@ -31,16 +54,41 @@ class ProductListView(ListView):
         context = super().get_context_data(**kwargs)
         context["categories"] = CategoryGet.get_all_categories()
         context["search_query"] = self.request.GET.get("q", "")
+        self.add_cache_tags(
+            *(ResponseCache.product_tag(product.id) for product in context["products"])
+        )
         return context
 
 
-class ProductDetailView(DetailView):
+class ProductDetailView(ResponseCacheMixin, ConditionalGetMixin, DetailView):
     model = Product
     template_name = ...
     context_object_name = "product"
+    cache_tags = ("services",)
+
+    def get_validators(self):
+        # Остаток и рейтинг лежат в строке товара, отзывы — в агрегате по ним:
+        # число и сумма id ловят модерацию и удаления, updated_at — правки
+        verified = Q(review__is_verified=True)
+        state = Product.objects.filter(
+            id=self.kwargs.get("pk"), is_active=True
+        ).aggregate(
+            updated_at=Max("updated_at"),
+            stock_quantity=Max("stock_quantity"),
+            rating_count=Max("rating_count"),
+            rating_sum=Max("rating_sum"),
+            verified_reviews=Count("review", filter=verified),
+            verified_ids=Sum("review__id", filter=verified),
+            reviews_updated_at=Max("review__updated_at", filter=verified),
+        )
+        if state["updated_at"] is None:
+            return None
+        versions = ResponseCache.get_tag_versions(["services"])
+        return state, versions
 
     def get_object(self, queryset=None):
         product_id = self.kwargs.get("pk")
+        self.add_cache_tags(ResponseCache.product_tag(product_id))
         return get_object_or_404(Product, id=product_id, is_active=True)
 
     def get_context_data(self, **kwargs):
@@ -62,10 +110,11 @@ class ProductDetailView(DetailView):
         return context
 
 
-class ServiceListView(ListView):
+class ServiceListView(ResponseCacheMixin, ListView):
     model = Service
     template_name = ...
     context_object_name = "services"
+    cache_tags = ("services",)
 
     def get_queryset(self):
         return ServiceCrud.get_active_services()
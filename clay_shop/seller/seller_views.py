@@ -1,6 +1,9 @@
-from django.http import JsonResponse
+import uuid
+
+from django.core.exceptions import ValidationError
+from django.http import FileResponse, Http404, JsonResponse, StreamingHttpResponse
 from django.shortcuts import redirect
-from django.urls import reverse_lazy
+from django.urls import reverse, reverse_lazy
 from django.views import View
 from django.views.generic import (
     TemplateView,
@@ -10,12 +13,18 @@ from django.views.generic import (
     ListView,
 )
 
+from core.pagination import CursorPaginationMixin
+from core.private_files import private_storage
 from products.forms.products_form import ProductForm, ProductImageFormSet, ServiceForm
 from products.models import Product, Review, Service
 from products.services.service_crud import ServiceCrud
-from users.auth_mixins import OwnerOrAdminMixin
+from seller.services.export_service import ExportService
+from seller.tasks import export_task, import_catalog_task
+from users.auth_mixins import OwnerOrAdminMixin, SellerRequiredMixin
 
 from products.services.analytics_service import AnalyticsService
+from products.services.card_cache import ProductCardCache
+from products.services.catalog_import import CatalogImportService
 from products.services.products_crud import ProductsService
 from products.services.review_crud import ReviewService
 
@@ -26,25 +35,27 @@ class SellerDashboardView(OwnerOrAdminMixin, TemplateView):
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
 
-        context.update(AnalyticsService.get_dashboard_stats())
+        dashboard = AnalyticsService.get_dashboard()
+        context.update(dashboard["stats"])
 
-        context["recent_reviews"] = ReviewService.get_recent_reviews(limit=5)
+        context["recent_reviews"] = dashboard["recent_reviews"]
 
-        context["low_stock_products"] = ProductsService.get_low_stock_products(
-            threshold=5
-        )[:10]
+        context["low_stock_products"] = dashboard["low_stock_products"]
 
-        context["popular_products"] = ProductsService.get_popular_products(limit=5)
+        context["popular_products"] = dashboard["popular_products"]
 
         return context
 
 
-class SellerProductListView(OwnerOrAdminMixin, ListView):
+class SellerProductListView(OwnerOrAdminMixin, CursorPaginationMixin, ListView):
     model = Product
     template_name = ...
     context_object_name = "products"
     paginate_by = 20
 
+    def get_cursor_ordering(self):
+        return ProductsService.normalize_seller_sort(self.request.GET.get("sort"))
+
     def get_queryset(self):
         return ProductsService.filter_products_for_seller(
             status=self.request.GET.get("status"),
@@ -144,6 +155,7 @@ class SellerProductUpdateView(OwnerOrAdminMixin, UpdateView):
 
             image_formset.instance = self.object
             image_formset.save()
+            ProductCardCache.invalidate(self.object.id)
 
             return redirect("seller:product-detail", pk=self.object.pk)
         else:
@@ -192,11 +204,90 @@ class SellerProductStockUpdateView(OwnerOrAdminMixin, View):
             )
 
 
-class SellerReviewListView(OwnerOrAdminMixin, ListView):
+class SellerBulkMixin(SellerRequiredMixin):
+    """Список id из POST для массовых операций продавца."""
+
+    max_ids = 1000
+    BOOL_VALUES = {"1": True, "true": True, "0": False, "false": False}
+
+    def get_ids(self, field: str = "ids") -> list[int] | None:
+        values = self.request.POST.getlist(field)
+        if not values or len(values) > self.max_ids:
+            return None
+        try:
+            return [int(value) for value in values]
+        except ValueError:
+            return None
+
+    def bad_request(self, error: str | None = None):
+        return JsonResponse(
+            {
+                "success": False,
+                "error": error or f"Передайте от 1 до {self.max_ids} корректных id",
+            },
+            status=400,
+        )
+
+
+class SellerProductBulkActiveView(SellerBulkMixin, View):
+    def post(self, request, *args, **kwargs):
+        product_ids = self.get_ids()
+        if product_ids is None:
+            return self.bad_request()
+
+        # Без явного значения массово деактивировать товары нельзя
+        is_active = self.BOOL_VALUES.get(request.POST.get("is_active", "").lower())
+        if is_active is None:
+            return self.bad_request("Укажите is_active: 1/0 или true/false")
+
+        updated = ProductsService.set_products_active(product_ids, is_active)
+        action = "активировано" if is_active else "деактивировано"
+
+        return JsonResponse(
+            {
+                "success": True,
+                "updated": updated,
+                "message": f"Продуктов {action}: {updated}",
+            }
+        )
+
+
+class SellerProductBulkStockView(SellerBulkMixin, View):
+    def post(self, request, *args, **kwargs):
+        product_ids = self.get_ids()
+        if product_ids is None:
+            return self.bad_request()
+        quantities = self.get_ids("quantities")
+        if quantities is None:
+            return self.bad_request("Количество должно быть целым числом")
+        if len(product_ids) != len(quantities):
+            return JsonResponse(
+                {"success": False, "error": "Количество не указано для всех товаров"},
+                status=400,
+            )
+
+        try:
+            stock = ProductsService.bulk_update_stock(
+                request.POST.get("action"), dict(zip(product_ids, quantities))
+            )
+        except ValidationError as e:
+            return JsonResponse({"success": False, "error": e.messages[0]}, status=400)
+
+        return JsonResponse(
+            {
+                "success": True,
+                "stock_quantity": stock,
+                "message": "Количество обновлено",
+            }
+        )
+
+
+class SellerReviewListView(OwnerOrAdminMixin, CursorPaginationMixin, ListView):
     model = Review
     template_name = ...
     context_object_name = "reviews"
     paginate_by = 20
+    cursor_ordering = "-created_at"
 
     def get_queryset(self):
         status = self.request.GET.get("status")
@@ -233,6 +324,23 @@ class SellerReviewVerifyView(OwnerOrAdminMixin, View):
         )
 
 
+class SellerReviewBulkVerifyView(SellerBulkMixin, View):
+    def post(self, request, *args, **kwargs):
+        review_ids = self.get_ids()
+        if review_ids is None:
+            return self.bad_request()
+
+        verified = ReviewService.verify_reviews(review_ids)
+
+        return JsonResponse(
+            {
+                "success": True,
+                "verified": verified,
+                "message": f"Верифицировано отзывов: {verified}",
+            }
+        )
+
+
 class SellerServiceListView(OwnerOrAdminMixin, ListView):
     model = Service
     template_name = ...
@@ -315,4 +423,118 @@ class SellerAnalyticsView(OwnerOrAdminMixin, TemplateView):
 
         context['category_distribution'] = AnalyticsService.get_category_distribution()
 
-        return context
\ No newline at end of file
+        return context
+
+class SellerExportView(SellerRequiredMixin, View):
+    def dispatch(self, request, *args, **kwargs):
+        if not ExportService.is_supported(kwargs["dataset"], kwargs["fmt"]):
+            raise Http404("Неизвестная выгрузка")
+        return super().dispatch(request, *args, **kwargs)
+
+    def get(self, request, dataset, fmt):
+        response = StreamingHttpResponse(
+            ExportService.stream(
+                dataset, fmt, ExportService.clean_filters(request.GET)
+            ),
+            content_type=ExportService.content_type(fmt),
+        )
+        response["Content-Disposition"] = (
+            f'attachment; filename="{ExportService.filename(dataset, fmt)}"'
+        )
+        return response
+
+    def post(self, request, dataset, fmt):
+        # Большие выгрузки собираются в Celery, клиент опрашивает статус
+        task = export_task.delay(
+            dataset, fmt, ExportService.clean_filters(request.POST)
+        )
+        return JsonResponse(
+            {
+                "success": True,
+                "task_id": task.id,
+                "status_url": reverse("export-status", args=[task.id]),
+            },
+            status=202,
+        )
+
+
+class SellerTaskStatusView(SellerRequiredMixin, View):
+    """Статус фоновой задачи продавца по task_id для опроса с клиента."""
+
+    task = None
+    error_message = "Ошибка выполнения задачи"
+
+    def get_ready_data(self, value) -> dict:
+        return {}
+
+    def get(self, request, task_id):
+        result = self.task.AsyncResult(task_id)
+
+        if result.successful():
+            return JsonResponse(
+                {
+                    "success": True,
+                    "status": "ready",
+                    **self.get_ready_data(result.result),
+                }
+            )
+        if result.failed():
+            return JsonResponse(
+                {"success": False, "status": "failed", "error": self.error_message}
+            )
+        return JsonResponse({"success": True, "status": "pending"})
+
+
+class SellerExportStatusView(SellerTaskStatusView):
+    task = export_task
+    error_message = "Ошибка выгрузки"
+
+    def get_ready_data(self, value) -> dict:
+        return {"url": reverse("export-download", args=[value])}
+
+
+class SellerExportDownloadView(SellerRequiredMixin, View):
+    """Готовая выгрузка отдается только продавцу, прямой ссылки на файл нет."""
+
+    def get(self, request, name):
+        path = ExportService.file_path(name)
+        if path is None:
+            raise Http404("Выгрузка не найдена или устарела")
+
+        return FileResponse(
+            open(path, "rb"),
+            as_attachment=True,
+            filename=ExportService.download_name(name),
+        )
+
+
+class SellerProductImportView(SellerRequiredMixin, View):
+    def post(self, request, *args, **kwargs):
+        feed = request.FILES.get("feed")
+        if feed is None:
+            return JsonResponse(
+                {"success": False, "error": "Файл фида не передан"}, status=400
+            )
+
+        # Фид сохраняется в приватное хранилище, разбирает его воркер Celery
+        fmt = CatalogImportService.detect_format(feed.name)
+        name = private_storage().save(
+            f"{CatalogImportService.UPLOAD_DIR}/{uuid.uuid4().hex}.{fmt}", feed
+        )
+        task = import_catalog_task.delay(name, fmt)
+        return JsonResponse(
+            {
+                "success": True,
+                "task_id": task.id,
+                "status_url": reverse("product-import-status", args=[task.id]),
+            },
+            status=202,
+        )
+
+
+class SellerImportStatusView(SellerTaskStatusView):
+    task = import_catalog_task
+    error_message = "Ошибка импорта каталога"
+
+    def get_ready_data(self, value) -> dict:
+        return {"stats": value}
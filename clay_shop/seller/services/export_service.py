@@ -0,0 +1,172 @@
+import os
+import re
+import uuid
+from collections.abc import Iterator
+
+from django.db.models import QuerySet
+from django.utils import timezone
+
+from core.db_router import replica_read
+from core.private_files import private_path, purge_directory
+from core.streaming_export import (
+    CSV_CONTENT_TYPE,
+    XLSX_CONTENT_TYPE,
+    iter_csv,
+    iter_xlsx,
+)
+from orders.models import Order
+from products.services.products_crud import ProductsService
+from products.services.review_crud import ReviewService
+
+# Имя файла выгрузки: набор данных, случайный id и формат
+_FILE_NAME = re.compile(r"([a-z]+)-[0-9a-f]{32}\.([a-z]+)")
+
+
+class ExportService:
+    # Строк на один fetch серверного курсора
+    CHUNK_SIZE = 2000
+    EXPORT_DIR = "exports"
+    KEEP_FILES_HOURS = 24
+    FILTER_PARAMS = ("status", "search", "sort", "rating")
+
+    FORMATS = {
+        "csv": (CSV_CONTENT_TYPE, iter_csv),
+        "xlsx": (XLSX_CONTENT_TYPE, iter_xlsx),
+    }
+
+    # Колонки выгрузки: заголовок и поле для values_list
+    DATASETS = {
+        "products": (
+            ("ID", "id"),
+            ("Название", "name"),
+            ("Категория", "category_id__name"),
+            ("Цена", "base_price"),
+            ("Цена со скидкой", "discount_price"),
+            ("Остаток", "stock_quantity"),
+            ("Активен", "is_active"),
+            ("Создан", "created_at"),
+            ("Обновлен", "updated_at"),
+        ),
+        "reviews": (
+            ("ID", "id"),
+            ("ID продукта", "product_id"),
+            ("Продукт", "product_id__name"),
+            ("Email покупателя", "user_id__user__email"),
+            ("Оценка", "rating"),
+            ("Комментарий", "comment"),
+            ("Верифицирован", "is_verified"),
+            ("Создан", "created_at"),
+        ),
+        "orders": (
+            ("ID", "id"),
+            ("Создан", "created_at"),
+            ("Email покупателя", "user_id__email"),
+            ("Статус", "status"),
+            ("Статус оплаты", "payment_status"),
+            ("Сумма", "total_amount"),
+            ("Способ доставки", "delivery_method_id__name"),
+            ("Способ оплаты", "payment_method__name"),
+            ("Комментарий", "notes"),
+        ),
+    }
+
+    @staticmethod
+    def is_supported(dataset: str, fmt: str) -> bool:
+        return dataset in ExportService.DATASETS and fmt in ExportService.FORMATS
+
+    @staticmethod
+    def clean_filters(params) -> dict[str, str]:
+        return {
+            key: params[key]
+            for key in ExportService.FILTER_PARAMS
+            if params.get(key)
+        }
+
+    @staticmethod
+    def content_type(fmt: str) -> str:
+        return ExportService.FORMATS[fmt][0]
+
+    @staticmethod
+    def filename(dataset: str, fmt: str) -> str:
+        return f"{dataset}-{timezone.localdate():%Y%m%d}.{fmt}"
+
+    @staticmethod
+    @replica_read
+    def get_queryset(dataset: str, filters: dict) -> QuerySet:
+        if dataset == "products":
+            return ProductsService.filter_products_for_seller(
+                status=filters.get("status"),
+                search=filters.get("search"),
+                sort_by=filters.get("sort", "-created_at"),
+            )
+
+        if dataset == "reviews":
+            status = filters.get("status")
+            rating = filters.get("rating", "")
+            return ReviewService.get_all_reviews(
+                verified_only={"pending": False, "verified": True}.get(status),
+                rating_filter=int(rating) if rating.isdigit() else None,
+            )
+
+        queryset = Order.objects.order_by("-created_at")
+        if filters.get("status"):
+            queryset = queryset.filter(status=filters["status"])
+        return queryset
+
+    @staticmethod
+    def iter_rows(dataset: str, filters: dict) -> Iterator[tuple]:
+        """Кортежи строк из серверного курсора, модели не создаются."""
+        fields = [field for _, field in ExportService.DATASETS[dataset]]
+        queryset = (
+            ExportService.get_queryset(dataset, filters)
+            .select_related(None)
+            .prefetch_related(None)
+            .values_list(*fields)
+        )
+        return queryset.iterator(chunk_size=ExportService.CHUNK_SIZE)
+
+    @staticmethod
+    def stream(dataset: str, fmt: str, filters: dict) -> Iterator[bytes]:
+        header = [label for label, _ in ExportService.DATASETS[dataset]]
+        writer = ExportService.FORMATS[fmt][1]
+        return writer(header, ExportService.iter_rows(dataset, filters))
+
+    @staticmethod
+    def file_path(name: str) -> str | None:
+        """Путь к готовому файлу выгрузки или None, если имя не наше."""
+        match = _FILE_NAME.fullmatch(name)
+        if match is None or not ExportService.is_supported(*match.groups()):
+            return None
+        path = private_path(ExportService.EXPORT_DIR, name)
+        return path if os.path.isfile(path) else None
+
+    @staticmethod
+    def download_name(name: str) -> str:
+        dataset, fmt = _FILE_NAME.fullmatch(name).groups()
+        return ExportService.filename(dataset, fmt)
+
+    @staticmethod
+    def export_to_file(dataset: str, fmt: str, filters: dict) -> str:
+        """Пишет выгрузку в приватное хранилище и возвращает имя файла."""
+        name = f"{dataset}-{uuid.uuid4().hex}.{fmt}"
+        path = private_path(ExportService.EXPORT_DIR, name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        # Недописанный файл не должен быть доступен по ссылке
+        partial_path = f"{path}.part"
+        try:
+            with open(partial_path, "wb") as file:
+                for chunk in ExportService.stream(dataset, fmt, filters):
+                    file.write(chunk)
+            os.replace(partial_path, path)
+        except Exception:
+            if os.path.exists(partial_path):
+                os.remove(partial_path)
+            raise
+
+        return name
+
+    @staticmethod
+    def purge_files(hours: int | None = None) -> int:
+        hours = ExportService.KEEP_FILES_HOURS if hours is None else hours
+        return purge_directory(ExportService.EXPORT_DIR, hours)
@@ -0,0 +1,57 @@
+import logging
+
+from celery import shared_task
+
+from core.private_files import private_storage, purge_directory
+from products.services.catalog_import import CatalogImportService
+from seller.services.export_service import ExportService
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task(bind=True, max_retries=3, default_retry_delay=60)
+def export_task(self, dataset: str, fmt: str, filters: dict | None = None):
+    try:
+        return ExportService.export_to_file(dataset, fmt, filters or {})
+
+    except Exception as exc:
+        logger.error(f"Error in export_task: {str(exc)}")
+        raise self.retry(exc=exc)
+
+
+@shared_task(bind=True, max_retries=3, default_retry_delay=60)
+def purge_exports_task(self):
+    try:
+        removed = ExportService.purge_files()
+        # Фиды, которые не успел удалить упавший воркер
+        removed += purge_directory(
+            CatalogImportService.UPLOAD_DIR, ExportService.KEEP_FILES_HOURS
+        )
+        return f"Export files purged: {removed}"
+
+    except Exception as exc:
+        logger.error(f"Error in purge_exports_task: {str(exc)}")
+        raise self.retry(exc=exc)
+
+
+@shared_task(bind=True, max_retries=3, default_retry_delay=60)
+def import_catalog_task(self, name: str, fmt: str):
+    storage = private_storage()
+    try:
+        with storage.open(name, "rb") as file:
+            stats = CatalogImportService.import_file(file, fmt)
+
+    except ValueError as exc:
+        # Битый фид повтор не исправит
+        logger.error(f"Error in import_catalog_task: {str(exc)}")
+        storage.delete(name)
+        raise
+
+    except Exception as exc:
+        logger.error(f"Error in import_catalog_task: {str(exc)}")
+        if self.request.retries >= self.max_retries:
+            storage.delete(name)
+        raise self.retry(exc=exc)
+
+    storage.delete(name)
+    return stats
@@ -0,0 +1,50 @@
+import pytest
+from django.contrib.auth import get_user_model
+
+from config.celery import app as celery_app
+
+User = get_user_model()
+
+
+@pytest.fixture
+def seller(db):
+    return User.objects.create_user(
+        username="seller",
+        email="seller@example.com",
+        first_name="Seller",
+        last_name="Test",
+        password="TestPassword123!",
+        role=User.SELLER,
+    )
+
+
+@pytest.fixture
+def seller_client(client, seller):
+    client.force_login(seller)
+    return client
+
+
+@pytest.fixture
+def private_root(settings, tmp_path):
+    settings.PRIVATE_MEDIA_ROOT = str(tmp_path)
+    return tmp_path
+
+
+@pytest.fixture
+def customer_client(client, django_user_model):
+    customer = django_user_model.objects.create_user(
+        username="customer",
+        email="customer@example.com",
+        first_name="Customer",
+        last_name="Test",
+        password="TestPassword123!",
+    )
+    client.force_login(customer)
+    return client
+
+
+@pytest.fixture
+def eager_celery():
+    celery_app.conf.task_always_eager = True
+    yield celery_app
+    celery_app.conf.task_always_eager = False
@@ -0,0 +1,136 @@
+import pytest
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+
+from products.models import Product, Review
+
+User = get_user_model()
+
+
+@pytest.fixture
+def reviews(create_product):
+    product = create_product()
+    result = []
+    for index in range(3):
+        user = User.objects.create_user(
+            username=f"buyer{index}",
+            email=f"buyer{index}@example.com",
+            first_name="Buyer",
+            last_name="Test",
+            password="TestPassword123!",
+        )
+        result.append(
+            Review.objects.create(
+                product_id=product,
+                user_id=user.profile,
+                rating=5,
+                comment="Ок",
+                is_verified=False,
+            )
+        )
+    return result
+
+
+@pytest.mark.django_db
+class TestBulkActionViews:
+    def test_toggle_active(self, seller_client, create_product):
+        ids = [create_product().id for _ in range(3)]
+
+        response = seller_client.post(
+            reverse("product-bulk-toggle-active"), {"ids": ids, "is_active": "0"}
+        )
+
+        assert response.status_code == 200
+        assert response.json()["updated"] == 3
+        assert not Product.objects.filter(is_active=True).exists()
+
+    @pytest.mark.parametrize("data", [{}, {"is_active": ""}, {"is_active": "no"}])
+    def test_toggle_active_requires_value(self, seller_client, create_product, data):
+        product = create_product()
+
+        response = seller_client.post(
+            reverse("product-bulk-toggle-active"), {"ids": [product.id], **data}
+        )
+
+        assert response.status_code == 400
+        assert Product.objects.get(id=product.id).is_active
+
+    def test_update_stock(self, seller_client, create_product):
+        first, second = create_product(), create_product()
+
+        response = seller_client.post(
+            reverse("product-bulk-update-stock"),
+            {"ids": [first.id, second.id], "quantities": [1, 2], "action": "add"},
+        )
+
+        assert response.status_code == 200
+        assert response.json()["stock_quantity"] == {
+            str(first.id): 11,
+            str(second.id): 12,
+        }
+
+    @pytest.mark.parametrize(
+        "data",
+        [
+            {},
+            {"ids": ["x"]},
+            {"ids": [1, 2], "quantities": [1]},
+            {"ids": [1], "quantities": [-1], "action": "set"},
+        ],
+    )
+    def test_update_stock_bad_request(self, seller_client, data):
+        response = seller_client.post(reverse("product-bulk-update-stock"), data)
+
+        assert response.status_code == 400
+        assert response.json()["success"] is False
+
+    @pytest.mark.parametrize("action", [None, "", "substract", "drop"])
+    def test_update_stock_unknown_action(self, seller_client, create_product, action):
+        product = create_product()
+        data = {"ids": [product.id], "quantities": [1]}
+        if action is not None:
+            data["action"] = action
+
+        response = seller_client.post(reverse("product-bulk-update-stock"), data)
+
+        assert response.status_code == 400
+        assert "subtract" in response.json()["error"]
+        assert Product.objects.get(id=product.id).updated_at == product.updated_at
+
+    def test_update_stock_invalid_quantities(self, seller_client):
+        response = seller_client.post(
+            reverse("product-bulk-update-stock"),
+            {"ids": [1], "quantities": ["много"], "action": "add"},
+        )
+
+        assert response.status_code == 400
+        assert "id" not in response.json()["error"]
+
+    def test_verify_reviews(self, seller_client, reviews):
+        response = seller_client.post(
+            reverse("review-bulk-verify"), {"ids": [review.id for review in reviews]}
+        )
+
+        assert response.json()["verified"] == 3
+        assert not Review.objects.filter(is_verified=False).exists()
+
+    def test_too_many_ids(self, seller_client):
+        response = seller_client.post(
+            reverse("review-bulk-verify"), {"ids": list(range(1001))}
+        )
+
+        assert response.status_code == 400
+
+    def test_customer_forbidden(self, client, django_user_model):
+        customer = django_user_model.objects.create_user(
+            username="customer",
+            email="customer@example.com",
+            first_name="Customer",
+            last_name="Test",
+            password="TestPassword123!",
+        )
+        client.force_login(customer)
+
+        response = client.post(reverse("review-bulk-verify"), {"ids": [1]})
+
+        assert response.status_code == 403
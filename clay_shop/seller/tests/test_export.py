@@ -0,0 +1,245 @@
+import csv
+import io
+import os
+import time
+import zipfile
+from xml.etree import ElementTree
+
+import pytest
+from django.conf import settings
+from django.urls import reverse
+
+from core.models import DeliveryMethod, PaymentMethod
+from orders.models import Order
+from seller.seller_views import SellerExportStatusView
+from seller.services.export_service import ExportService
+from seller.tasks import export_task
+from users.models import UserAddress
+
+SHEET_NS = {"s": "http://schemas.openxmlformats.org/spreadsheetml/2006/main"}
+
+
+def read_csv(chunks) -> list[list[str]]:
+    content = b"".join(chunks).decode()
+    assert content.startswith("\ufeff")
+    return list(csv.reader(io.StringIO(content[1:])))
+
+
+def read_xlsx(content: bytes) -> list[list[str]]:
+    with zipfile.ZipFile(io.BytesIO(content)) as archive:
+        assert archive.testzip() is None
+        assert "xl/workbook.xml" in archive.namelist()
+        sheet = ElementTree.fromstring(archive.read("xl/worksheets/sheet1.xml"))
+
+    return [
+        ["".join(cell.itertext()) for cell in row.findall("s:c", SHEET_NS)]
+        for row in sheet.iterfind("s:sheetData/s:row", SHEET_NS)
+    ]
+
+
+@pytest.mark.django_db
+class TestExportService:
+    def test_products_csv(self, create_product):
+        create_product(name="Кружка", stock_quantity=5)
+        create_product(name="Тарелка", is_active=False)
+
+        rows = read_csv(ExportService.stream("products", "csv", {"status": "active"}))
+
+        assert rows[0][:3] == ["ID", "Название", "Категория"]
+        assert len(rows) == 2
+        assert rows[1][1:3] == ["Кружка", "Посуда"]
+        assert rows[1][5:7] == ["5", "да"]
+
+    def test_csv_escapes_formulas(self, create_product):
+        create_product(name="=HYPERLINK(1)")
+
+        rows = read_csv(ExportService.stream("products", "csv", {}))
+
+        assert rows[1][1] == "'=HYPERLINK(1)"
+
+    def test_header_sent_before_query(self, create_product, django_assert_num_queries):
+        create_product()
+        chunks = ExportService.stream("products", "csv", {})
+
+        with django_assert_num_queries(0):
+            header = next(chunks)
+
+        assert header.startswith("\ufeffID,".encode())
+        with django_assert_num_queries(1):
+            assert b"".join(chunks).count(b"\r\n") == 1
+
+    def test_rows_are_tuples(self, create_product):
+        product = create_product()
+
+        rows = list(ExportService.iter_rows("products", {}))
+
+        assert rows == [
+            (
+                product.id,
+                "Кружка",
+                "Посуда",
+                1500,
+                1200,
+                10,
+                True,
+                product.created_at,
+                product.updated_at,
+            )
+        ]
+
+    def test_products_xlsx(self, create_product):
+        for index in range(3):
+            create_product(name=f"Кружка <{index}>")
+
+        rows = read_xlsx(b"".join(ExportService.stream("products", "xlsx", {})))
+
+        assert rows[0][0] == "ID"
+        assert len(rows) == 4
+        assert {row[1] for row in rows[1:]} == {
+            "Кружка <0>",
+            "Кружка <1>",
+            "Кружка <2>",
+        }
+
+    def test_orders_csv(self, seller):
+        Order.objects.create(
+            user_id=seller,
+            status="confirmed",
+            total_amount=3000,
+            delivery_method_id=DeliveryMethod.objects.create(
+                name="Курьер", price=500, description="По городу", is_active=True
+            ),
+            delivery_address=UserAddress.objects.create(
+                user_id=seller, title="Дом", address="Москва"
+            ),
+            payment_method=PaymentMethod.objects.create(
+                name="Карта", code="card", description="Онлайн"
+            ),
+        )
+
+        rows = read_csv(ExportService.stream("orders", "csv", {"status": "confirmed"}))
+
+        assert len(rows) == 2
+        assert rows[1][2:8] == [
+            "seller@example.com",
+            "confirmed",
+            "pending",
+            "3000",
+            "Курьер",
+            "Карта",
+        ]
+
+        shipped = ExportService.stream("orders", "csv", {"status": "shipped"})
+        assert len(read_csv(shipped)) == 1
+
+    def test_export_to_file(self, create_product, private_root):
+        create_product()
+
+        name = ExportService.export_to_file("products", "xlsx", {})
+
+        path = private_root / ExportService.EXPORT_DIR / name
+        assert ExportService.file_path(name) == str(path)
+        assert len(read_xlsx(path.read_bytes())) == 2
+        assert not any(name.endswith(".part") for name in os.listdir(path.parent))
+
+    def test_purge_files(self, private_root):
+        directory = private_root / ExportService.EXPORT_DIR
+        directory.mkdir()
+        old_file = directory / "old.csv"
+        old_file.write_text("old")
+        stale = time.time() - 2 * 24 * 3600
+        os.utime(old_file, (stale, stale))
+        (directory / "fresh.csv").write_text("fresh")
+
+        assert ExportService.purge_files() == 1
+        assert os.listdir(directory) == ["fresh.csv"]
+
+
+@pytest.mark.django_db
+class TestExportViews:
+    def test_streams_csv(self, seller_client, create_product):
+        create_product()
+
+        response = seller_client.get(
+            reverse("export", args=["products", "csv"]), {"status": "active"}
+        )
+
+        assert response.status_code == 200
+        assert response.streaming
+        assert response["Content-Type"] == "text/csv; charset=utf-8"
+        assert 'filename="products-' in response["Content-Disposition"]
+        assert len(read_csv(response.streaming_content)) == 2
+
+    def test_unknown_dataset(self, seller_client):
+        response = seller_client.get(reverse("export", args=["users", "csv"]))
+
+        assert response.status_code == 404
+
+    def test_customer_forbidden(self, customer_client):
+        response = customer_client.get(reverse("export", args=["products", "csv"]))
+
+        assert response.status_code == 403
+
+    def test_offload_to_celery(
+        self, seller_client, create_product, private_root, eager_celery
+    ):
+        create_product()
+
+        response = seller_client.post(reverse("export", args=["reviews", "csv"]))
+
+        assert response.status_code == 202
+        data = response.json()
+        assert data["status_url"] == reverse("export-status", args=[data["task_id"]])
+        files = os.listdir(private_root / ExportService.EXPORT_DIR)
+        assert len(files) == 1 and files[0].startswith("reviews-")
+
+    def test_task_returns_link(self, create_product, private_root):
+        create_product()
+
+        name = export_task.apply(args=["products", "csv", {"status": "active"}]).get()
+
+        assert name.startswith("products-")
+        assert (private_root / ExportService.EXPORT_DIR / name).exists()
+
+
+@pytest.mark.django_db
+@pytest.mark.usefixtures("private_root")
+class TestExportDownload:
+    def test_status_links_to_download(self):
+        name = f"products-{'0' * 32}.csv"
+
+        data = SellerExportStatusView().get_ready_data(name)
+
+        assert data == {"url": reverse("export-download", args=[name])}
+        assert not data["url"].startswith(settings.MEDIA_URL)
+
+    def test_download(self, seller_client, create_product):
+        create_product()
+        name = ExportService.export_to_file("products", "csv", {})
+
+        response = seller_client.get(reverse("export-download", args=[name]))
+
+        assert response.status_code == 200
+        assert 'attachment; filename="products-' in response["Content-Disposition"]
+        assert len(read_csv(response.streaming_content)) == 2
+
+    def test_customer_forbidden(self, customer_client, create_product):
+        name = ExportService.export_to_file("products", "csv", {})
+
+        response = customer_client.get(reverse("export-download", args=[name]))
+
+        assert response.status_code == 403
+
+    @pytest.mark.parametrize(
+        "name",
+        [
+            f"products-{'0' * 32}.csv",
+            f"users-{'0' * 32}.csv",
+            f"products-{'0' * 32}.csv.part",
+            "..",
+        ],
+    )
+    def test_unknown_file(self, seller_client, name):
+        response = seller_client.get(reverse("export-download", args=[name]))
+
+        assert response.status_code == 404
@@ -0,0 +1,48 @@
+import os
+
+import pytest
+from django.core.files.base import ContentFile
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.urls import reverse
+
+from core.private_files import private_storage
+from products.models import Product
+from products.services.catalog_import import CatalogImportService
+from seller.tasks import import_catalog_task
+
+
+@pytest.mark.django_db
+class TestCatalogImportViews:
+    def test_upload_feed(self, seller_client, category, private_root, eager_celery):
+        feed = SimpleUploadedFile(
+            "feed.csv", b"sku,name,base_price,category\nA-1,\xd0\x9a,100,posuda\n"
+        )
+
+        response = seller_client.post(reverse("product-import"), {"feed": feed})
+
+        assert response.status_code == 202
+        data = response.json()
+        assert data["status_url"] == reverse(
+            "product-import-status", args=[data["task_id"]]
+        )
+        assert Product.objects.get(sku="A-1").name == "К"
+        assert os.listdir(private_root / CatalogImportService.UPLOAD_DIR) == []
+
+    def test_upload_without_file(self, seller_client):
+        response = seller_client.post(reverse("product-import"))
+
+        assert response.status_code == 400
+
+
+@pytest.mark.django_db
+class TestImportTask:
+    def test_broken_feed_removed(self, category, private_root):
+        name = private_storage().save(
+            f"{CatalogImportService.UPLOAD_DIR}/feed.json", ContentFile(b'[{"sku"')
+        )
+
+        result = import_catalog_task.apply(args=[name, "json"])
+
+        assert isinstance(result.result, ValueError)
+        assert os.listdir(private_root / CatalogImportService.UPLOAD_DIR) == []
+
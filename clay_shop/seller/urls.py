@@ -8,13 +8,21 @@ from seller.seller_views import (
     SellerProductUpdateView,
     SellerProductToggleActiveView,
     SellerProductStockUpdateView,
+    SellerProductBulkActiveView,
+    SellerProductBulkStockView,
     SellerReviewListView,
+    SellerReviewBulkVerifyView,
     SellerReviewVerifyView,
     SellerServiceListView,
     SellerServiceCreateView,
     SellerServiceUpdateView,
     SellerServiceToggleActiveView,
     SellerAnalyticsView,
+    SellerExportView,
+    SellerExportStatusView,
+    SellerExportDownloadView,
+    SellerProductImportView,
+    SellerImportStatusView,
 )
 
 urlpatterns = [
@@ -39,6 +47,22 @@ urlpatterns = [
         SellerProductStockUpdateView.as_view(),
         name="product-update-stock",
     ),
+    path(
+        "products/bulk/toggle-active/",
+        SellerProductBulkActiveView.as_view(),
+        name="product-bulk-toggle-active",
+    ),
+    path(
+        "products/bulk/update-stock/",
+        SellerProductBulkStockView.as_view(),
+        name="product-bulk-update-stock",
+    ),
+    path("products/import/", SellerProductImportView.as_view(), name="product-import"),
+    path(
+        "products/import/<str:task_id>/",
+        SellerImportStatusView.as_view(),
+        name="product-import-status",
+    ),
     # Управление отзывами
     path("reviews/", SellerReviewListView.as_view(), name="review-list"),
     path(
@@ -46,6 +70,11 @@ urlpatterns = [
         SellerReviewVerifyView.as_view(),
         name="review-verify",
     ),
+    path(
+        "reviews/bulk/verify/",
+        SellerReviewBulkVerifyView.as_view(),
+        name="review-bulk-verify",
+    ),
     # Управление услугами
     path("services", SellerServiceListView.as_view(), name="service-list"),
     path("services/create", SellerServiceCreateView.as_view(), name="service-create"),
@@ -61,4 +90,20 @@ urlpatterns = [
     ),
     # Аналитика
     path("analytics/", SellerAnalyticsView.as_view(), name="analytics"),
+    # Выгрузки
+    path(
+        "export/<slug:dataset>.<slug:fmt>",
+        SellerExportView.as_view(),
+        name="export",
+    ),
+    path(
+        "export/status/<str:task_id>/",
+        SellerExportStatusView.as_view(),
+        name="export-status",
+    ),
+    path(
+        "export/download/<str:name>",
+        SellerExportDownloadView.as_view(),
+        name="export-download",
+    ),
 ]
@@ -1,9 +1,10 @@
 from django.contrib import admin
 
-from .models import User, UserAddress, UserProfile
+from .models import EmailOutbox, User, UserAddress, UserProfile
 
 # Register your models here.
 
 admin.site.register(User)
 admin.site.register(UserProfile)
 admin.site.register(UserAddress)
+admin.site.register(EmailOutbox)
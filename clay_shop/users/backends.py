@@ -0,0 +1,24 @@
+from django.contrib.auth.backends import ModelBackend
+
+from users.services.permission_cache import PermissionCache
+
+
+class CachedModelBackend(ModelBackend):
+    """ModelBackend, который берет права из PermissionCache вместо auth_* таблиц."""
+
+    def _cached_permissions(self, user_obj, obj, loader) -> set[str]:
+        if not user_obj.is_active or user_obj.is_anonymous or obj is not None:
+            return set()
+        if user_obj.is_superuser:
+            return set(PermissionCache.all_permissions())
+        return set(loader(user_obj))
+
+    def get_user_permissions(self, user_obj, obj=None):
+        return self._cached_permissions(
+            user_obj, obj, PermissionCache.user_permissions
+        )
+
+    def get_group_permissions(self, user_obj, obj=None):
+        return self._cached_permissions(
+            user_obj, obj, PermissionCache.user_group_permissions
+        )
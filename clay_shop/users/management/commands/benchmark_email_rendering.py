@@ -0,0 +1,59 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.template.loader import render_to_string
+from django.utils.html import strip_tags
+
+from users.services.email_renderer import EmailRenderer
+
+SAMPLES = {
+    "welcome": {"user_name": "Анна"},
+    "verification": {
+        "user_name": "Анна",
+        "verification_link": "https://example.com/verify/MQ/token/",
+    },
+    "password_reset": {
+        "user_name": "Анна",
+        "reset_link": "https://example.com/reset/MQ/token/",
+    },
+}
+
+
+class Command(BaseCommand):
+    help = "Сравнивает скорость рендера писем до и после EmailRenderer"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--count",
+            type=int,
+            default=1000,
+            help="Количество писем каждого вида",
+        )
+
+    def handle(self, *args, **options):
+        count = options["count"]
+        base_context = {"site_name": settings.SITE_NAME, "site_url": settings.SITE_URL}
+
+        def legacy(name, context):
+            html_content = render_to_string(
+                f"email/{name}.html", {**base_context, **context}
+            )
+            return html_content, strip_tags(html_content)
+
+        EmailRenderer.warm_up(SAMPLES)
+        for label, render in (
+            ("render_to_string + strip_tags", legacy),
+            ("EmailRenderer", EmailRenderer.render),
+        ):
+            started_at = time.perf_counter()
+            for _ in range(count):
+                for name, context in SAMPLES.items():
+                    render(name, context)
+            elapsed = time.perf_counter() - started_at
+            per_message = elapsed / (count * len(SAMPLES)) * 1_000_000
+            self.stdout.write(
+                f"{label}: {elapsed:.3f} с, {per_message:.1f} мкс на письмо"
+            )
+
+        self.stdout.write(self.style.SUCCESS("Замер завершен"))
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.5 on 2026-10-18 13:38
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth', '0012_alter_user_first_name_max_length'),
+        ('users', '0004_alter_user_options_rename_update_at_user_updated_at_and_more'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='user',
+            index=models.Index(fields=['created_at', 'id'], name='user_created_id_idx'),
+        ),
+    ]
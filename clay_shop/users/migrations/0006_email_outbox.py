@@ -0,0 +1,37 @@
+# Generated by Django 5.2.5 on 2026-10-18 14:13
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0005_keyset_pagination_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EmailOutbox',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(max_length=31)),
+                ('recipient', models.EmailField(max_length=254)),
+                ('context', models.JSONField(default=dict)),
+                ('dedupe_key', models.CharField(blank=True, max_length=127, null=True)),
+                ('status', models.CharField(choices=[('pending', 'Ожидает отправки'), ('sent', 'Отправлено'), ('failed', 'Ошибка')], default='pending', max_length=15)),
+                ('attempts', models.PositiveSmallIntegerField(default=0)),
+                ('last_error', models.TextField(blank=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('sent_at', models.DateTimeField(blank=True, null=True)),
+                ('user', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='outbox_emails', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Письмо в очереди',
+                'verbose_name_plural': 'Очередь писем',
+                'indexes': [models.Index(condition=models.Q(('status', 'pending')), fields=['id'], name='email_outbox_pending_idx'), models.Index(fields=['status', 'created_at'], name='email_outbox_status_idx')],
+                'constraints': [models.UniqueConstraint(condition=models.Q(('status', 'pending')), fields=('dedupe_key',), name='email_outbox_pending_dedupe_uniq')],
+            },
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.5 on 2026-10-18 15:05
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0006_email_outbox'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='emailoutbox',
+            name='next_attempt_at',
+            field=models.DateTimeField(default=django.utils.timezone.now),
+        ),
+    ]
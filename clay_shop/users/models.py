@@ -1,6 +1,7 @@
 from core.models import DeliveryMethod
 from django.contrib.auth.models import AbstractUser
 from django.db import models
+from django.utils import timezone
 
 
 # Create your models here.
@@ -35,6 +36,9 @@ class User(AbstractUser):
         ]
         verbose_name = "Пользователь"
         verbose_name_plural = "Пользователи"
+        indexes = [
+            models.Index(fields=["created_at", "id"], name="user_created_id_idx"),
+        ]
 
     def __str__(self):
         return f"{self.first_name} {self.last_name} - ({self.email})"
@@ -88,3 +92,59 @@ class UserProfile(models.Model):
 
     def __str__(self):
         return f"Профиль {self.user.email}"
+
+
+class EmailOutbox(models.Model):
+    PENDING = "pending"
+    SENT = "sent"
+    FAILED = "failed"
+
+    STATUS_CHOICES = [
+        (PENDING, "Ожидает отправки"),
+        (SENT, "Отправлено"),
+        (FAILED, "Ошибка"),
+    ]
+
+    user = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name="outbox_emails",
+    )
+    kind = models.CharField(max_length=31)
+    recipient = models.EmailField()
+    context = models.JSONField(default=dict)
+    dedupe_key = models.CharField(max_length=127, null=True, blank=True)
+    status = models.CharField(max_length=15, choices=STATUS_CHOICES, default=PENDING)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    # Раньше этого момента письмо не берется: пауза после сбоя или занято воркером
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        verbose_name = "Письмо в очереди"
+        verbose_name_plural = "Очередь писем"
+        constraints = [
+            # Повторный запрос того же письма обновляет ожидающую запись
+            models.UniqueConstraint(
+                fields=["dedupe_key"],
+                condition=models.Q(status="pending"),
+                name="email_outbox_pending_dedupe_uniq",
+            ),
+        ]
+        indexes = [
+            models.Index(
+                fields=["id"],
+                condition=models.Q(status="pending"),
+                name="email_outbox_pending_idx",
+            ),
+            models.Index(
+                fields=["status", "created_at"], name="email_outbox_status_idx"
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.kind} -> {self.recipient} ({self.status})"
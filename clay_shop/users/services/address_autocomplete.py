@@ -1,80 +1,134 @@
 import hashlib
 import logging
+import time
 
 import httpx
 from django.conf import settings
 from django.core.cache import cache
 
+from users.services.dadata_client import DaDataClient
+
 logger = logging.getLogger(__name__)
 
 
 class AddressAutocompleteService:
-    API_URL = "https://suggestions.dadata.ru/suggestions/api/4_1/rs/suggest/address"
     CACHE_TIMEOUT = 3600
+    EMPTY_CACHE_TIMEOUT = 300
     CACHE_PREFIX = "address_suggest"
+    # DaData отдает не больше 20 подсказок; берем максимум и режем под count
+    FETCH_COUNT = 20
+    # Один запрос в DaData на ключ: остальные ждут результат в кэше
+    LOCK_TIMEOUT = 10
+    WAIT_TIMEOUT = 5.0
+    WAIT_INTERVAL = 0.025
+
+    @staticmethod
+    def _normalize(query: str) -> str:
+        return " ".join(query.split())
 
     @staticmethod
-    def _get_cache_key(query: str, count: int) -> str:
-        key_data = f"{query}:{count}"
-        key_hash = hashlib.md5(key_data.encode()).hexdigest()
+    def _get_cache_key(query: str) -> str:
+        # Регистр не влияет на ответ DaData, поэтому ключ общий для вариантов ввода
+        key_hash = hashlib.md5(query.lower().encode()).hexdigest()
         return f"{AddressAutocompleteService.CACHE_PREFIX}:{key_hash}"
 
+    @staticmethod
+    def _get_lock_key(cache_key: str) -> str:
+        return f"{cache_key}:lock"
+
+    @staticmethod
+    def _cache_timeout(suggestions: list[dict]) -> int:
+        if suggestions:
+            return AddressAutocompleteService.CACHE_TIMEOUT
+        return AddressAutocompleteService.EMPTY_CACHE_TIMEOUT
+
+    @staticmethod
+    def _can_request() -> bool:
+        if not getattr(settings, "DADATA_API_KEY", None):
+            logger.warning("DADATA_API_KEY не установлен в settings")
+            return False
+        return True
+
+    @staticmethod
+    def _payload(query: str) -> dict:
+        return {
+            "query": query,
+            "count": AddressAutocompleteService.FETCH_COUNT,
+            "language": "ru",
+        }
+
+    @staticmethod
+    def _parse_response(response: httpx.Response) -> list[dict] | None:
+        if response.status_code != 200:
+            logger.error(f"DaData API error: {response.status_code}")
+            return None
+        return AddressAutocompleteService._format_suggestions(
+            response.json().get("suggestions", [])
+        )
+
+    @staticmethod
+    def _fetch(query: str) -> list[dict] | None:
+        try:
+            response = DaDataClient.get_client().post(
+                DaDataClient.suggest_url(),
+                headers=DaDataClient.headers(),
+                json=AddressAutocompleteService._payload(query),
+            )
+            return AddressAutocompleteService._parse_response(response)
+        except httpx.TimeoutException:
+            logger.error("DaData API timeout")
+        except Exception as e:
+            logger.error(f"Error calling DaData API: {str(e)}")
+        return None
+
     @staticmethod
     def get_suggestions(query: str, count: int = 10) -> list[dict]:
-        if not query or len(query) < 3:
+        query = AddressAutocompleteService._normalize(query)
+        if len(query) < 3:
             return []
 
-        cache_key = AddressAutocompleteService._get_cache_key(query, count)
+        cache_key = AddressAutocompleteService._get_cache_key(query)
         cached_result = cache.get(cache_key)
 
-        if cached_result:
+        if cached_result is not None:
             logger.info(f"Cache HIT for query: {query}")
-            return cached_result
+            return cached_result[:count]
 
         logger.info(f"Cache MISS for query: {query}")
-
-        api_key = getattr(settings, "DADATA_API_KEY", None)
-        if not api_key:
-            logger.warning("DADATA_API_KEY не установлен в settings")
+        if not AddressAutocompleteService._can_request():
             return []
 
+        lock_key = AddressAutocompleteService._get_lock_key(cache_key)
+        if not cache.add(lock_key, 1, AddressAutocompleteService.LOCK_TIMEOUT):
+            return AddressAutocompleteService._wait_for_result(
+                cache_key, lock_key, count
+            )
+
         try:
-            with httpx.Client(timeout=5.0) as client:
-                response = client.post(
-                    AddressAutocompleteService.API_URL,
-                    headers={
-                        "Content-Type": "application/json",
-                        "Accept": "application/json",
-                        "Authorization": f"Token {api_key}",
-                    },
-                    json={
-                        "query": query,
-                        "count": count,
-                        "language": "ru"
-                    }
-                )
-            if response.status_code == 200:
-                data = response.json()
-                suggestions = AddressAutocompleteService._format_suggestions(
-                    data.get("suggestions", [])
-                )
-
-                cache.set(
-                    cache_key,
-                    suggestions,
-                    AddressAutocompleteService.CACHE_TIMEOUT
-                )
-
-                return suggestions
-            else:
-                logger.error(f"DaData API error: {response.status_code}")
+            suggestions = AddressAutocompleteService._fetch(query)
+            if suggestions is None:
                 return []
-        except httpx.TimeoutException:
-            logger.error("DaData API timeout")
-            return []
-        except Exception as e:
-            logger.error(f"Error calling DaData API: {str(e)}")
-            return []
+            cache.set(
+                cache_key,
+                suggestions,
+                AddressAutocompleteService._cache_timeout(suggestions),
+            )
+            return suggestions[:count]
+        finally:
+            cache.delete(lock_key)
+
+    @staticmethod
+    def _wait_for_result(cache_key: str, lock_key: str, count: int) -> list[dict]:
+        deadline = time.monotonic() + AddressAutocompleteService.WAIT_TIMEOUT
+        while time.monotonic() < deadline:
+            time.sleep(AddressAutocompleteService.WAIT_INTERVAL)
+            cached_result = cache.get(cache_key)
+            if cached_result is not None:
+                return cached_result[:count]
+            # Лок снят без результата: ведущий запрос завершился ошибкой
+            if cache.get(lock_key) is None:
+                break
+        return (cache.get(cache_key) or [])[:count]
 
     @staticmethod
     def _format_suggestions(suggestions: list[dict]) -> list[dict]:
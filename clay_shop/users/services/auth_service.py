@@ -2,6 +2,7 @@ from django.contrib.auth.models import Group, Permission
 from django.contrib.contenttypes.models import ContentType
 import logging
 from users.models import User
+from users.services.permission_cache import PermissionCache
 
 
 logger = logging.getLogger(__name__)
@@ -10,13 +11,20 @@ logger = logging.getLogger(__name__)
 class AuthService:
     @staticmethod
     def assign_role_group(user: User) -> None:
-        user.groups.filter(name__in=[User.CUSTOMER, User.SELLER, User.ADMIN]).clear()
-
-        try:
-            group = Group.objects.get(name=user.role)  # type: ignore
-            user.groups.add(group)
-        except Group.DoesNotExist:  # type: ignore
+        group_ids = PermissionCache.role_group_ids()
+        role_group_ids = [
+            group_ids[role]
+            for role in (User.CUSTOMER, User.SELLER, User.ADMIN)
+            if role in group_ids
+        ]
+        if role_group_ids:
+            user.groups.remove(*role_group_ids)
+
+        group_id = group_ids.get(user.role)
+        if group_id is None:
             logger.error(f"Группа {user.role} не найдена для пользователя {user.email}")
+            return
+        user.groups.add(group_id)
 
     @staticmethod
     def setup_default_groups():
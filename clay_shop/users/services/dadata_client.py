@@ -0,0 +1,55 @@
+import os
+import threading
+
+import httpx
+from django.conf import settings
+
+
+class DaDataClient:
+    """Общий на процесс httpx-клиент: keep-alive и HTTP/2 вместо рукопожатия."""
+
+    TIMEOUT = httpx.Timeout(5.0, connect=2.0)
+    LIMITS = httpx.Limits(
+        max_connections=20, max_keepalive_connections=10, keepalive_expiry=60
+    )
+    # Пакет h2 ставится зависимостью httpx[http2]
+    HTTP2 = True
+
+    _lock = threading.Lock()
+    _client: httpx.Client | None = None
+    _client_pid: int | None = None
+
+    @staticmethod
+    def suggest_url() -> str:
+        return settings.DADATA_SUGGEST_URL
+
+    @staticmethod
+    def headers() -> dict[str, str]:
+        return {
+            "Content-Type": "application/json",
+            "Accept": "application/json",
+            "Authorization": f"Token {settings.DADATA_API_KEY}",
+        }
+
+    @staticmethod
+    def get_client() -> httpx.Client:
+        # После fork (gunicorn, celery) сокеты родителя использовать нельзя
+        pid = os.getpid()
+        if DaDataClient._client is None or DaDataClient._client_pid != pid:
+            with DaDataClient._lock:
+                if DaDataClient._client is None or DaDataClient._client_pid != pid:
+                    DaDataClient._client = httpx.Client(
+                        timeout=DaDataClient.TIMEOUT,
+                        limits=DaDataClient.LIMITS,
+                        http2=DaDataClient.HTTP2,
+                    )
+                    DaDataClient._client_pid = pid
+        return DaDataClient._client
+
+    @staticmethod
+    def close() -> None:
+        with DaDataClient._lock:
+            if DaDataClient._client is not None:
+                DaDataClient._client.close()
+            DaDataClient._client = None
+            DaDataClient._client_pid = None
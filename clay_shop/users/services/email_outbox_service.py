@@ -0,0 +1,210 @@
+import logging
+from collections import defaultdict
+from datetime import datetime, timedelta
+
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+
+from users.models import EmailOutbox, User
+from users.services.email_service import EmailService
+from users.services.email_verification_service import EmailVerificationService
+
+logger = logging.getLogger(__name__)
+
+
+class EmailOutboxService:
+    """Письма пишутся в таблицу в транзакции вызывающего кода и уходят пачками."""
+
+    BATCH_SIZE = 100
+    MAX_ATTEMPTS = 8
+    KEEP_SENT_DAYS = 7
+    # Пауза между попытками удваивается: 1, 2, 4... минут, но не больше часа
+    RETRY_BASE_DELAY = timedelta(minutes=1)
+    RETRY_MAX_DELAY = timedelta(hours=1)
+    # Столько взятое письмо закреплено за воркером; после его падения
+    # письмо подберет следующий запуск
+    CLAIM_TIMEOUT = timedelta(minutes=10)
+
+    @staticmethod
+    @transaction.atomic
+    def enqueue(
+        kind: str,
+        recipient: str,
+        context: dict,
+        user: User | None = None,
+        dedupe_key: str | None = None,
+    ) -> EmailOutbox:
+        if dedupe_key:
+            # Повторный запрос заменяет еще не отправленное письмо
+            existing = (
+                EmailOutbox.objects.select_for_update()
+                .filter(dedupe_key=dedupe_key, status=EmailOutbox.PENDING)
+                .first()
+            )
+            if existing is not None:
+                # Новый срок снимает письмо с воркера, который отправляет
+                # старую версию: ее результат не перезапишет эту
+                existing.recipient = recipient
+                existing.context = context
+                existing.attempts = 0
+                existing.next_attempt_at = timezone.now()
+                existing.save(
+                    update_fields=[
+                        "recipient",
+                        "context",
+                        "attempts",
+                        "next_attempt_at",
+                    ]
+                )
+                return existing
+
+        try:
+            with transaction.atomic():
+                return EmailOutbox.objects.create(
+                    user=user,
+                    kind=kind,
+                    recipient=recipient,
+                    context=context,
+                    dedupe_key=dedupe_key,
+                )
+        except IntegrityError:
+            # Параллельный запрос успел создать запись с тем же ключом
+            if not dedupe_key:
+                raise
+            return EmailOutboxService.enqueue(
+                kind, recipient, context, user, dedupe_key
+            )
+
+    @staticmethod
+    def enqueue_verification(user: User) -> EmailOutbox:
+        return EmailOutboxService.enqueue(
+            "verification",
+            user.email,
+            {
+                "user_name": user.first_name,
+                "verification_link": (
+                    EmailVerificationService.generate_verification_link(user)
+                ),
+            },
+            user=user,
+            dedupe_key=f"verification:{user.pk}",
+        )
+
+    @staticmethod
+    def pending_count() -> int:
+        return EmailOutbox.objects.filter(status=EmailOutbox.PENDING).count()
+
+    @staticmethod
+    def retry_delay(attempts: int) -> timedelta:
+        return min(
+            EmailOutboxService.RETRY_BASE_DELAY * 2 ** (attempts - 1),
+            EmailOutboxService.RETRY_MAX_DELAY,
+        )
+
+    @staticmethod
+    @transaction.atomic
+    def claim_batch(batch_size: int | None = None) -> tuple[list, datetime]:
+        """Берет пачку писем, которым пора уходить, и закрепляет их за воркером."""
+        now = timezone.now()
+        # skip_locked позволяет нескольким воркерам разбирать очередь параллельно,
+        # блокировки держатся только до коммита этой короткой транзакции
+        entries = list(
+            EmailOutbox.objects.select_for_update(skip_locked=True)
+            .filter(status=EmailOutbox.PENDING, next_attempt_at__lte=now)
+            .order_by("id")[: batch_size or EmailOutboxService.BATCH_SIZE]
+        )
+        lease = now + EmailOutboxService.CLAIM_TIMEOUT
+        for entry in entries:
+            entry.attempts += 1
+            entry.next_attempt_at = lease
+        EmailOutbox.objects.bulk_update(entries, ["attempts", "next_attempt_at"])
+        return entries, lease
+
+    @staticmethod
+    def _schedule_retry(entries: list, lease: datetime, error: str) -> None:
+        now = timezone.now()
+        by_attempts = defaultdict(list)
+        for entry in entries:
+            by_attempts[entry.attempts].append(entry.id)
+
+        for attempts, entry_ids in by_attempts.items():
+            claimed = EmailOutbox.objects.filter(
+                id__in=entry_ids, next_attempt_at=lease
+            )
+            if attempts >= EmailOutboxService.MAX_ATTEMPTS:
+                claimed.update(status=EmailOutbox.FAILED, last_error=error)
+            else:
+                claimed.update(
+                    last_error=error,
+                    next_attempt_at=now + EmailOutboxService.retry_delay(attempts),
+                )
+
+    @staticmethod
+    def dispatch_batch(batch_size: int | None = None) -> int:
+        """Отправляет одну пачку, возвращает число обработанных записей."""
+        entries, lease = EmailOutboxService.claim_batch(batch_size)
+        if not entries:
+            return 0
+
+        # Результат пишется только в записи, которые все еще закреплены за нами
+        claimed = EmailOutbox.objects.filter(next_attempt_at=lease)
+        to_send, messages = [], []
+        for entry in entries:
+            try:
+                messages.append(
+                    EmailService.build(
+                        entry.kind, user_email=entry.recipient, **entry.context
+                    )
+                )
+                to_send.append(entry)
+            except Exception as e:
+                logger.error(f"Error building outbox email {entry.id}: {str(e)}")
+                claimed.filter(id=entry.id).update(
+                    status=EmailOutbox.FAILED, last_error=str(e)
+                )
+
+        # SMTP вне транзакции: строки очереди на время отправки не заблокированы
+        errors = EmailService.send_bulk(messages)
+
+        # Каждая запись получает свой результат: отправленные не уйдут повторно,
+        # на повтор встают только письма с ошибкой
+        sent, failed = [], defaultdict(list)
+        for entry, error in zip(to_send, errors):
+            if error is None:
+                sent.append(entry.id)
+            else:
+                failed[str(error)].append(entry)
+
+        claimed.filter(id__in=sent).update(
+            status=EmailOutbox.SENT, sent_at=timezone.now()
+        )
+        for error, failed_entries in failed.items():
+            logger.error(f"Error sending outbox emails: {error}")
+            EmailOutboxService._schedule_retry(failed_entries, lease, error)
+
+        connection_error = next(
+            (error for error in errors if EmailService.is_connection_error(error)),
+            None,
+        )
+        if connection_error is not None:
+            # SMTP недоступен: остальную очередь не трогаем до повтора задачи
+            raise connection_error
+
+        logger.info(f"Outbox emails processed: {len(entries)}")
+        return len(entries)
+
+    @staticmethod
+    def dispatch() -> int:
+        total = 0
+        while processed := EmailOutboxService.dispatch_batch():
+            total += processed
+        return total
+
+    @staticmethod
+    def purge_sent() -> int:
+        deleted, _ = EmailOutbox.objects.filter(
+            status=EmailOutbox.SENT,
+            sent_at__lt=timezone.now()
+            - timedelta(days=EmailOutboxService.KEEP_SENT_DAYS),
+        ).delete()
+        return deleted
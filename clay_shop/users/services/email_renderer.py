@@ -0,0 +1,55 @@
+import threading
+
+from django.conf import settings
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+from django.template.loader import get_template
+
+
+class EmailRenderer:
+    """Шаблоны писем компилируются один раз на процесс, текст рендерится отдельно."""
+
+    _lock = threading.Lock()
+    _templates = {}
+
+    @staticmethod
+    def get(name: str, extension: str):
+        key = (name, extension)
+        template = EmailRenderer._templates.get(key)
+        if template is None:
+            with EmailRenderer._lock:
+                template = EmailRenderer._templates.get(key)
+                if template is None:
+                    template = get_template(f"email/{name}.{extension}")
+                    EmailRenderer._templates[key] = template
+        return template
+
+    @staticmethod
+    def render(name: str, context: dict) -> tuple[str, str]:
+        """Возвращает (html, text) письма."""
+        context = {
+            "site_name": settings.SITE_NAME,
+            "site_url": settings.SITE_URL,
+            **context,
+        }
+        return (
+            EmailRenderer.get(name, "html").render(context),
+            EmailRenderer.get(name, "txt").render(context).strip() + "\n",
+        )
+
+    @staticmethod
+    def warm_up(names) -> None:
+        for name in names:
+            EmailRenderer.get(name, "html")
+            EmailRenderer.get(name, "txt")
+
+    @staticmethod
+    def clear() -> None:
+        with EmailRenderer._lock:
+            EmailRenderer._templates.clear()
+
+
+@receiver(setting_changed)
+def clear_email_templates(sender, setting, **kwargs):
+    if setting in ("TEMPLATES", "SITE_NAME", "SITE_URL"):
+        EmailRenderer.clear()
@@ -1,34 +1,169 @@
 import logging
+import threading
+import time
+from smtplib import (
+    SMTPDataError,
+    SMTPRecipientsRefused,
+    SMTPSenderRefused,
+    SMTPServerDisconnected,
+)
 
 from django.conf import settings
-from django.core.mail import EmailMultiAlternatives
-from django.template.loader import render_to_string
-from django.utils.html import strip_tags
+from django.core.mail import EmailMultiAlternatives, get_connection
+
+from users.services.email_renderer import EmailRenderer
 
 logger = logging.getLogger(__name__)
 
+_local = threading.local()
+
 
 class EmailService:
+    # SMTP-сервер сам рвет простаивающие соединения, раньше закрываем сами
+    CONNECTION_MAX_IDLE = 60
+    # Отказ по конкретному письму: соединение живо, остальные письма уходят.
+    # ValueError бросает sanitize_address на некорректном адресе
+    MESSAGE_ERRORS = (
+        SMTPRecipientsRefused,
+        SMTPSenderRefused,
+        SMTPDataError,
+        ValueError,
+    )
+
     @staticmethod
-    def send_welcome_email(user_email: str, user_name: str) -> bool:
+    def get_connection():
+        connection = getattr(_local, "connection", None)
+        now = time.monotonic()
+        if (
+            connection is not None
+            and now - _local.used_at > EmailService.CONNECTION_MAX_IDLE
+        ):
+            EmailService.close_connection()
+            connection = None
+
+        if connection is None:
+            connection = get_connection(fail_silently=False)
+            connection.open()
+            _local.connection = connection
+
+        _local.used_at = now
+        return connection
+
+    @staticmethod
+    def close_connection() -> None:
+        connection = getattr(_local, "connection", None)
+        _local.connection = None
+        if connection is not None:
+            try:
+                connection.close()
+            except Exception as e:
+                logger.warning(f"Error closing SMTP connection: {str(e)}")
+
+    @staticmethod
+    def _send_one(message: EmailMultiAlternatives) -> None:
         try:
-            subject = "Добро пожаловать"
+            EmailService.get_connection().send_messages([message])
+            return
+        except SMTPServerDisconnected:
+            # Сервер закрыл соединение, переподключаемся один раз
+            # и повторяем только это письмо
+            EmailService.close_connection()
+        except EmailService.MESSAGE_ERRORS:
+            raise
+        except Exception:
+            EmailService.close_connection()
+            raise
 
-            html_content = render_to_string(
-                "email/welcome.html",
-                {"user_name": user_name, "site_url": settings.SITE_URL},
-            )
+        try:
+            EmailService.get_connection().send_messages([message])
+        except EmailService.MESSAGE_ERRORS:
+            raise
+        except Exception:
+            EmailService.close_connection()
+            raise
 
-            text_content = strip_tags(html_content)
+    @staticmethod
+    def send_bulk(messages: list[EmailMultiAlternatives]) -> list[Exception | None]:
+        """Отправляет письма по одному через SMTP-соединение воркера.
+
+        Возвращает результат по каждому письму: None, если оно отправлено, иначе
+        ошибку. Если соединение восстановить не удалось, эту ошибку получают
+        все еще не отправленные письма.
+        """
+        messages = list(messages)
+        results = []
+        for index, message in enumerate(messages):
+            try:
+                EmailService._send_one(message)
+            except EmailService.MESSAGE_ERRORS as e:
+                results.append(e)
+            except Exception as e:
+                results.extend([e] * (len(messages) - index))
+                break
+            else:
+                results.append(None)
+        return results
 
-            email = EmailMultiAlternatives(
-                subject=subject,
-                body=text_content,
-                from_email=settings.DEFAULT_FROM_EMAIL,
-                to=[user_email],
-            )
-            email.attach_alternative(html_content, "text/html")
-            email.send()
+    @staticmethod
+    def is_connection_error(error: Exception | None) -> bool:
+        return error is not None and not isinstance(error, EmailService.MESSAGE_ERRORS)
+
+    @staticmethod
+    def send(message: EmailMultiAlternatives) -> None:
+        error = EmailService.send_bulk([message])[0]
+        if error is not None:
+            raise error
+
+    @staticmethod
+    def _build(
+        subject: str, user_email: str, name: str, context: dict
+    ) -> EmailMultiAlternatives:
+        html_content, text_content = EmailRenderer.render(name, context)
+        email = EmailMultiAlternatives(
+            subject=subject,
+            body=text_content,
+            from_email=settings.DEFAULT_FROM_EMAIL,
+            to=[user_email],
+        )
+        email.attach_alternative(html_content, "text/html")
+        return email
+
+    @staticmethod
+    def build_welcome_email(user_email: str, user_name: str) -> EmailMultiAlternatives:
+        return EmailService._build(
+            "Добро пожаловать", user_email, "welcome", {"user_name": user_name}
+        )
+
+    @staticmethod
+    def build_verification_email(
+        user_email: str, user_name: str, verification_link: str
+    ) -> EmailMultiAlternatives:
+        return EmailService._build(
+            "Подтвердите ваш email",
+            user_email,
+            "verification",
+            {"user_name": user_name, "verification_link": verification_link},
+        )
+
+    @staticmethod
+    def build_password_reset_email(
+        user_email: str, user_name: str, reset_link: str
+    ) -> EmailMultiAlternatives:
+        return EmailService._build(
+            "Восстановление пароля",
+            user_email,
+            "password_reset",
+            {"user_name": user_name, "reset_link": reset_link},
+        )
+
+    @staticmethod
+    def build(kind: str, **context) -> EmailMultiAlternatives:
+        return getattr(EmailService, f"build_{kind}_email")(**context)
+
+    @staticmethod
+    def send_welcome_email(user_email: str, user_name: str) -> bool:
+        try:
+            EmailService.send(EmailService.build_welcome_email(user_email, user_name))
 
             logger.info(f"Welcome email sent to {user_email}")
             return True
@@ -41,36 +176,11 @@ class EmailService:
         user_email: str, user_name: str, verification_link: str
     ) -> bool:
         try:
-            subject = "Подтвердите ваш email"
-
-            html_content = render_to_string(
-                "email/verification.html",
-                {
-                    "user_name": user_name,
-                    "verification_link": verification_link,
-                },
-            )
-
-            text_content = f"""
-                Здравствуйте, {user_name}!
-
-                Спасибо за регистрацию в {settings.SITE_NAME}.
-
-                Подтвердите ваш email, перейдя по ссылке:
-                {verification_link}
-
-                С уважением,
-                Команда {settings.SITE_NAME}
-                """
-
-            email = EmailMultiAlternatives(
-                subject=subject,
-                body=text_content,
-                from_email=settings.DEFAULT_FROM_EMAIL,
-                to=[user_email],
+            EmailService.send(
+                EmailService.build_verification_email(
+                    user_email, user_name, verification_link
+                )
             )
-            email.attach_alternative(html_content, "text/html")
-            email.send()
 
             logger.info(f"Verification email sent to {user_email}")
             return True
@@ -84,27 +194,11 @@ class EmailService:
         user_email: str, user_name: str, reset_link: str
     ) -> bool:
         try:
-            subject = "Восстановление пароля"
-
-            html_content = render_to_string(
-                "email/password_reset.html",
-                {
-                    "user_name": user_name,
-                    "reset_link": reset_link,
-                    "site_url": settings.SITE_URL,
-                },
-            )
-
-            text_content = strip_tags(html_content)
-
-            email = EmailMultiAlternatives(
-                subject=subject,
-                body=text_content,
-                from_email=settings.DEFAULT_FROM_EMAIL,
-                to=[user_email],
+            EmailService.send(
+                EmailService.build_password_reset_email(
+                    user_email, user_name, reset_link
+                )
             )
-            email.attach_alternative(html_content, "text/html")
-            email.send()
 
             logger.info(f"Password reset email sent to {user_email}")
             return True
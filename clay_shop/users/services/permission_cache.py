@@ -0,0 +1,123 @@
+import time
+from collections import defaultdict
+
+from django.contrib.auth.models import Group, Permission
+from django.core.cache import cache
+from django.db import transaction
+
+from core.reference_cache import reference_cache
+
+
+class PermissionCache:
+    """Группы и права ролей в справочном кэше, наборы прав пользователей в Redis."""
+
+    ROLE_GROUPS_CACHE = "auth:role_groups"
+    GROUP_PERMISSIONS_CACHE = "auth:group_permissions"
+    ALL_PERMISSIONS_CACHE = "auth:all_permissions"
+    USER_VERSION_KEY = "auth:user_permissions:version"
+    USER_TIMEOUT = 60 * 60
+
+    @staticmethod
+    def _load_group_permissions() -> dict[int, frozenset[str]]:
+        permissions = defaultdict(set)
+        rows = Group.permissions.through.objects.values_list(
+            "group_id", "permission__content_type__app_label", "permission__codename"
+        )
+        for group_id, app_label, codename in rows:
+            permissions[group_id].add(f"{app_label}.{codename}")
+        return {group_id: frozenset(names) for group_id, names in permissions.items()}
+
+    @staticmethod
+    def role_group_ids() -> dict[str, int]:
+        return reference_cache.get(
+            PermissionCache.ROLE_GROUPS_CACHE,
+            lambda: dict(Group.objects.values_list("name", "id")),
+        )
+
+    @staticmethod
+    def group_permissions() -> dict[int, frozenset[str]]:
+        return reference_cache.get(
+            PermissionCache.GROUP_PERMISSIONS_CACHE,
+            PermissionCache._load_group_permissions,
+        )
+
+    @staticmethod
+    def all_permissions() -> frozenset[str]:
+        return reference_cache.get(
+            PermissionCache.ALL_PERMISSIONS_CACHE,
+            lambda: frozenset(
+                f"{app_label}.{codename}"
+                for app_label, codename in Permission.objects.values_list(
+                    "content_type__app_label", "codename"
+                )
+            ),
+        )
+
+    @staticmethod
+    def _user_key(user_id: int) -> str:
+        version = cache.get(PermissionCache.USER_VERSION_KEY)
+        if version is None:
+            cache.add(PermissionCache.USER_VERSION_KEY, time.time_ns(), None)
+            version = cache.get(PermissionCache.USER_VERSION_KEY)
+        return f"auth:user_permissions:{version}:{user_id}"
+
+    @staticmethod
+    def _user_entry(user) -> tuple[tuple[int, ...], frozenset[str]]:
+        # Кэшируется на объекте, чтобы в пределах запроса не ходить в Redis повторно
+        entry = getattr(user, "_permission_cache_entry", None)
+        if entry is not None:
+            return entry
+
+        key = PermissionCache._user_key(user.pk)
+        entry = cache.get(key)
+        if entry is None:
+            entry = (
+                tuple(user.groups.values_list("id", flat=True)),
+                frozenset(
+                    f"{app_label}.{codename}"
+                    for app_label, codename in user.user_permissions.values_list(
+                        "content_type__app_label", "codename"
+                    )
+                ),
+            )
+            cache.set(key, entry, PermissionCache.USER_TIMEOUT)
+        user._permission_cache_entry = entry
+        return entry
+
+    @staticmethod
+    def user_permissions(user) -> frozenset[str]:
+        return PermissionCache._user_entry(user)[1]
+
+    @staticmethod
+    def user_group_permissions(user) -> frozenset[str]:
+        group_permissions = PermissionCache.group_permissions()
+        group_ids, _ = PermissionCache._user_entry(user)
+        return frozenset().union(
+            *(group_permissions.get(group_id, ()) for group_id in group_ids)
+        )
+
+    @staticmethod
+    def invalidate_groups() -> None:
+        reference_cache.invalidate(PermissionCache.ROLE_GROUPS_CACHE)
+        reference_cache.invalidate(PermissionCache.GROUP_PERMISSIONS_CACHE)
+
+    @staticmethod
+    def invalidate_permissions() -> None:
+        reference_cache.invalidate(PermissionCache.GROUP_PERMISSIONS_CACHE)
+        reference_cache.invalidate(PermissionCache.ALL_PERMISSIONS_CACHE)
+
+    @staticmethod
+    def invalidate_user(user_id: int) -> None:
+        transaction.on_commit(
+            lambda: cache.delete(PermissionCache._user_key(user_id))
+        )
+
+    @staticmethod
+    def invalidate_all_users() -> None:
+        def bump():
+            try:
+                cache.incr(PermissionCache.USER_VERSION_KEY)
+            except ValueError:
+                cache.set(PermissionCache.USER_VERSION_KEY, time.time_ns(), None)
+
+        transaction.on_commit(bump)
@@ -1,7 +1,9 @@
-from django.db.models.signals import post_save
+from django.contrib.auth.models import Group, Permission
+from django.db.models.signals import m2m_changed, post_delete, post_save
 from django.dispatch import receiver
 
 from users.models import User, UserProfile
+from users.services.permission_cache import PermissionCache
 
 
 @receiver(post_save, sender=User)
@@ -14,3 +16,36 @@ def create_user_profile(sender, instance, created, **kwargs):
 def save_user_profile(sender, instance, **kwargs):
     if hasattr(instance, "profile"):
         instance.profile.save()
+
+
+@receiver(post_save, sender=Group)
+@receiver(post_delete, sender=Group)
+def invalidate_groups(sender, **kwargs):
+    PermissionCache.invalidate_groups()
+    # Удаление группы меняет права ее участников
+    PermissionCache.invalidate_all_users()
+
+
+@receiver(post_save, sender=Permission)
+@receiver(post_delete, sender=Permission)
+def invalidate_permissions(sender, **kwargs):
+    PermissionCache.invalidate_permissions()
+    PermissionCache.invalidate_all_users()
+
+
+@receiver(m2m_changed, sender=Group.permissions.through)
+def invalidate_group_permissions(sender, action, **kwargs):
+    if action in ("post_add", "post_remove", "post_clear"):
+        PermissionCache.invalidate_permissions()
+
+
+@receiver(m2m_changed, sender=User.groups.through)
+@receiver(m2m_changed, sender=User.user_permissions.through)
+def invalidate_user_permissions(sender, instance, action, reverse, **kwargs):
+    if action not in ("post_add", "post_remove", "post_clear"):
+        return
+    if reverse:
+        # Изменение со стороны группы или права затрагивает многих пользователей
+        PermissionCache.invalidate_all_users()
+    else:
+        PermissionCache.invalidate_user(instance.pk)
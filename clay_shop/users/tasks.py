@@ -2,6 +2,7 @@ import logging
 
 from celery import shared_task
 
+from users.services.email_outbox_service import EmailOutboxService
 from users.services.email_service import EmailService
 
 logger = logging.getLogger(__name__)
@@ -57,3 +58,25 @@ def send_password_reset_email_task(
     except Exception as exc:
         logger.error(f"Error in send_password_reset_email_task: {str(exc)}")
         raise self.retry(exc=exc)
+
+
+@shared_task(bind=True, max_retries=3, default_retry_delay=60)
+def dispatch_email_outbox_task(self):
+    try:
+        processed = EmailOutboxService.dispatch()
+        return f"Outbox emails processed: {processed}"
+
+    except Exception as exc:
+        logger.error(f"Error in dispatch_email_outbox_task: {str(exc)}")
+        raise self.retry(exc=exc)
+
+
+@shared_task(bind=True, max_retries=3, default_retry_delay=60)
+def purge_email_outbox_task(self):
+    try:
+        deleted = EmailOutboxService.purge_sent()
+        return f"Outbox emails purged: {deleted}"
+
+    except Exception as exc:
+        logger.error(f"Error in purge_email_outbox_task: {str(exc)}")
+        raise self.retry(exc=exc)
@@ -1,5 +1,14 @@
 import pytest
 from django.contrib.auth import get_user_model
+from django.core.cache import cache
+
+from core.reference_cache import reference_cache
+from users.services.auth_service import AuthService
+from users.services.dadata_client import DaDataClient
+from users.services.email_service import EmailService
+from users.services.permission_cache import PermissionCache
+from users.tests.dadata_stub import DaDataStubServer
+from users.tests.email_backend import CountingEmailBackend
 
 User = get_user_model()
 
@@ -59,3 +68,41 @@ def multiple_user(create_user):
         )
         users.append(user)
     return users
+
+
+@pytest.fixture
+def dadata_stub(settings):
+    settings.DADATA_API_KEY = "test-token"
+    settings.CACHES = {
+        "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}
+    }
+    cache.clear()
+    with DaDataStubServer() as server:
+        settings.DADATA_SUGGEST_URL = server.url
+        yield server
+    DaDataClient.close()
+    cache.clear()
+
+
+@pytest.fixture
+def email_backend(settings, mailoutbox):
+    settings.EMAIL_BACKEND = "users.tests.email_backend.CountingEmailBackend"
+    CountingEmailBackend.opened = 0
+    CountingEmailBackend.disconnects = 0
+    CountingEmailBackend.refused = set()
+    EmailService.close_connection()
+    yield mailoutbox
+    EmailService.close_connection()
+
+
+@pytest.fixture
+def role_groups(db):
+    AuthService.setup_default_groups()
+    # on_commit в тестовой транзакции не срабатывает, сбрасываем кэш явно
+    for name in (
+        PermissionCache.ROLE_GROUPS_CACHE,
+        PermissionCache.GROUP_PERMISSIONS_CACHE,
+        PermissionCache.ALL_PERMISSIONS_CACHE,
+    ):
+        reference_cache.bump(name)
+    return PermissionCache.role_group_ids()
@@ -0,0 +1,68 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class DaDataStubHandler(BaseHTTPRequestHandler):
+    # HTTP/1.1, чтобы клиент мог держать соединение открытым
+    protocol_version = "HTTP/1.1"
+
+    def setup(self):
+        super().setup()
+        self.server.connections += 1
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers["Content-Length"]))
+        payload = json.loads(body)
+        self.server.requests.append(
+            {"payload": payload, "authorization": self.headers.get("Authorization")}
+        )
+
+        time.sleep(self.server.delay)
+        suggestions = [
+            {
+                "value": f"г Москва, {payload['query']} {index}",
+                "unrestricted_value": f"101000, г Москва, {payload['query']} {index}",
+                "data": {"postal_code": "101000", "city": "Москва"},
+            }
+            for index in range(0 if self.server.empty else payload["count"])
+        ]
+        response = json.dumps({"suggestions": suggestions}).encode()
+
+        self.send_response(self.server.status_code)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(response)))
+        self.end_headers()
+        self.wfile.write(response)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class DaDataStubServer(ThreadingHTTPServer):
+    """Локальная заглушка suggest/address для тестов без обращения к DaData."""
+
+    daemon_threads = True
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), DaDataStubHandler)
+        self.requests = []
+        self.connections = 0
+        self.status_code = 200
+        self.delay = 0
+        self.empty = False
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address
+        return f"http://{host}:{port}/suggestions/api/4_1/rs/suggest/address"
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.shutdown()
+        self.server_close()
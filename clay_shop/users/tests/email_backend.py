@@ -0,0 +1,27 @@
+from smtplib import SMTPRecipientsRefused, SMTPServerDisconnected
+
+from django.core.mail.backends.locmem import EmailBackend
+
+
+class CountingEmailBackend(EmailBackend):
+    """locmem-бэкенд, который считает соединения, обрывается и отклоняет адреса."""
+
+    opened = 0
+    disconnects = 0
+    refused = set()
+
+    def open(self):
+        CountingEmailBackend.opened += 1
+        return True
+
+    def send_messages(self, messages):
+        if CountingEmailBackend.disconnects:
+            CountingEmailBackend.disconnects -= 1
+            raise SMTPServerDisconnected("Connection unexpectedly closed")
+        for message in messages:
+            refused = set(message.to) & CountingEmailBackend.refused
+            if refused:
+                raise SMTPRecipientsRefused(
+                    {address: (550, b"User unknown") for address in refused}
+                )
+        return super().send_messages(messages)
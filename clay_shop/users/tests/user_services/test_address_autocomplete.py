@@ -0,0 +1,92 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from django.urls import reverse
+
+from users.services.address_autocomplete import AddressAutocompleteService
+
+
+class TestAddressAutocomplete:
+    def test_suggestions_from_api(self, dadata_stub):
+        suggestions = AddressAutocompleteService.get_suggestions("Тверская", 2)
+
+        assert [item["value"] for item in suggestions] == [
+            "г Москва, Тверская 0",
+            "г Москва, Тверская 1",
+        ]
+        assert dadata_stub.requests[0]["authorization"] == "Token test-token"
+
+    def test_failed_request_is_not_cached(self, dadata_stub):
+        dadata_stub.status_code = 500
+        AddressAutocompleteService.get_suggestions("Тверская", 1)
+        dadata_stub.status_code = 200
+
+        assert len(AddressAutocompleteService.get_suggestions("Тверская", 1)) == 1
+        assert len(dadata_stub.requests) == 2
+
+    def test_connection_is_reused(self, dadata_stub):
+        for query in ("Тверская", "Арбат", "Покровка"):
+            AddressAutocompleteService.get_suggestions(query, 1)
+
+        assert len(dadata_stub.requests) == 3
+        assert dadata_stub.connections == 1
+
+    def test_result_is_cached(self, dadata_stub):
+        AddressAutocompleteService.get_suggestions("Тверская", 1)
+        AddressAutocompleteService.get_suggestions("Тверская", 1)
+
+        assert len(dadata_stub.requests) == 1
+
+    def test_smaller_count_reuses_cached_result(self, dadata_stub):
+        first = AddressAutocompleteService.get_suggestions("Тверская", 5)
+        second = AddressAutocompleteService.get_suggestions(" тверская ", 3)
+
+        assert len(dadata_stub.requests) == 1
+        assert dadata_stub.requests[0]["payload"]["count"] == 20
+        assert second == first[:3]
+
+    def test_empty_result_is_cached(self, dadata_stub):
+        dadata_stub.empty = True
+
+        assert AddressAutocompleteService.get_suggestions("Несуществующая", 5) == []
+        assert AddressAutocompleteService.get_suggestions("Несуществующая", 5) == []
+        assert len(dadata_stub.requests) == 1
+
+    def test_concurrent_requests_are_coalesced(self, dadata_stub):
+        dadata_stub.delay = 0.2
+
+        with ThreadPoolExecutor(max_workers=5) as executor:
+            results = list(
+                executor.map(
+                    lambda _: AddressAutocompleteService.get_suggestions("Арбат", 3),
+                    range(5),
+                )
+            )
+
+        assert len(dadata_stub.requests) == 1
+        assert all(len(result) == 3 for result in results)
+
+    def test_api_error_returns_empty(self, dadata_stub):
+        dadata_stub.status_code = 500
+
+        assert AddressAutocompleteService.get_suggestions("Тверская", 1) == []
+
+    @pytest.mark.django_db
+    def test_view_reuses_connection(self, dadata_stub, create_user, client):
+        client.force_login(create_user())
+        url = reverse("address-autocomplete")
+
+        for query in ("Тверская", "Арбат", "Покровка"):
+            response = client.get(url, {"query": query})
+            assert response.status_code == 200
+            assert len(response.json()["suggestions"]) == 10
+
+        assert dadata_stub.connections == 1
+
+    def test_view_requires_login(self, dadata_stub, client, db):
+        url = reverse("address-autocomplete")
+
+        response = client.get(url, {"query": "Тверская"})
+
+        assert response.status_code == 302
+        assert not dadata_stub.requests
@@ -0,0 +1,196 @@
+from datetime import timedelta
+from unittest.mock import patch
+
+import pytest
+from django.db import connection, transaction
+from django.urls import reverse
+from django.utils import timezone
+
+from users.models import EmailOutbox
+from users.services.email_outbox_service import EmailOutboxService
+from users.services.email_service import EmailService
+from users.tasks import dispatch_email_outbox_task
+from users.tests.email_backend import CountingEmailBackend
+
+
+def make_due(entry: EmailOutbox) -> None:
+    EmailOutbox.objects.filter(id=entry.id).update(next_attempt_at=timezone.now())
+
+
+@pytest.mark.django_db
+class TestEmailOutbox:
+    def test_resend_is_deduplicated(self, email_backend, sample_user):
+        first = EmailOutboxService.enqueue_verification(sample_user)
+        second = EmailOutboxService.enqueue_verification(sample_user)
+
+        assert first.id == second.id
+        assert EmailOutboxService.pending_count() == 1
+
+    def test_rolled_back_transaction_leaves_no_email(self, email_backend, sample_user):
+        with pytest.raises(RuntimeError):
+            with transaction.atomic():
+                EmailOutboxService.enqueue_verification(sample_user)
+                raise RuntimeError
+
+        assert not EmailOutbox.objects.exists()
+
+    def test_dispatch_sends_batches_over_one_connection(
+        self, email_backend, create_user
+    ):
+        for index in range(5):
+            user = create_user(username=f"user{index}", email=f"u{index}@example.com")
+            EmailOutboxService.enqueue_verification(user)
+
+        assert EmailOutboxService.dispatch_batch(batch_size=2) == 2
+        dispatch_email_outbox_task.apply()
+
+        assert sorted(message.to[0] for message in email_backend) == [
+            f"u{index}@example.com" for index in range(5)
+        ]
+        assert EmailOutboxService.pending_count() == 0
+        assert CountingEmailBackend.opened == 1
+
+    def test_sent_email_allows_new_request(self, email_backend, sample_user):
+        EmailOutboxService.enqueue_verification(sample_user)
+        EmailOutboxService.dispatch()
+        EmailOutboxService.enqueue_verification(sample_user)
+
+        assert EmailOutboxService.pending_count() == 1
+        assert EmailOutbox.objects.filter(status=EmailOutbox.SENT).count() == 1
+
+    def test_failed_send_keeps_entries_pending(self, email_backend, sample_user):
+        entry = EmailOutboxService.enqueue_verification(sample_user)
+        CountingEmailBackend.disconnects = 2
+
+        with pytest.raises(Exception):
+            EmailOutboxService.dispatch_batch()
+
+        entry.refresh_from_db()
+        assert entry.status == EmailOutbox.PENDING
+        assert entry.attempts == 1
+        assert entry.last_error
+        assert entry.next_attempt_at > timezone.now()
+
+        make_due(entry)
+        assert EmailOutboxService.dispatch() == 1
+        assert len(email_backend) == 1
+
+    def test_backoff_does_not_spend_attempts(self, email_backend, sample_user):
+        entry = EmailOutboxService.enqueue_verification(sample_user)
+        CountingEmailBackend.disconnects = 2
+        with pytest.raises(Exception):
+            EmailOutboxService.dispatch_batch()
+        entry.refresh_from_db()
+        first_retry = entry.next_attempt_at
+
+        # Тики beat во время паузы письмо не берут и попытки не тратят
+        for _ in range(10):
+            assert EmailOutboxService.dispatch() == 0
+
+        entry.refresh_from_db()
+        assert entry.attempts == 1
+        assert entry.next_attempt_at == first_retry
+
+    def test_delay_grows_until_failed(self, sample_user):
+        entry = EmailOutboxService.enqueue_verification(sample_user)
+        delays = []
+
+        with patch.object(
+            EmailService, "send_bulk", return_value=[OSError("SMTP")]
+        ):
+            for _ in range(EmailOutboxService.MAX_ATTEMPTS):
+                make_due(entry)
+                started = timezone.now()
+                with pytest.raises(OSError):
+                    EmailOutboxService.dispatch_batch()
+                entry.refresh_from_db()
+                delays.append(entry.next_attempt_at - started)
+
+        assert entry.status == EmailOutbox.FAILED
+        assert entry.attempts == EmailOutboxService.MAX_ATTEMPTS
+        assert timedelta(minutes=1) <= delays[0] < timedelta(minutes=2)
+        assert timedelta(minutes=4) <= delays[2] < timedelta(minutes=5)
+        assert delays[-2] >= EmailOutboxService.RETRY_MAX_DELAY
+
+    def test_smtp_runs_outside_transaction(self, email_backend, sample_user):
+        EmailOutboxService.enqueue_verification(sample_user)
+        send_bulk = EmailService.send_bulk
+        savepoints = []
+
+        def spy(messages):
+            savepoints.append(list(connection.savepoint_ids))
+            return send_bulk(messages)
+
+        with patch.object(EmailService, "send_bulk", side_effect=spy):
+            assert EmailOutboxService.dispatch() == 1
+
+        assert savepoints == [[]]
+
+    def test_resend_while_sending_is_not_lost(self, email_backend, sample_user):
+        entry = EmailOutboxService.enqueue_verification(sample_user)
+
+        def resend(messages):
+            EmailOutboxService.enqueue(
+                "verification",
+                "new@example.com",
+                entry.context,
+                user=sample_user,
+                dedupe_key=entry.dedupe_key,
+            )
+            return [None] * len(messages)
+
+        with patch.object(EmailService, "send_bulk", side_effect=resend):
+            EmailOutboxService.dispatch_batch()
+
+        entry.refresh_from_db()
+        assert entry.status == EmailOutbox.PENDING
+        assert entry.recipient == "new@example.com"
+        assert EmailOutboxService.dispatch() == 1
+        assert email_backend[0].to == ["new@example.com"]
+
+    def test_refused_recipient_is_retried_alone(self, email_backend, create_user):
+        entries = [
+            EmailOutboxService.enqueue_verification(
+                create_user(username=f"user{index}", email=f"u{index}@example.com")
+            )
+            for index in range(3)
+        ]
+        CountingEmailBackend.refused = {"u1@example.com"}
+
+        assert EmailOutboxService.dispatch() == 3
+
+        statuses = dict(EmailOutbox.objects.values_list("id", "status"))
+        assert [statuses[entry.id] for entry in entries] == [
+            EmailOutbox.SENT,
+            EmailOutbox.PENDING,
+            EmailOutbox.SENT,
+        ]
+        assert "u1@example.com" in EmailOutbox.objects.get(id=entries[1].id).last_error
+
+        make_due(entries[1])
+        CountingEmailBackend.refused = set()
+        assert EmailOutboxService.dispatch() == 1
+        assert [message.to[0] for message in email_backend] == [
+            "u0@example.com",
+            "u2@example.com",
+            "u1@example.com",
+        ]
+
+    def test_unknown_kind_is_marked_failed(self, email_backend, sample_user):
+        entry = EmailOutboxService.enqueue("unknown", sample_user.email, {})
+        EmailOutboxService.enqueue_verification(sample_user)
+
+        assert EmailOutboxService.dispatch() == 2
+        entry.refresh_from_db()
+        assert entry.status == EmailOutbox.FAILED
+        assert len(email_backend) == 1
+
+    def test_resend_view_writes_outbox(self, email_backend, client, sample_user):
+        client.force_login(sample_user)
+        for _ in range(3):
+            client.post(reverse("resend-verification"))
+
+        entry = EmailOutbox.objects.get()
+        assert entry.user == sample_user
+        assert entry.dedupe_key == f"verification:{sample_user.pk}"
+        assert len(email_backend) == 0
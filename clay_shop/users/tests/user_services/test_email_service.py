@@ -0,0 +1,139 @@
+from io import StringIO
+from smtplib import SMTPRecipientsRefused, SMTPServerDisconnected
+from unittest.mock import patch
+
+from django.core.management import call_command
+from django.template.loader import get_template
+
+from users.services.email_renderer import EmailRenderer
+from users.services.email_service import EmailService
+from users.tests.email_backend import CountingEmailBackend
+
+
+def verification(index: int) -> dict:
+    return {
+        "user_email": f"user{index}@example.com",
+        "user_name": f"User{index}",
+        "verification_link": f"http://testserver/verify/{index}/",
+    }
+
+
+class TestEmailService:
+    def test_send_reuses_connection(self, email_backend):
+        assert EmailService.send_welcome_email("a@example.com", "A")
+        assert EmailService.send_verification_email(**verification(1))
+
+        assert len(email_backend) == 2
+        assert CountingEmailBackend.opened == 1
+
+    def test_idle_connection_is_reopened(self, email_backend):
+        EmailService.send_welcome_email("a@example.com", "A")
+        with patch(
+            "users.services.email_service.time.monotonic",
+            return_value=10**9,
+        ):
+            EmailService.send_welcome_email("b@example.com", "B")
+
+        assert CountingEmailBackend.opened == 2
+
+    def test_send_bulk_reconnects_once(self, email_backend):
+        CountingEmailBackend.disconnects = 1
+        messages = [
+            EmailService.build("verification", **verification(index))
+            for index in range(3)
+        ]
+
+        assert EmailService.send_bulk(messages) == [None, None, None]
+        assert len(email_backend) == 3
+        assert CountingEmailBackend.opened == 2
+
+    def test_disconnect_resends_only_current_message(self, email_backend):
+        messages = [
+            EmailService.build("verification", **verification(index))
+            for index in range(3)
+        ]
+        send_messages = CountingEmailBackend.send_messages
+
+        def drop_on_second(backend, batch):
+            if batch[0] is messages[1] and CountingEmailBackend.opened == 1:
+                raise SMTPServerDisconnected("Connection unexpectedly closed")
+            return send_messages(backend, batch)
+
+        with patch.object(
+            CountingEmailBackend,
+            "send_messages",
+            autospec=True,
+            side_effect=drop_on_second,
+        ):
+            assert EmailService.send_bulk(messages) == [None, None, None]
+
+        assert [message.to[0] for message in email_backend] == [
+            f"user{index}@example.com" for index in range(3)
+        ]
+
+    def test_refused_recipient_does_not_stop_batch(self, email_backend):
+        CountingEmailBackend.refused = {"user1@example.com"}
+        messages = [
+            EmailService.build("verification", **verification(index))
+            for index in range(3)
+        ]
+
+        results = EmailService.send_bulk(messages)
+
+        assert results[0] is None and results[2] is None
+        assert isinstance(results[1], SMTPRecipientsRefused)
+        assert [message.to[0] for message in email_backend] == [
+            "user0@example.com",
+            "user2@example.com",
+        ]
+        assert CountingEmailBackend.opened == 1
+
+    def test_lost_connection_fails_remaining(self, email_backend):
+        CountingEmailBackend.disconnects = 2
+        messages = [
+            EmailService.build("verification", **verification(index))
+            for index in range(2)
+        ]
+
+        results = EmailService.send_bulk(messages)
+
+        assert all(isinstance(error, SMTPServerDisconnected) for error in results)
+        assert len(results) == 2
+        assert len(email_backend) == 0
+
+    def test_verification_text_has_site_name(self, email_backend, settings):
+        message = EmailService.build("verification", **verification(1))
+
+        assert settings.SITE_NAME in message.body
+        assert message.alternatives[0][1] == "text/html"
+
+
+class TestEmailRenderer:
+    def test_templates_are_loaded_once(self, email_backend):
+        EmailRenderer.clear()
+        with patch(
+            "users.services.email_renderer.get_template", wraps=get_template
+        ) as loader:
+            for index in range(3):
+                EmailService.build("verification", **verification(index))
+
+        assert loader.call_count == 2
+
+    def test_plaintext_is_rendered_from_template(self, email_backend):
+        message = EmailService.build(
+            "password_reset",
+            user_email="a@example.com",
+            user_name="Tom & Jerry",
+            reset_link="http://testserver/reset/?a=1&b=2",
+        )
+
+        assert "<" not in message.body
+        assert "Tom & Jerry" in message.body
+        assert "http://testserver/reset/?a=1&b=2" in message.body
+        assert "Tom &amp; Jerry" in message.alternatives[0][0]
+
+    def test_benchmark_command(self, email_backend):
+        out = StringIO()
+        call_command("benchmark_email_rendering", count=2, stdout=out)
+
+        assert "EmailRenderer" in out.getvalue()
@@ -0,0 +1,76 @@
+import pytest
+from django.contrib.auth.models import Group, Permission
+
+from users.models import User
+from users.services.auth_service import AuthService
+from users.services.permission_cache import PermissionCache
+
+
+@pytest.mark.django_db
+class TestPermissionCache:
+    def test_role_groups_are_cached(self, role_groups, django_assert_num_queries):
+        with django_assert_num_queries(0):
+            assert PermissionCache.role_group_ids() == role_groups
+
+        assert set(role_groups) == {User.CUSTOMER, User.SELLER, User.ADMIN}
+
+    def test_assign_role_group(self, role_groups, create_user):
+        user = create_user(role=User.SELLER)
+        AuthService.assign_role_group(user)
+        user.role = User.CUSTOMER
+        AuthService.assign_role_group(user)
+
+        assert list(user.groups.values_list("name", flat=True)) == [User.CUSTOMER]
+
+    def test_has_perm_from_cache(
+        self,
+        role_groups,
+        create_user,
+        django_capture_on_commit_callbacks,
+        django_assert_num_queries,
+    ):
+        user = create_user(role=User.SELLER)
+        with django_capture_on_commit_callbacks(execute=True):
+            AuthService.assign_role_group(user)
+
+        assert user.has_perm("users.can_manage_products")
+
+        fresh = User.objects.get(pk=user.pk)
+        with django_assert_num_queries(0):
+            assert fresh.has_perm("users.can_manage_products")
+            assert not fresh.has_perm("users.can_verify_users")
+
+    def test_group_edit_invalidates(
+        self, role_groups, create_user, django_capture_on_commit_callbacks
+    ):
+        user = create_user(role=User.SELLER)
+        with django_capture_on_commit_callbacks(execute=True):
+            AuthService.assign_role_group(user)
+        assert User.objects.get(pk=user.pk).has_perm("users.can_manage_products")
+
+        with django_capture_on_commit_callbacks(execute=True):
+            Group.objects.get(name=User.SELLER).permissions.remove(
+                Permission.objects.get(codename="can_manage_products")
+            )
+
+        assert not User.objects.get(pk=user.pk).has_perm("users.can_manage_products")
+
+    def test_user_groups_change_invalidates(
+        self, role_groups, create_user, django_capture_on_commit_callbacks
+    ):
+        user = create_user(role=User.CUSTOMER)
+        with django_capture_on_commit_callbacks(execute=True):
+            AuthService.assign_role_group(user)
+        assert not User.objects.get(pk=user.pk).has_perm("users.can_verify_users")
+
+        user.role = User.ADMIN
+        with django_capture_on_commit_callbacks(execute=True):
+            AuthService.assign_role_group(user)
+
+        assert User.objects.get(pk=user.pk).has_perm("users.can_verify_users")
+
+    def test_superuser_has_all_permissions(self, role_groups, create_user):
+        user = create_user(is_superuser=True)
+
+        assert user.has_perm("users.can_verify_users")
+        assert user.has_perm("products.add_product")
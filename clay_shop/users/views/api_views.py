@@ -6,6 +6,8 @@ from users.services.address_autocomplete import AddressAutocompleteService
 
 
 class AddressAutocompleteView(LoginRequiredMixin, View):
+    # Приложение работает под WSGI: синхронный view ходит в DaData через общий
+    # на процесс httpx.Client, соединение переживает запросы
     def get(self, request):
         query = request.GET.get('query', '')
         count = int(request.GET.get('count', 10))
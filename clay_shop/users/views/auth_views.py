@@ -2,6 +2,7 @@ from django.contrib import messages
 from django.contrib.auth import login
 from django.contrib.auth.views import LoginView, LogoutView, PasswordChangeView
 from django.contrib.messages.views import SuccessMessageMixin
+from django.db import transaction
 from django.http import HttpResponse
 from django.shortcuts import redirect
 from django.urls import reverse_lazy
@@ -10,8 +11,7 @@ from django.views.generic import CreateView
 from users.forms.auth_forms import ChangePasswordForm, LoginForm, UserRegistrationForm
 from users.models import User
 from users.services.auth_service import AuthService
-from users.services.email_verification_service import EmailVerificationService
-from users.tasks import send_verification_email_task
+from users.services.email_outbox_service import EmailOutboxService
 
 
 class AuthLoginView(LoginView):
@@ -97,19 +97,14 @@ class UserRegistrationView(SuccessMessageMixin, CreateView):
         return self.render_to_response(self.get_context_data(form=form))
 
     def form_valid(self, form):
-        user = form.save(commit=False)
-        user.is_verified = False
-        user.save()
-
-        AuthService.assign_role_group(user)
-
-        verification_link = EmailVerificationService.generate_verification_link(user)
-
-        send_verification_email_task.delay(
-            user_email=user.email,
-            user_name=user.first_name,
-            verification_link=verification_link,
-        )
+        # Письмо попадает в очередь только вместе с созданным пользователем
+        with transaction.atomic():
+            user = form.save(commit=False)
+            user.is_verified = False
+            user.save()
+
+            AuthService.assign_role_group(user)
+            EmailOutboxService.enqueue_verification(user)
 
         messages.success(
             self.request, "Регистрация успешна! Проверьте email для подтверждения"
@@ -3,8 +3,8 @@ from django.contrib.auth.mixins import LoginRequiredMixin
 from django.shortcuts import redirect
 from django.views import View
 
+from users.services.email_outbox_service import EmailOutboxService
 from users.services.email_verification_service import EmailVerificationService
-from users.tasks import send_verification_email_task
 
 
 class EmailVerifyView(View):
@@ -25,13 +25,7 @@ class ResendVerificationEmailView(LoginRequiredMixin, View):
             messages.info(request, 'Ваш email уже подтвержден')
             return redirect('user-profile')
 
-        verification_link = EmailVerificationService.generate_verification_link(user)
-
-        send_verification_email_task.delay(
-            user_email=user.email,
-            user_name=user.first_name,
-            verification_link=verification_link
-        )
+        EmailOutboxService.enqueue_verification(user)
 
         messages.success(
             request, "✅ Письмо с подтверждением отправлено повторно. Проверьте почту!"
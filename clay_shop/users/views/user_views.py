@@ -12,6 +12,7 @@ from django.views.generic import (
     UpdateView,
 )
 
+from core.pagination import CursorPaginationMixin
 from users.auth_mixins import AdminRequiredMixin, OwnerOrAdminMixin
 from users.forms.user_forms import (
     UserCreateForm,
@@ -23,11 +24,12 @@ from users.services.user_crud import UserCrud
 
 
 # Create your views here.
-class UserListView(AdminRequiredMixin, ListView):
+class UserListView(AdminRequiredMixin, CursorPaginationMixin, ListView):
     model = User
     template_name = "user_templates/user_list.html"
     context_object_name = "users"
     paginate_by = 20
+    cursor_ordering = "-created_at"
 
     def get_queryset(self):
         return UserCrud.get_all_users()